@@ -0,0 +1,47 @@
+# bench_bootstrap.py
+# date: 2026-10-18
+#
+# Compares bootstrap confidence intervals of the test metrics computed with a
+# Python loop calling classification_report on every resample and with the
+# batched index matrix of src/bootstrap_metrics.py, for growing numbers of
+# test rows (synthetic labels with 80% accurate predictions). The loop is only
+# timed on --loop-resamples resamples and extrapolated.
+#
+# python benchmarks/bench_bootstrap.py --rows 90 --rows 100000 --resamples 10000 --n-jobs 4
+
+import click
+import os
+import sys
+import time
+import numpy as np
+from sklearn.metrics import classification_report
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.bootstrap_metrics import bootstrap_confidence_intervals
+
+@click.command()
+@click.option('--rows', type=int, multiple=True, default=[90, 10_000], help="Test set sizes to benchmark")
+@click.option('--resamples', type=int, default=10_000, help="Bootstrap resamples")
+@click.option('--loop-resamples', type=int, default=200, help="Resamples timed for the loop")
+@click.option('--n-jobs', type=int, default=1, help="Processes of the batched bootstrap")
+def main(rows, resamples, loop_resamples, n_jobs):
+    """Prints the time of the looped and the batched bootstrap for each test set size."""
+    click.echo(f"{'rows':>9} {'resamples':>10} {'loop s':>9} {'batched s':>10} {'speedup':>9}")
+    rng = np.random.default_rng(123)
+    for n_rows in rows:
+        y_true = rng.integers(0, 2, n_rows)
+        y_pred = np.where(rng.random(n_rows) < 0.8, y_true, 1 - y_true)
+
+        start = time.perf_counter()
+        for _ in range(loop_resamples):
+            index = rng.integers(0, n_rows, n_rows)
+            classification_report(y_true[index], y_pred[index], output_dict=True, zero_division=0)
+        loop = (time.perf_counter() - start) * resamples / loop_resamples
+
+        start = time.perf_counter()
+        bootstrap_confidence_intervals(y_true, y_pred, resamples, n_jobs=n_jobs)
+        batched = time.perf_counter() - start
+        click.echo(f"{n_rows:>9} {resamples:>10} {loop:>9.2f} {batched:>10.3f} {loop / batched:>8.0f}x")
+
+if __name__ == '__main__':
+    main()
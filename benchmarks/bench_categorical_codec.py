@@ -0,0 +1,90 @@
+# bench_categorical_codec.py
+# date: 2026-10-18
+#
+# Compares the codec table in src/categorical_codec.py against the chain of
+# df.loc[mask, col] = ... relabels that clean_data() used before it.
+#
+# python benchmarks/bench_categorical_codec.py --rows 1000000 --rows 10000000
+
+import click
+import os
+import time
+import numpy as np
+import pandas as pd
+import sys
+import warnings
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.categorical_codec import apply_codecs
+
+warnings.filterwarnings('ignore')
+
+RAW_COLUMNS = {
+    "chest_pain_type": [1, 2, 3, 4],
+    "fasting_blood_sugar": [0, 1],
+    "rest_ecg": [0, 1, 2],
+    "exercise_induced_angina": [0, 1],
+    "slope": [1, 2, 3],
+    "thalassemia": [3., 6., 7., np.nan],
+    "diagnosis": [0, 1, 2, 3, 4],
+}
+
+def make_raw_frame(n_rows, seed=123):
+    """Builds a frame of raw UCI codes with n_rows rows."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({column: rng.choice(values, size=n_rows) for column, values in RAW_COLUMNS.items()})
+
+def mask_chain(df):
+    """The relabel chain clean_data() used before the codec table."""
+    df.loc[(df['chest_pain_type'] == 1), 'chest_pain_type'] = 'typical angina'
+    df.loc[(df['chest_pain_type'] == 2), 'chest_pain_type'] = 'atypical angina'
+    df.loc[(df['chest_pain_type'] == 3), 'chest_pain_type'] = 'non-anginal pain'
+    df.loc[(df['chest_pain_type'] == 4), 'chest_pain_type'] = 'asymptomatic'
+
+    df.loc[(df['fasting_blood_sugar'] == 'yes'), 'fasting_blood_sugar'] = 1
+    df.loc[(df['fasting_blood_sugar'] == 'no'), 'fasting_blood_sugar'] = 0
+
+    df.loc[(df['rest_ecg'] == 0), 'rest_ecg'] = 'normal'
+    df.loc[(df['rest_ecg'] == 1), 'rest_ecg'] = 'ST-T wave abnormality'
+    df.loc[(df['rest_ecg'] == 2), 'rest_ecg'] = 'left ventricular hypertrophy'
+
+    df.loc[(df['exercise_induced_angina'] == 0), 'exercise_induced_angina'] = 'no'
+    df.loc[(df['exercise_induced_angina'] == 1), 'exercise_induced_angina'] = 'yes'
+
+    df.loc[(df['slope'] == 1), 'slope'] = 'upsloping'
+    df.loc[(df['slope'] == 2), 'slope'] = 'flat'
+    df.loc[(df['slope'] == 3), 'slope'] = 'downsloping'
+
+    df.loc[(df['thalassemia'] == 3.), 'thalassemia'] = 'normal'
+    df.loc[(df['thalassemia'] == 6.), 'thalassemia'] = 'fixed defect'
+    df.loc[(df['thalassemia'] == 7.), 'thalassemia'] = 'reversable defect'
+
+    df.loc[(df['diagnosis'] == 2), 'diagnosis'] = 1
+    df.loc[(df['diagnosis'] == 3), 'diagnosis'] = 1
+    df.loc[(df['diagnosis'] == 4), 'diagnosis'] = 1
+    return df
+
+def time_call(func, df, repeat):
+    """Returns the best wall time of func over repeat fresh copies of df."""
+    timings = []
+    for _ in range(repeat):
+        frame = df.copy()
+        start = time.perf_counter()
+        func(frame)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+@click.command()
+@click.option('--rows', type=int, multiple=True, default=[1_000_000, 10_000_000], help="Row counts to benchmark")
+@click.option('--repeat', type=int, default=3, help="Number of timed repeats per row count")
+def main(rows, repeat):
+    """Times the mask chain and the codec table and prints the speedup."""
+    click.echo(f"{'rows':>12} {'mask chain (s)':>15} {'codec (s)':>10} {'speedup':>8}")
+    for n_rows in rows:
+        df = make_raw_frame(n_rows)
+        legacy = time_call(mask_chain, df, repeat)
+        codec = time_call(apply_codecs, df, repeat)
+        click.echo(f"{n_rows:>12} {legacy:>15.3f} {codec:>10.3f} {legacy / codec:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# bench_clean_data_memory.py
+# date: 2026-10-18
+#
+# Measures peak memory of clean_data() on growing raw files, read in memory
+# and streamed in chunks. The streamed peak should stay flat as rows grow.
+# Wall times include tracemalloc overhead and are only comparable to each other.
+#
+# python benchmarks/bench_clean_data_memory.py --rows 100000 --rows 1000000 --chunksize 50000
+
+import click
+import os
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+import sys
+import warnings
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from clean_data import clean_data
+
+warnings.filterwarnings('ignore')
+
+def write_raw_file(raw_sample, n_rows, path, seed=123):
+    """Writes n_rows rows resampled from the bundled raw data to path."""
+    rng = np.random.default_rng(seed)
+    raw_sample.iloc[rng.integers(0, len(raw_sample), size=n_rows)].to_csv(path, index=False)
+
+def peak_memory(raw_path, write_to, chunksize):
+    """Returns the peak traced memory (MiB) and wall time of one clean_data() call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    clean_data(raw_path, write_to, chunksize=chunksize)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20, elapsed
+
+@click.command()
+@click.option('--raw-data', type=str, default="data/raw/raw_heart_disease_data.csv", help="Raw data to resample rows from")
+@click.option('--rows', type=int, multiple=True, default=[100_000, 1_000_000], help="Row counts to benchmark")
+@click.option('--chunksize', type=int, default=50_000, help="Chunk size of the streamed run")
+def main(raw_data, rows, chunksize):
+    """Prints peak memory of the in-memory and streamed clean_data() paths."""
+    raw_sample = pd.read_csv(raw_data)
+    click.echo(f"{'rows':>10} {'in-memory MiB':>14} {'streamed MiB':>13} {'in-memory s':>12} {'streamed s':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in rows:
+            raw_path = os.path.join(tmp, "raw.csv")
+            write_raw_file(raw_sample, n_rows, raw_path)
+            full_mem, full_time = peak_memory(raw_path, os.path.join(tmp, "full"), None)
+            chunk_mem, chunk_time = peak_memory(raw_path, os.path.join(tmp, "chunked"), chunksize)
+            click.echo(f"{n_rows:>10} {full_mem:>14.1f} {chunk_mem:>13.1f} {full_time:>12.2f} {chunk_time:>11.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+# bench_cli_startup.py
+# date: 2026-10-18
+#
+# Measures the import time of every subcommand of scripts/heart_disease.py with
+# `python -X importtime` and exits with status 1 if one goes over its budget in
+# src/import_budget.py or imports a module that should load lazily.
+#
+# python benchmarks/bench_cli_startup.py --repeat 5
+
+import click
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.import_budget import STARTUP_BUDGETS_MS, measure_startup, startup_violations
+
+CLI = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts', 'heart_disease.py'))
+
+@click.command()
+@click.option('--subcommand', 'subcommands', type=click.Choice(list(STARTUP_BUDGETS_MS)), multiple=True,
+              default=list(STARTUP_BUDGETS_MS), help="Subcommands to measure ('' is the group itself)")
+@click.option('--repeat', type=int, default=5, help="Number of runs; the fastest is kept")
+@click.option('--top', type=int, default=3, help="Number of slowest top-level imports to show")
+def main(subcommands, repeat, top):
+    """Prints the startup import time of each subcommand against its budget."""
+    violations = []
+    for subcommand in subcommands:
+        runs = [measure_startup([CLI, *([subcommand] if subcommand else []), "--help"]) for _ in range(repeat)]
+        total_ms, imports = min(runs, key=lambda run: run[0])
+        slowest = sorted((imp for imp in imports if imp[3] == 0), key=lambda imp: -imp[2])[:top]
+        click.echo(f"{subcommand or '(group)':<10}{total_ms:>8.0f} ms / {STARTUP_BUDGETS_MS[subcommand]:>5} ms   "
+                   + ", ".join(f"{name} {cumulative / 1000:.0f} ms" for name, _, cumulative, _ in slowest))
+        violations += startup_violations(subcommand, total_ms, imports)
+
+    for violation in violations:
+        click.echo(violation, err=True)
+    sys.exit(1 if violations else 0)
+
+if __name__ == '__main__':
+    main()
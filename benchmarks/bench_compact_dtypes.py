@@ -0,0 +1,55 @@
+# bench_compact_dtypes.py
+# date: 2026-10-18
+#
+# Compares reading the cleaned data, resampled to growing row counts, with the
+# dtypes pandas infers and with the compact dtypes derived from the column
+# definitions in src/validate_data.py: memory per row of the loaded frame and
+# the best parse time of --repeats reads of the CSV file. 'untrusted' are the
+# dtypes the validator and predict.py read unvalidated data with.
+#
+# python benchmarks/bench_compact_dtypes.py --rows 100000 --rows 1000000
+
+import click
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.validate_data import compact_dtypes
+
+def best_read_time(path, dtype, repeats):
+    """Returns the best wall time of reading the CSV file with the dtypes, and the frame read."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        df = pd.read_csv(path, dtype=dtype)
+        best = min(best, time.perf_counter() - start)
+    return best, df
+
+@click.command()
+@click.option('--cleaned-data', type=str, default="data/cleaned/cleaned_heart_disease_data.csv", help="Cleaned data to resample")
+@click.option('--rows', type=int, multiple=True, default=[100_000, 1_000_000], help="Row counts to benchmark")
+@click.option('--repeats', type=int, default=3, help="Reads per dtype choice; the fastest is reported")
+def main(cleaned_data, rows, repeats):
+    """Prints the memory per row and parse time of each dtype choice for each row count."""
+    df = pd.read_csv(cleaned_data)
+    choices = [("inferred", None), ("untrusted", compact_dtypes(trusted=False)), ("compact", compact_dtypes())]
+    click.echo(f"{'rows':>9} {'dtypes':>9} {'bytes/row':>10} {'memory MB':>10} {'parse s':>8} {'speedup':>8}")
+    rng = np.random.default_rng(123)
+    for n_rows in rows:
+        data = df.iloc[rng.integers(0, len(df), n_rows)].reset_index(drop=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cleaned.csv")
+            data.to_csv(path, index=False)
+            baseline = None
+            for name, dtype in choices:
+                seconds, loaded = best_read_time(path, dtype, repeats)
+                memory = loaded.memory_usage(deep=True).sum()
+                baseline = baseline or seconds
+                click.echo(f"{n_rows:>9} {name:>9} {memory / n_rows:>10.1f} {memory / 1e6:>10.2f} {seconds:>8.3f} {baseline / seconds:>7.2f}x")
+
+if __name__ == '__main__':
+    main()
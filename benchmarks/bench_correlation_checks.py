@@ -0,0 +1,65 @@
+# bench_correlation_checks.py
+# date: 2026-10-18
+#
+# Compares the native correlation checks in src/correlation_checks.py with the
+# deepchecks FeatureLabelCorrelation (PPS) and FeatureFeatureCorrelation checks
+# on the cleaned dataset, then times both engines on resampled larger frames.
+#
+# python benchmarks/bench_correlation_checks.py --rows 10000 --rows 100000
+
+import click
+import os
+import time
+import numpy as np
+import pandas as pd
+import sys
+import warnings
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.correlation_checks import check_correlations
+from deepchecks.tabular import Dataset
+from deepchecks.tabular.checks import FeatureLabelCorrelation, FeatureFeatureCorrelation
+
+warnings.filterwarnings('ignore')
+
+def run_deepchecks(df, label):
+    """Runs both deepchecks checks on one Dataset and returns their values."""
+    dataset = Dataset(df, label=label, cat_features=[])
+    pps = FeatureLabelCorrelation().run(dataset=dataset, with_display=False).value
+    pairs = FeatureFeatureCorrelation().run(dataset=dataset, with_display=False).value
+    return pd.Series(pps), pairs.astype(float)
+
+@click.command()
+@click.option('--cleaned-data', type=str, default="data/cleaned/cleaned_heart_disease_data.csv", help="Path to cleaned data")
+@click.option('--rows', type=int, multiple=True, default=[10_000, 100_000], help="Row counts to time")
+@click.option('--n-samples', type=int, default=None, help="Stratified sample size of the native engine")
+def main(cleaned_data, rows, n_samples):
+    """Prints the results of both engines side by side and their timings."""
+    df = pd.read_csv(cleaned_data)
+
+    pps, deepchecks_pairs = run_deepchecks(df, "diagnosis")
+    native = check_correlations(df, "diagnosis")
+
+    click.echo("Feature-label: deepchecks PPS vs native association")
+    comparison = pd.DataFrame({"pps": pps, "native": native["feature_label"]}).sort_values("native", ascending=False)
+    click.echo(comparison.round(3).to_string())
+
+    numeric = deepchecks_pairs.columns
+    diff = (deepchecks_pairs.abs() - native["feature_feature"].loc[numeric, numeric]).abs().to_numpy().max()
+    click.echo(f"\nFeature-feature: max |difference| over numeric pairs = {diff:.2e}")
+    click.echo(f"Native pairs above 0.9: {native['pair_failures']}")
+
+    click.echo(f"\n{'rows':>10} {'deepchecks (s)':>15} {'native (s)':>11} {'speedup':>8}")
+    rng = np.random.default_rng(123)
+    for n_rows in rows:
+        frame = df.iloc[rng.integers(0, len(df), size=n_rows)].reset_index(drop=True)
+        start = time.perf_counter()
+        run_deepchecks(frame, "diagnosis")
+        slow = time.perf_counter() - start
+        start = time.perf_counter()
+        check_correlations(frame, "diagnosis", n_samples=n_samples)
+        fast = time.perf_counter() - start
+        click.echo(f"{n_rows:>10} {slow:>15.3f} {fast:>11.3f} {slow / fast:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# bench_eda.py
+# date: 2026-10-18
+#
+# Times scripts/eda.py's create_eda_plots in exact and binned mode on training
+# data resampled (with jitter) to growing row counts, and create_streaming_eda_plots
+# reading the same rows back from CSV files --chunksize rows at a time (the time
+# to write the files is not counted). Exact mode is skipped above
+# --exact-max-rows, where its pairplot takes minutes.
+#
+# python benchmarks/bench_eda.py --rows 1000 --rows 100000 --rows 1000000 --n-jobs 3
+
+import click
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+
+from eda import create_eda_plots, create_streaming_eda_plots
+
+def resample(X, y, n_rows, seed=123):
+    """Draws n_rows rows with replacement, jittering the numeric columns so the rows are distinct."""
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, len(X), n_rows)
+    X_big = X.iloc[rows].reset_index(drop=True)
+    for col in X_big.select_dtypes(include=['number']).columns:
+        X_big[col] = X_big[col] + rng.normal(0, 0.5, n_rows)
+    return X_big, y.iloc[rows].reset_index(drop=True)
+
+@click.command()
+@click.option('--training-data', type=str, default="data/processed/X_train.csv", help="Features to resample")
+@click.option('--target-data', type=str, default="data/processed/y_train.csv", help="Targets to resample")
+@click.option('--rows', type=int, multiple=True, default=[1_000, 10_000, 100_000, 1_000_000], help="Row counts to benchmark")
+@click.option('--exact-max-rows', type=int, default=10_000, help="Largest row count drawn in exact mode")
+@click.option('--sample-size', type=int, default=2_000, help="Scatter sample of binned mode")
+@click.option('--chunksize', type=int, default=100_000, help="Rows read at a time in streaming mode")
+@click.option('--n-jobs', type=int, default=3, help="Rendering (and streaming) processes")
+def main(training_data, target_data, rows, exact_max_rows, sample_size, chunksize, n_jobs):
+    """Prints the EDA time of each mode for each row count."""
+    X, y = pd.read_csv(training_data), pd.read_csv(target_data)['diagnosis']
+    click.echo(f"{'rows':>10}{'exact':>10}{'binned':>10}{'streaming':>10}")
+    for n_rows in rows:
+        X_big, y_big = resample(X, y, n_rows)
+        timings = {}
+        for mode in ("exact", "binned"):
+            if mode == "exact" and n_rows > exact_max_rows:
+                timings[mode] = float("nan")
+                continue
+            with tempfile.TemporaryDirectory() as plot_to:
+                start = time.perf_counter()
+                create_eda_plots(X_big, y_big, plot_to, mode=mode, sample_size=sample_size, n_jobs=n_jobs)
+                timings[mode] = time.perf_counter() - start
+        with tempfile.TemporaryDirectory() as tmp:
+            X_big.to_csv(os.path.join(tmp, "X.csv"), index=False)
+            y_big.to_frame().to_csv(os.path.join(tmp, "y.csv"), index=False)
+            start = time.perf_counter()
+            create_streaming_eda_plots(os.path.join(tmp, "X.csv"), os.path.join(tmp, "y.csv"), os.path.join(tmp, "plots"),
+                                       chunksize, sample_size=sample_size, n_jobs=n_jobs)
+            timings["streaming"] = time.perf_counter() - start
+        click.echo(f"{n_rows:>10}{timings['exact']:>9.2f}s{timings['binned']:>9.2f}s{timings['streaming']:>9.2f}s")
+
+if __name__ == '__main__':
+    main()
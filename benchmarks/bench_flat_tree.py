@@ -0,0 +1,66 @@
+# bench_flat_tree.py
+# date: 2026-10-18
+#
+# Compares the flat-array decision tree engine with the pickled scikit-learn
+# pipeline: cold-start load time (fresh interpreter, imports included) and
+# predict_proba latency/throughput on the transformed test features.
+#
+# python benchmarks/bench_flat_tree.py --rows 1 --rows 1000 --rows 1000000
+
+import click
+import os
+import subprocess
+import time
+import numpy as np
+import pandas as pd
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.flat_tree import FlatTree
+from src.load_pipeline import load_pipeline
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def best_time(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def cold_start(code, repeat):
+    """Best wall time of a fresh interpreter running code, imports included."""
+    return best_time(lambda: subprocess.run([sys.executable, "-c", code], check=True), repeat)
+
+@click.command()
+@click.option('--features', 'features_path', type=str, default="data/processed/X_test_transformed.csv", help="Transformed features to resample")
+@click.option('--pipeline', 'pipeline_path', type=str, default="results/models/decision_tree.pkl", help="Fitted decision tree pipeline")
+@click.option('--tree', 'tree_path', type=str, default="results/models/decision_tree_flat", help="Directory of the flat node arrays")
+@click.option('--rows', type=int, multiple=True, default=[1, 100, 10_000, 1_000_000], help="Batch sizes to benchmark")
+@click.option('--repeat', type=int, default=5, help="Number of timed repeats")
+def main(features_path, pipeline_path, tree_path, rows, repeat):
+    """Prints load time and per-batch scoring time of both engines."""
+    pickle_load = cold_start(f"import pickle; pickle.load(open({pipeline_path!r}, 'rb'))", repeat)
+    flat_load = cold_start(f"import sys; sys.path.insert(0, {ROOT!r}); "
+                           f"from src.flat_tree import FlatTree; FlatTree.load({tree_path!r})", repeat)
+    click.echo(f"cold start + load: pickle {pickle_load * 1000:.0f} ms, flat .npy {flat_load * 1000:.0f} ms "
+               f"({pickle_load / flat_load:.1f}x)")
+
+    pipeline = load_pipeline(pipeline_path)
+    tree = FlatTree.load(tree_path)
+    sample = pd.read_csv(features_path)
+    rng = np.random.default_rng(123)
+
+    click.echo(f"{'rows':>10} {'sklearn (ms)':>13} {'flat (ms)':>10} {'speedup':>8} {'rows/s (flat)':>14} {'identical':>10}")
+    for n_rows in rows:
+        features = sample.iloc[rng.integers(0, len(sample), size=n_rows)].reset_index(drop=True)
+        X = features.to_numpy()
+        identical = np.array_equal(tree.predict_proba(X), pipeline.predict_proba(features))
+        slow = best_time(lambda: pipeline.predict_proba(features), repeat)
+        fast = best_time(lambda: tree.predict_proba(X), repeat)
+        click.echo(f"{n_rows:>10} {slow * 1000:>13.3f} {fast * 1000:>10.3f} {slow / fast:>7.1f}x "
+                   f"{n_rows / fast:>14,.0f} {str(identical):>10}")
+
+if __name__ == '__main__':
+    main()
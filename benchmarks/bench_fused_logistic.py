@@ -0,0 +1,82 @@
+# bench_fused_logistic.py
+# date: 2026-10-18
+#
+# Compares the fused NumPy logistic regression scorer with the pickled
+# preprocessor + pipeline: cold-start load time (fresh interpreter, imports
+# included), per-call latency and throughput.
+#
+# python benchmarks/bench_fused_logistic.py --rows 1 --rows 100 --rows 100000
+
+import click
+import os
+import pickle
+import subprocess
+import time
+import numpy as np
+import pandas as pd
+import sys
+import warnings
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.fused_logistic import FusedLogisticScorer
+from src.score_batch import score_batch
+
+warnings.filterwarnings('ignore')
+
+def best_time(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def cold_start(code, repeat):
+    """Best wall time of a fresh interpreter running code, imports included."""
+    return best_time(lambda: subprocess.run([sys.executable, "-c", code], check=True), repeat)
+
+def load_pickles(preprocessor_path, pipeline_path):
+    with open(preprocessor_path, 'rb') as f:
+        preprocessor = pickle.load(f)
+    with open(pipeline_path, 'rb') as f:
+        pipeline = pickle.load(f)
+    return preprocessor, pipeline
+
+@click.command()
+@click.option('--records', 'records_path', type=str, default="data/processed/X_test.csv", help="Cleaned-schema records to resample")
+@click.option('--models-dir', type=str, default="results/models", help="Directory with the pickles and the fused scorer")
+@click.option('--rows', type=int, multiple=True, default=[1, 100, 10_000, 1_000_000], help="Batch sizes to benchmark")
+@click.option('--repeat', type=int, default=5, help="Number of timed repeats")
+def main(records_path, models_dir, rows, repeat):
+    """Prints load time and per-batch scoring time of both scorers."""
+    preprocessor_path = os.path.join(models_dir, "preprocessor.pickle")
+    pipeline_path = os.path.join(models_dir, "logistic_regression.pkl")
+    scorer_path = os.path.join(models_dir, "logistic_regression_scorer.npz")
+
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    pickle_load = cold_start(f"import pickle; pickle.load(open({preprocessor_path!r}, 'rb')); "
+                             f"pickle.load(open({pipeline_path!r}, 'rb'))", repeat)
+    fused_load = cold_start(f"import sys; sys.path.insert(0, {root!r}); "
+                            f"from src.fused_logistic import FusedLogisticScorer; "
+                            f"FusedLogisticScorer.load({scorer_path!r})", repeat)
+    click.echo(f"cold start + load: pickles {pickle_load * 1000:.0f} ms, fused .npz {fused_load * 1000:.0f} ms "
+               f"({pickle_load / fused_load:.1f}x)")
+
+    preprocessor, pipeline = load_pickles(preprocessor_path, pipeline_path)
+    scorer = FusedLogisticScorer.load(scorer_path)
+    feature_names = preprocessor.get_feature_names_out()
+    sample = pd.read_csv(records_path)
+    rng = np.random.default_rng(123)
+
+    click.echo(f"{'rows':>10} {'sklearn (ms)':>13} {'fused (ms)':>11} {'speedup':>8} {'max |diff|':>11}")
+    for n_rows in rows:
+        records = sample.iloc[rng.integers(0, len(sample), size=n_rows)].reset_index(drop=True)
+        columns = {name: records[name].to_numpy() for name in records.columns}
+        reference = score_batch(preprocessor, pipeline, records, feature_names)["probability"].to_numpy()
+        diff = np.abs(scorer.predict_proba(columns)[:, 1] - reference).max()
+        slow = best_time(lambda: score_batch(preprocessor, pipeline, records, feature_names), repeat)
+        fast = best_time(lambda: scorer.predict_proba(columns), repeat)
+        click.echo(f"{n_rows:>10} {slow * 1000:>13.3f} {fast * 1000:>11.3f} {slow / fast:>7.0f}x {diff:>11.1e}")
+
+if __name__ == '__main__':
+    main()
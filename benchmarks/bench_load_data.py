@@ -0,0 +1,55 @@
+# bench_load_data.py
+# date: 2026-10-18
+#
+# Times load_data() on transformed feature matrices stored as CSV, memory-mapped
+# .npy and, when pyarrow is installed, Parquet and Feather.
+#
+# python benchmarks/bench_load_data.py --rows 100000 --rows 1000000
+
+import click
+import importlib.util
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.load_data import load_data
+from src.save_data import save_data
+
+def best_load_time(x_path, y_path, repeat):
+    """Returns the best wall time of load_data() plus one full read of the values."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        X, _ = load_data(x_path, y_path)
+        X.to_numpy().sum()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+@click.command()
+@click.option('--transformed-data', type=str, default="data/processed/X_train_transformed.csv", help="Transformed matrix to resample rows from")
+@click.option('--rows', type=int, multiple=True, default=[100_000, 1_000_000], help="Row counts to benchmark")
+@click.option('--repeat', type=int, default=3, help="Number of timed repeats")
+def main(transformed_data, rows, repeat):
+    """Prints load time per storage format and the speedup over CSV."""
+    sample = pd.read_csv(transformed_data)
+    formats = ["csv", "npy"]
+    if importlib.util.find_spec("pyarrow") is not None:
+        formats += ["parquet", "feather"]
+
+    click.echo(f"{'rows':>10} " + " ".join(f"{fmt + ' (s)':>13}" for fmt in formats))
+    rng = np.random.default_rng(123)
+    with tempfile.TemporaryDirectory() as tmp:
+        y_path = os.path.join(tmp, "y.csv")
+        for n_rows in rows:
+            X = sample.iloc[rng.integers(0, len(sample), size=n_rows)].reset_index(drop=True)
+            pd.Series(rng.integers(0, 2, size=n_rows), name="diagnosis").to_csv(y_path, index=False)
+            timings = {fmt: best_load_time(save_data(X, tmp, "X", storage=fmt), y_path, repeat) for fmt in formats}
+            cells = [f"{timings[fmt]:>6.3f} ({timings['csv'] / timings[fmt]:>4.0f}x)" for fmt in formats]
+            click.echo(f"{n_rows:>10} " + " ".join(cells))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# bench_run_pipeline.py
+# date: 2026-10-18
+#
+# Compares the end-to-end time of the Makefile pipeline (one process per stage,
+# artifacts re-read from disk, stage cache empty) with the in-process runner
+# scripts/run_pipeline.py. Both run in scratch copies of the repository on the
+# same raw CSV; the report (quarto) is left out of both.
+#
+# python benchmarks/bench_run_pipeline.py --raw-data data/raw/raw_heart_disease_data.csv --repeat 3
+
+import click
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+MAKE_TARGETS = ["data", "figures", "fits", "evals"]
+
+def scratch_copy(directory):
+    """Copies the code of the pipeline into directory."""
+    for name in ("scripts", "src"):
+        shutil.copytree(os.path.join(ROOT, name), os.path.join(directory, name),
+                        ignore=shutil.ignore_patterns("__pycache__"))
+    shutil.copy(os.path.join(ROOT, "Makefile"), directory)
+
+def timed_run(command, cwd):
+    start = time.perf_counter()
+    subprocess.run(command, cwd=cwd, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+@click.command()
+@click.option('--raw-data', type=str, default="data/raw/raw_heart_disease_data.csv", help="Raw CSV used as the download source by both pipelines")
+@click.option('--repeat', type=int, default=3, help="Number of timed runs of each pipeline")
+def main(raw_data, repeat):
+    """Prints the best end-to-end time of make and of the in-process runner."""
+    raw_data = os.path.abspath(raw_data)
+    make_times, runner_times = [], []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            scratch_copy(tmp)
+            make_times.append(timed_run(["make", *MAKE_TARGETS, f"DATA_URL={raw_data}",
+                                         f"STAGE_STORE={os.path.join(tmp, '.stage_cache')}"], tmp))
+        with tempfile.TemporaryDirectory() as tmp:
+            scratch_copy(tmp)
+            runner_times.append(timed_run([sys.executable, "scripts/run_pipeline.py", f"--url={raw_data}"], tmp))
+
+    click.echo(f"{'make ' + ' '.join(MAKE_TARGETS):<30}{min(make_times):>8.2f}s")
+    click.echo(f"{'scripts/run_pipeline.py':<30}{min(runner_times):>8.2f}s  ({min(make_times) / min(runner_times):.1f}x)")
+
+if __name__ == '__main__':
+    main()
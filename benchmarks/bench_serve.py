@@ -0,0 +1,102 @@
+# bench_serve.py
+# date: 2026-10-18
+#
+# Load generator for scripts/serve.py. Starts the server on localhost, sends
+# single-record requests from many concurrent keep-alive connections and reports
+# client-side latency percentiles and throughput next to the server's /metrics.
+# Run it with --max-batch-size 1 to compare against scoring without micro-batching.
+#
+# python benchmarks/bench_serve.py --concurrency 64 --requests 5000
+
+import asyncio
+import click
+import json
+import os
+import subprocess
+import time
+import numpy as np
+import pandas as pd
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+async def http_request(reader, writer, method, path, payload=None):
+    """Sends one keep-alive request and returns the decoded JSON response."""
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    await reader.readline()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        key, _, value = line.decode().partition(":")
+        headers[key.strip().lower()] = value.strip()
+    return json.loads(await reader.readexactly(int(headers["content-length"])))
+
+async def client(host, port, model, records, n_requests, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    for i in range(n_requests):
+        start = time.perf_counter()
+        await http_request(reader, writer, "POST", f"/predict/{model}", records[i % len(records)])
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+async def wait_for_server(host, port, timeout=60):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            await http_request(reader, writer, "GET", "/health")
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise TimeoutError("Scoring server did not start.")
+
+async def run_load(host, port, model, records, concurrency, n_requests):
+    await wait_for_server(host, port)
+    latencies = []
+    per_client = n_requests // concurrency
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, model, records, per_client, latencies) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    metrics = await http_request(reader, writer, "GET", "/metrics")
+    writer.close()
+    return np.array(latencies) * 1000, elapsed, metrics[model]
+
+@click.command()
+@click.option('--records', 'records_path', type=str, default="data/processed/X_test.csv", help="Cleaned-schema records to send")
+@click.option('--model', type=click.Choice(['decision_tree', 'logistic_regression']), default='logistic_regression', help="Model to score with")
+@click.option('--port', type=int, default=8765, help="Port of the local server")
+@click.option('--concurrency', type=int, default=64, help="Number of concurrent connections")
+@click.option('--requests', 'n_requests', type=int, default=5000, help="Total number of requests")
+@click.option('--max-batch-size', type=int, default=256, help="Server micro-batch size")
+@click.option('--max-wait-ms', type=float, default=2.0, help="Server micro-batch wait")
+def main(records_path, model, port, concurrency, n_requests, max_batch_size, max_wait_ms):
+    """Starts the scoring server and drives single-record requests against it."""
+    records = pd.read_csv(os.path.join(ROOT, records_path)).to_dict(orient="records")
+    server = subprocess.Popen([sys.executable, os.path.join(ROOT, "scripts", "serve.py"),
+                               "--models-dir", os.path.join(ROOT, "results", "models"), "--model", model,
+                               "--port", str(port), "--max-batch-size", str(max_batch_size),
+                               "--max-wait-ms", str(max_wait_ms)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        latencies, elapsed, metrics = asyncio.run(
+            run_load("127.0.0.1", port, model, records, concurrency, n_requests))
+    finally:
+        server.terminate()
+        server.wait()
+
+    click.echo(f"{len(latencies)} requests, {concurrency} connections, max batch {max_batch_size}, wait {max_wait_ms} ms")
+    click.echo(f"client:  p50 {np.percentile(latencies, 50):.2f} ms  p99 {np.percentile(latencies, 99):.2f} ms  "
+               f"{len(latencies) / elapsed:,.0f} requests/s")
+    click.echo(f"server:  p50 {metrics['p50_ms']:.2f} ms  p99 {metrics['p99_ms']:.2f} ms  "
+               f"{metrics['batches']} batches, {metrics['mean_batch_records']:.1f} records/batch")
+
+if __name__ == '__main__':
+    main()
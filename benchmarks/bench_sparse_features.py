@@ -0,0 +1,70 @@
+# bench_sparse_features.py
+# date: 2026-10-18
+#
+# Compares dense (CSV storage) and sparse ('npz' storage) transformed features
+# on the cleaned data resampled to growing row counts: memory of the feature
+# frame, size on disk, and the time and peak traced memory of a logistic
+# regression fit (including scikit-learn's conversion of sparse frames).
+# --one-hot also one-hot encodes the given numeric columns, to show how the two
+# grow with the number of category levels.
+#
+# python benchmarks/bench_sparse_features.py --rows 10000 --rows 100000 --one-hot cholesterol --one-hot max_heart_rate
+
+import click
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+
+from src.feature_frame import feature_frame, is_sparse_frame
+from src.save_data import save_data
+from split_n_preprocess import make_preprocessor
+
+def fit_cost(X, y):
+    """Returns the wall time and peak traced memory (MB) of a logistic regression fit."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    LogisticRegression(max_iter=1000).fit(X, y)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return seconds, peak
+
+@click.command()
+@click.option('--cleaned-data', type=str, default="data/cleaned/cleaned_heart_disease_data.csv", help="Cleaned data to resample")
+@click.option('--rows', type=int, multiple=True, default=[10_000, 100_000], help="Row counts to benchmark")
+@click.option('--one-hot', type=str, multiple=True, help="Numeric column to one-hot encode as well (repeatable)")
+def main(cleaned_data, rows, one_hot):
+    """Prints memory, disk size and fit cost of dense and sparse features for each row count."""
+    df = pd.read_csv(cleaned_data)
+    click.echo(f"{'rows':>9} {'storage':>7} {'layout':>7} {'columns':>8} {'memory MB':>10} {'disk MB':>9} {'fit s':>7} {'fit peak MB':>12}")
+    rng = np.random.default_rng(123)
+    for n_rows in rows:
+        data = df.iloc[rng.integers(0, len(df), n_rows)].reset_index(drop=True)
+        X, y = data.drop(columns=["diagnosis"]), data["diagnosis"]
+        for storage in ["csv", "npz"]:
+            preprocessor = make_preprocessor(sparse=storage == "npz")
+            if one_hot:
+                # move the columns from the scaler to the encoder
+                scaler, encoder = preprocessor.transformers[0], preprocessor.transformers[1]
+                preprocessor.transformers = [
+                    (scaler[0], scaler[1], [col for col in scaler[2] if col not in one_hot]),
+                    (encoder[0], encoder[1], encoder[2] + list(one_hot))
+                ]
+            X_enc = feature_frame(preprocessor.fit_transform(X), preprocessor.get_feature_names_out())
+            memory = X_enc.memory_usage(deep=True).sum() / 1e6
+            with tempfile.TemporaryDirectory() as tmp:
+                disk = os.path.getsize(save_data(X_enc, tmp, "X", storage)) / 1e6
+            seconds, peak = fit_cost(X_enc, y)
+            # the dense preprocessor still returns sparse output below 30% non-zero values
+            layout = "sparse" if is_sparse_frame(X_enc) else "dense"
+            click.echo(f"{n_rows:>9} {storage:>7} {layout:>7} {X_enc.shape[1]:>8} {memory:>10.2f} {disk:>9.2f} {seconds:>7.2f} {peak:>12.1f}")
+
+if __name__ == '__main__':
+    main()
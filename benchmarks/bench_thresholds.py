@@ -0,0 +1,54 @@
+# bench_thresholds.py
+# date: 2026-10-18
+#
+# Compares sweeping the decision threshold over scored rows by rescoring at
+# every threshold (a confusion matrix per threshold, timed on --rescored
+# thresholds and extrapolated to all of them) with the single-sort sweep of
+# src/threshold_curves.py, for growing numbers of rows of synthetic scores
+# rounded to --decimals (so the number of distinct thresholds is bounded).
+# sklearn's roc_curve is timed for reference.
+#
+# python benchmarks/bench_thresholds.py --rows 100000 --rows 1000000 --rows 10000000
+
+import click
+import os
+import sys
+import time
+import numpy as np
+from sklearn.metrics import roc_curve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.threshold_curves import threshold_sweep, roc_auc, average_precision, operating_point
+
+@click.command()
+@click.option('--rows', type=int, multiple=True, default=[100_000, 1_000_000, 10_000_000], help="Numbers of scored rows")
+@click.option('--decimals', type=int, default=4, help="Decimals the scores are rounded to")
+@click.option('--rescored', type=int, default=20, help="Thresholds timed for the rescoring sweep")
+def main(rows, decimals, rescored):
+    """Prints the time of the rescoring and single-sort sweeps for each number of rows."""
+    click.echo(f"{'rows':>10} {'thresholds':>10} {'rescore s':>10} {'sweep s':>8} {'roc_curve s':>11} {'speedup':>9}")
+    rng = np.random.default_rng(123)
+    for n_rows in rows:
+        y = rng.integers(0, 2, n_rows)
+        scores = np.round(np.clip(0.3 * y + 0.8 * rng.random(n_rows), 0, 1), decimals)
+
+        start = time.perf_counter()
+        sweep = threshold_sweep(y, scores)
+        roc_auc(sweep), average_precision(sweep), operating_point(sweep, 0.9)
+        single = time.perf_counter() - start
+
+        thresholds = sweep["threshold"].to_numpy()[1:]
+        start = time.perf_counter()
+        positive = y == 1
+        for threshold in thresholds[:rescored]:
+            predicted = scores >= threshold
+            tp, fp = np.sum(predicted & positive), np.sum(predicted & ~positive)
+        rescore = (time.perf_counter() - start) * len(thresholds) / min(rescored, len(thresholds))
+
+        start = time.perf_counter()
+        roc_curve(y, scores, drop_intermediate=False)
+        reference = time.perf_counter() - start
+        click.echo(f"{n_rows:>10} {len(thresholds):>10} {rescore:>10.2f} {single:>8.3f} {reference:>11.3f} {rescore / single:>8.0f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# bench_update_model.py
+# date: 2026-10-18
+#
+# Compares adding a batch of new labeled records to a model by refitting it on
+# the whole history plus the batch (fit_model.py) and by updating it with the
+# batch alone (update_model.py). The cleaned data is resampled to growing
+# history sizes: the refit grows with the history, the update only with the
+# batch.
+#
+# python benchmarks/bench_update_model.py --history 10000 --history 100000 --history 1000000 --batch 10000
+
+import click
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+
+from src.feature_frame import feature_frame
+from src.update_batch import update_batch
+from fit_model import build_pipeline
+from split_n_preprocess import make_preprocessor
+
+@click.command()
+@click.option('--cleaned-data', type=str, default="data/cleaned/cleaned_heart_disease_data.csv", help="Cleaned data to resample")
+@click.option('--history', type=int, multiple=True, default=[10_000, 100_000, 1_000_000], help="Rows the model was fitted on before the batch")
+@click.option('--batch', 'batch_size', type=int, default=10_000, help="Rows of the new batch")
+def main(cleaned_data, history, batch_size):
+    """Prints the time of a full refit and of an incremental update for each history size."""
+    df = pd.read_csv(cleaned_data)
+    rng = np.random.default_rng(123)
+    batch = df.iloc[rng.integers(0, len(df), batch_size)].reset_index(drop=True)
+    click.echo(f"{'history':>9} {'batch':>7} {'refit s':>8} {'update s':>9} {'speedup':>8}")
+    for n_rows in history:
+        data = df.iloc[rng.integers(0, len(df), n_rows)].reset_index(drop=True)
+        preprocessor = make_preprocessor().fit(data.drop(columns=["diagnosis"]))
+        feature_names = preprocessor.get_feature_names_out()
+        pipeline = build_pipeline('sgd_logistic_regression', 123)
+        pipeline.fit(feature_frame(preprocessor.transform(data.drop(columns=["diagnosis"])), feature_names), data["diagnosis"])
+
+        start = time.perf_counter()
+        combined = pd.concat([data, batch], ignore_index=True)
+        X = feature_frame(preprocessor.transform(combined.drop(columns=["diagnosis"])), feature_names)
+        build_pipeline('sgd_logistic_regression', 123).fit(X, combined["diagnosis"])
+        refit = time.perf_counter() - start
+
+        start = time.perf_counter()
+        update_batch(preprocessor, pipeline, batch, feature_names)
+        update = time.perf_counter() - start
+        click.echo(f"{n_rows:>9} {batch_size:>7} {refit:>8.3f} {update:>9.3f} {refit / update:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -3,83 +3,123 @@
 # date: 2024-12-06
 
 import click
+import glob
 import os
 import pandas as pd
 import sys
 
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
-from validate_data import validate_csv_schema
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.validate_data import validate_csv_schema
+from src.categorical_codec import apply_codecs, CATEGORY_CODECS
+from src.create_dir_if_not_exist import create_dir_if_not_exist
 
 import warnings
 warnings.filterwarnings('ignore')
 
-def clean_data(raw_data, write_to):
+NEW_COLUMN_NAMES = ["age", "sex", "chest_pain_type", "resting_blood_pressure", "cholesterol", "fasting_blood_sugar", 
+                    "rest_ecg", "max_heart_rate", "exercise_induced_angina", "st_depression", "slope", 
+                    "num_of_vessels", "thalassemia", "diagnosis"]
+
+# Numeric columns are cast after dropping nulls so that every chunk is written with the
+# same dtypes as the whole file would be, whatever values a given chunk happens to hold.
+NUMERIC_DTYPES = {
+    "age": "int64",
+    "sex": "int64",
+    "resting_blood_pressure": "int64",
+    "cholesterol": "int64",
+    "max_heart_rate": "int64",
+    "st_depression": "float64",
+    "num_of_vessels": "float64"
+}
+
+def clean_chunk(df):
     """
-    Processes the raw heart disease dataset, renaming columns, relabeling categorical values, 
-    and cleaning the data (e.g., dropping missing values).
+    Renames columns, relabels categorical values and drops missing values
+    for one frame (or chunk) of the raw heart disease dataset.
 
     Parameters:
-    raw_data (str): Path to the raw data CSV file.
-    write_to (str): Directory where the processed data will be saved.
+    df (DataFrame): Raw data with the original UCI column order.
 
-    Saves the processed dataset as 'processed_heart_disease_data.csv' in the specified directory.
+    Returns:
+    DataFrame: The cleaned frame.
     """
-
-    df = pd.read_csv(raw_data)
-
     # rename columns
-    new_column_names = ["age", "sex", "chest_pain_type", "resting_blood_pressure", "cholesterol", "fasting_blood_sugar", 
-                "rest_ecg", "max_heart_rate", "exercise_induced_angina", "st_depression", "slope", 
-               "num_of_vessels", "thalassemia", "diagnosis"]
-    
-    df.columns = new_column_names
+    df.columns = NEW_COLUMN_NAMES
 
     # re-label classes
-    df.loc[(df['chest_pain_type'] == 1), 'chest_pain_type'] = 'typical angina'
-    df.loc[(df['chest_pain_type'] == 2), 'chest_pain_type'] = 'atypical angina'
-    df.loc[(df['chest_pain_type'] == 3), 'chest_pain_type'] = 'non-anginal pain'
-    df.loc[(df['chest_pain_type'] == 4), 'chest_pain_type'] = 'asymptomatic'
+    df = apply_codecs(df, CATEGORY_CODECS)
 
-    df.loc[(df['fasting_blood_sugar'] == 'yes'), 'fasting_blood_sugar'] = 1
-    df.loc[(df['fasting_blood_sugar'] == 'no'), 'fasting_blood_sugar'] = 0
+    # drop null values
+    df = df.dropna()
 
-    df.loc[(df['rest_ecg'] == 0), 'rest_ecg'] = 'normal'
-    df.loc[(df['rest_ecg'] == 1), 'rest_ecg'] = 'ST-T wave abnormality'
-    df.loc[(df['rest_ecg'] == 2), 'rest_ecg'] = 'left ventricular hypertrophy'
+    return df.astype(NUMERIC_DTYPES)
 
-    df.loc[(df['exercise_induced_angina'] == 0), 'exercise_induced_angina'] = 'no'
-    df.loc[(df['exercise_induced_angina'] == 1), 'exercise_induced_angina'] = 'yes'
+def clean_data(raw_data, write_to, chunksize=None, output_format="csv"):
+    """
+    Processes the raw heart disease dataset, renaming columns, relabeling categorical values, 
+    and cleaning the data (e.g., dropping missing values).
 
-    df.loc[(df['slope'] == 1), 'slope'] = 'upsloping'
-    df.loc[(df['slope'] == 2), 'slope'] = 'flat'
-    df.loc[(df['slope'] == 3), 'slope'] = 'downsloping'
+    Categorical values are relabelled with the codec table in ``src/categorical_codec.py``
+    in one vectorized pass per column, producing ``category`` columns. Values without a
+    codec entry keep their raw code, so validation reports them instead of their rows
+    being dropped along with the null rows.
 
-    df.loc[(df['thalassemia'] == 3.), 'thalassemia'] = 'normal'
-    df.loc[(df['thalassemia'] == 6.), 'thalassemia'] = 'fixed defect'
-    df.loc[(df['thalassemia'] == 7.), 'thalassemia'] = 'reversable defect'
+    When ``chunksize`` is given the raw file is streamed ``chunksize`` rows at a time and
+    each cleaned chunk is appended to the output, so peak memory is bounded by the chunk
+    size rather than the file size. The output is identical to the in-memory path.
 
-    df.loc[(df['diagnosis'] == 2), 'diagnosis'] = 1
-    df.loc[(df['diagnosis'] == 3), 'diagnosis'] = 1
-    df.loc[(df['diagnosis'] == 4), 'diagnosis'] = 1
+    Parameters:
+    raw_data (str): Path to the raw data CSV file.
+    write_to (str): Directory where the processed data will be saved.
+    chunksize (int, optional): Number of rows to read at a time. Reads the whole file when None.
+    output_format (str, optional): 'csv' for a single CSV file, or 'parquet' for a directory
+                                   of Parquet partitions (one per chunk, requires pyarrow).
 
-    # drop null values
-    df = df.dropna()
+    Returns:
+    str: Path to the cleaned dataset.
+
+    Saves the processed dataset as 'cleaned_heart_disease_data.csv' (or the
+    'cleaned_heart_disease_data.parquet' directory) in the specified directory.
+    """
+    if output_format not in ("csv", "parquet"):
+        raise ValueError("Invalid output format. Choose 'csv' or 'parquet'.")
+
+    create_dir_if_not_exist(write_to)
+    output_path = os.path.join(write_to, f"cleaned_heart_disease_data.{output_format}")
+
+    if output_format == "parquet":
+        # remove partitions left over from a previous run
+        create_dir_if_not_exist(output_path)
+        for part in glob.glob(os.path.join(output_path, "part-*.parquet")):
+            os.remove(part)
+
+    if chunksize is None:
+        chunks = [pd.read_csv(raw_data)]
+    else:
+        chunks = pd.read_csv(raw_data, chunksize=chunksize)
+
+    for i, chunk in enumerate(chunks):
+        df = clean_chunk(chunk)
+
+        if output_format == "csv":
+            df.to_csv(output_path, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+        else:
+            df.to_parquet(os.path.join(output_path, f"part-{i:05d}.parquet"), index=False)
 
-    try:
-        df.to_csv(os.path.join(write_to, "cleaned_heart_disease_data.csv"), index=False)
-    except:
-        os.mkdir(write_to)
-        df.to_csv(os.path.join(write_to, "cleaned_heart_disease_data.csv"), index=False)
+    return output_path
 
 @click.command()
 @click.option('--raw-data', type=str, help="Path to raw data")
 @click.option('--write-to', type=str, help="Path to directory where processed data will be written to")
-def main(raw_data, write_to):
+@click.option('--chunksize', type=int, default=None, help="Stream the raw data this many rows at a time (default: read it all at once)")
+@click.option('--output-format', type=click.Choice(['csv', 'parquet']), default='csv', help="Write a single CSV or partitioned Parquet (one file per chunk)")
+@click.option('--correlation-engine', type=click.Choice(['native', 'deepchecks']), default='native', help="Engine used for the correlation checks (deepchecks is slower)")
+@click.option('--correlation-samples', type=int, default=None, help="Stratified sample size for the correlation checks (default: all rows)")
+def main(raw_data, write_to, chunksize, output_format, correlation_engine, correlation_samples):
 
-    clean_data(raw_data, write_to)
-    validate_csv_schema(os.path.join(write_to, "cleaned_heart_disease_data.csv"))
-    
+    output_path = clean_data(raw_data, write_to, chunksize, output_format)
+    validate_csv_schema(output_path, correlation_engine, correlation_samples)
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -4,32 +4,42 @@
 
 import click
 import os
-import pandas as pd
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.fetch_file import fetch_file
 
 @click.command()
 @click.option('--url', type=str, help=".csv URL of dataset to be downloaded")
 @click.option('--write-to', type=str, help="Path to directory where raw data will be written to")
+@click.option('--sha256', type=str, default=None, help="Expected SHA-256 of the file; the download fails on a mismatch")
+@click.option('--mirror-dir', type=str, default=None, help="Directory of local copies kept across runs and used when offline")
+@click.option('--timeout', type=float, default=30, help="Network timeout in seconds")
 
-def main(url, write_to):
+def main(url, write_to, sha256, mirror_dir, timeout):
     """
     Downloads a CSV file from the specified URL and saves it to a local directory.
     
     Args:
         url (str): The URL of the CSV file to download.
         write_to (str): The directory path where the file should be saved.
+        sha256 (str): Expected SHA-256 of the file (optional).
+        mirror_dir (str): Directory of local copies (optional).
+        timeout (float): Network timeout in seconds.
         
     Saves:
         raw_heart_disease_data.csv (str): The CSV file saved in the specified directory.
         
-    If the directory does not exist, it is created.
+    If the directory does not exist, it is created. The bytes are streamed to disk as
+    served; a file that is still current on the server costs one HEAD request, and an
+    interrupted download is resumed (see src/fetch_file.py).
     """
     try:
-        df = pd.read_csv(url)
-        df.to_csv("" + write_to + "raw_heart_disease_data.csv", index=False)
-    except:
-        os.makedirs(write_to)
-        df = pd.read_csv(url)
-        df.to_csv("" + write_to + "raw_heart_disease_data.csv", index=False)
+        result = fetch_file(url, os.path.join(write_to, "raw_heart_disease_data.csv"), sha256=sha256 or None,
+                            mirror_dir=mirror_dir or None, timeout=timeout)
+        click.echo(f"{result['path']}: {result['status']} ({result['size']} bytes, sha256 {result['sha256'][:12]})")
+    except Exception as e:
+        raise Exception(f"An error occurred while downloading the data: {e}")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -1,28 +1,107 @@
 import click
 import os
 import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.cross_validate_folds import run_in_pool
+from src.eda_aggregates import histogram_summary
+from src.correlation_checks import stratified_sample
+from src.streaming_stats import accumulate_csv
+from src.validate_data import compact_dtypes
+
+PAIRPLOT_FEATURES = ["age", "resting_blood_pressure", "cholesterol", "max_heart_rate", "st_depression"]
+EDA_MODES = ["exact", "binned"]
 
 @click.command()
 @click.option('--training-data', type=str, help="Path to processed heart disease data")
 @click.option('--target-data', type=str, help="Path to target data (y_train)")
 @click.option('--plot-to', type=str, help="Path to directory where the plots will be saved")
+@click.option('--mode', type=click.Choice(EDA_MODES), default="exact",
+              help="'exact' draws every row; 'binned' draws density plots from 2-D histograms for large data")
+@click.option('--bins', type=int, default=50, help="Number of bins per feature in binned mode (the maximum with --chunksize)")
+@click.option('--sample-size', type=int, default=0, help="Rows of a stratified sample drawn as scatter points in binned mode (0 for none)")
+@click.option('--n-jobs', type=int, default=1, help="Number of processes rendering the three figures (-1 for all CPUs)")
+@click.option('--chunksize', type=int, default=None, help="Binned mode only: stream the data this many rows at a time instead of loading it")
 
-def main(training_data, target_data, plot_to):
-    '''Creates and saves EDA plots: diagnosis distribution bar chart, correlation heatmap, 
+def main(training_data, target_data, plot_to, mode, bins, sample_size, n_jobs, chunksize):
+    '''Creates and saves EDA plots: diagnosis distribution bar chart, correlation heatmap,
        and density plots of numeric features grouped by diagnosis.'''
-    
-    df_features = pd.read_csv("data/processed/X_train.csv")
-    df_target = pd.read_csv("data/processed/y_train.csv")
-   
-    df = pd.concat([df_features, df_target['diagnosis']], axis=1)
 
-  
+    if chunksize is not None:
+        if mode != "binned":
+            raise click.UsageError("--chunksize requires --mode=binned.")
+        create_streaming_eda_plots(training_data, target_data, plot_to, chunksize, bins, sample_size, n_jobs)
+        return
+
+    df_features = pd.read_csv(training_data, dtype=compact_dtypes())
+    df_target = pd.read_csv(target_data, dtype=compact_dtypes())
+
+    create_eda_plots(df_features, df_target['diagnosis'], plot_to, mode, bins, sample_size, n_jobs)
+
+def create_eda_plots(df_features, target, plot_to, mode="exact", bins=50, sample_size=0, n_jobs=1):
+    '''Saves the EDA plots of the training features and their diagnosis Series to plot_to.
+
+    In 'binned' mode the data is first reduced to class counts, the correlation matrix and
+    binned histograms (see src/eda_aggregates.py), so drawing takes the same time for any
+    number of rows; only a stratified sample of sample_size rows is drawn point by point.
+    The three figures are rendered on up to n_jobs processes.'''
+
+    if mode not in EDA_MODES:
+        raise ValueError(f"Invalid EDA mode. Choose one of {EDA_MODES}.")
+
+    df = pd.concat([df_features, target], axis=1)
+
+
     if not os.path.exists(plot_to):
         os.makedirs(plot_to)
-        
-    # Diagnosis distribution bar chart
+
+    if mode == "exact":
+        tasks = [
+            (plot_diagnosis_distribution, df, plot_to),
+            (plot_correlation_heatmap, df.select_dtypes(include=['number']).corr(), plot_to),
+            (plot_feature_densities, df, plot_to)
+        ]
+    else:
+        summary = histogram_summary(df, PAIRPLOT_FEATURES, 'diagnosis', bins)
+        sample = stratified_sample(df[PAIRPLOT_FEATURES + ['diagnosis']], 'diagnosis', sample_size) if sample_size else None
+        tasks = [
+            (plot_diagnosis_counts, summary["class_counts"], plot_to),
+            (plot_correlation_heatmap, df.select_dtypes(include=['number']).corr(), plot_to),
+            (plot_binned_densities, summary, sample, plot_to)
+        ]
+    run_in_pool(render, tasks, n_jobs)
+
+def create_streaming_eda_plots(training_data, target_data, plot_to, chunksize, max_bins=50, sample_size=0, n_jobs=1):
+    '''Saves the binned EDA plots of the training features and targets CSV files without loading them.
+
+    The files are read once, chunksize rows at a time on up to n_jobs processes, into
+    the mergeable statistics of src/streaming_stats.py (class counts, co-moments,
+    histograms and a stratified sample), and every figure is drawn from those.'''
+
+    stats = accumulate_csv(training_data, target_data, 'diagnosis', PAIRPLOT_FEATURES, chunksize, n_jobs,
+                           max_bins=max_bins, sample_size=sample_size, dtype=compact_dtypes())
+    summary = stats.summary()
+
+    if not os.path.exists(plot_to):
+        os.makedirs(plot_to)
+
+    tasks = [
+        (plot_diagnosis_counts, summary["class_counts"], plot_to),
+        (plot_correlation_heatmap, stats.correlation(), plot_to),
+        (plot_binned_densities, summary, stats.sample(), plot_to)
+    ]
+    run_in_pool(render, tasks, n_jobs)
+
+def render(plot, *args):
+    '''Draws one figure; the entry point of the rendering processes.'''
+    plot(*args)
+
+def plot_diagnosis_distribution(df, plot_to):
+    '''Diagnosis distribution bar chart'''
     plt.figure(figsize=(8, 6))
     sns.countplot(x='diagnosis', data=df, hue='diagnosis', palette='Blues', legend=False)
     plt.xlabel('Diagnosis')
@@ -31,28 +110,77 @@ def main(training_data, target_data, plot_to):
     plt.savefig(diagnosis_plot_path)
     plt.close()
 
-    # Correlation heatmap
+def plot_diagnosis_counts(class_counts, plot_to):
+    '''Diagnosis distribution bar chart from precomputed class counts'''
+    plt.figure(figsize=(8, 6))
+    labels = [str(label) for label in class_counts.index]
+    sns.barplot(x=labels, y=class_counts.to_numpy(), hue=labels, palette='Blues', legend=False)
+    plt.xlabel('Diagnosis')
+    plt.ylabel('Count')
+    diagnosis_plot_path = os.path.join(plot_to, 'diagnosis_distribution.png')
+    plt.savefig(diagnosis_plot_path)
+    plt.close()
+
+def plot_correlation_heatmap(correlation_matrix, plot_to):
+    '''Correlation heatmap'''
     plt.figure(figsize=(10, 8))
-    numeric_data = df.select_dtypes(include=['number']) 
-    correlation_matrix = numeric_data.corr()
     sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', cbar_kws={'label': 'Correlation Coefficient'})
     heatmap_plot_path = os.path.join(plot_to, 'correlation_heatmap.png')
     plt.savefig(heatmap_plot_path)
     plt.close()
 
-    # Pairplot grouped by diagnosis
-    pairplot_data = df[["age", "resting_blood_pressure", "cholesterol", "max_heart_rate", "st_depression", "diagnosis"]]
+def plot_feature_densities(df, plot_to):
+    '''Pairplot grouped by diagnosis'''
+    pairplot_data = df[PAIRPLOT_FEATURES + ["diagnosis"]]
     pairplot = sns.pairplot(
         pairplot_data,
         hue='diagnosis',
-        diag_kind='kde', 
-        plot_kws={'alpha': 0.7, 's': 50}, 
-        diag_kws={'fill': True}  
+        diag_kind='kde',
+        plot_kws={'alpha': 0.7, 's': 50},
+        diag_kws={'fill': True}
     )
 
     plot_path = os.path.join(plot_to, "feature_densities_by_diagnosis.png")
     pairplot.savefig(plot_path)
     plt.close()
 
+def plot_binned_densities(summary, sample, plot_to):
+    '''Pair grid of binned densities: per-class histograms on the diagonal, 2-D histograms
+    (log-scaled counts, empty bins blank) off the diagonal, and the optional sample drawn as points by diagnosis.'''
+    columns, classes, edges = summary["columns"], summary["classes"], summary["edges"]
+    colors = sns.color_palette(n_colors=len(classes))
+    fig, axes = plt.subplots(len(columns), len(columns), figsize=(2.5 * len(columns), 2.5 * len(columns)))
+
+    for i, row_col in enumerate(columns):
+        for j, col in enumerate(columns):
+            ax = axes[i, j]
+            if i == j:
+                widths = np.diff(edges[col])
+                for counts, color, label in zip(summary["hist1d"][col], colors, classes):
+                    density = counts / max(counts.sum(), 1) / widths
+                    ax.stairs(density, edges[col], fill=True, alpha=0.5, color=color, label=str(label))
+            else:
+                # hist2d holds (first, second) with the first column along the rows
+                if (col, row_col) in summary["hist2d"]:
+                    counts = summary["hist2d"][col, row_col]
+                else:
+                    counts = summary["hist2d"][row_col, col].T
+                ax.pcolormesh(edges[col], edges[row_col], np.ma.masked_equal(np.log1p(counts).T, 0), cmap='Blues', shading='flat')
+                if sample is not None:
+                    for label, color in zip(classes, colors):
+                        points = sample[sample['diagnosis'] == label]
+                        ax.scatter(points[col], points[row_col], s=4, alpha=0.5, color=color)
+            if i == len(columns) - 1:
+                ax.set_xlabel(col)
+            if j == 0:
+                ax.set_ylabel(row_col)
+
+    handles, labels = axes[0, 0].get_legend_handles_labels()
+    fig.legend(handles, labels, title='diagnosis', loc='center right')
+    fig.tight_layout(rect=(0, 0, 0.93, 1))
+    plot_path = os.path.join(plot_to, "feature_densities_by_diagnosis.png")
+    fig.savefig(plot_path)
+    plt.close(fig)
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -7,40 +7,93 @@ import click
 import os
 import pandas as pd
 import numpy as np
-import pickle
 from sklearn.metrics import classification_report
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.load_data import load_data
 from src.save_classification_report import save_classification_report
+from src.load_pipeline import load_pipeline
+from src.bootstrap_metrics import bootstrap_confidence_intervals
+from src.threshold_curves import threshold_sweep, roc_auc, average_precision, operating_point, curve_points
 
-def load_pipeline(pipeline_path):
-    """Loads a saved pipeline object from a Pickle file with error handling."""
+def evaluate_model(pipeline, X_test, y_test, y_pred=None):
+    """Generates predictions (unless given) and classification report with error handling."""
     try:
-        with open(pipeline_path, 'rb') as f:
-            pipeline = pickle.load(f)
-    except FileNotFoundError as e:
-        raise FileNotFoundError(f"Pipeline file not found: {e}")
-    return pipeline
-
-def evaluate_model(pipeline, X_test, y_test):
-    """Generates predictions and classification report with error handling."""
-    try:
-        y_pred = pipeline.predict(X_test)
+        if y_pred is None:
+            y_pred = pipeline.predict(X_test)
         report = classification_report(y_test, y_pred, output_dict=True)
         report_df = pd.DataFrame(report).transpose()
     except Exception as e:
         raise Exception(f"An error occurred during model evaluation: {e}")
     return report_df
 
+def analyze_thresholds(pipeline, X_test, y_test, results_to, sensitivity=0.9, max_points=1000):
+    """
+    Scores the test data with predict_proba once and saves the threshold sweep (at most
+    max_points rows of it), the ROC and precision-recall curves and a summary of the areas
+    and of the operating point with the given sensitivity in results_to, with error handling.
+    Returns the summary.
+    """
+    # matplotlib is only needed for the plots, so it is not imported with the module
+    import matplotlib.pyplot as plt
+    try:
+        scores = pipeline.predict_proba(X_test)[:, list(pipeline.classes_).index(1)]
+        sweep = threshold_sweep(y_test, scores)
+        point = operating_point(sweep, sensitivity)
+        summary = pd.Series({
+            "roc_auc": roc_auc(sweep),
+            "average_precision": average_precision(sweep),
+            "target_sensitivity": sensitivity,
+            "threshold": point["threshold"],
+            "sensitivity": point["tpr"],
+            "specificity": point["specificity"],
+            "precision": point["precision"]
+        }, name="value")
+        summary.index.name = "statistic"
+
+        os.makedirs(results_to, exist_ok=True)
+        points = curve_points(sweep, max_points)
+        points.to_csv(os.path.join(results_to, "threshold_sweep.csv"), index=False)
+        summary.to_csv(os.path.join(results_to, "threshold_summary.csv"))
+
+        plt.figure(figsize=(6, 6))
+        plt.plot(points["fpr"], points["tpr"], label=f"ROC (AUC = {summary['roc_auc']:.3f})")
+        plt.plot([0, 1], [0, 1], linestyle="--", color="grey")
+        plt.scatter([1 - point["specificity"]], [point["tpr"]], color="red", zorder=3,
+                    label=f"Threshold {point['threshold']:.3f}")
+        plt.xlabel("False Positive Rate (1 - Specificity)")
+        plt.ylabel("True Positive Rate (Sensitivity)")
+        plt.legend(loc="lower right")
+        plt.savefig(os.path.join(results_to, "roc_curve.png"))
+        plt.close()
+
+        plt.figure(figsize=(6, 6))
+        plt.plot(points["tpr"], points["precision"], label=f"PR (AP = {summary['average_precision']:.3f})")
+        plt.scatter([point["tpr"]], [point["precision"]], color="red", zorder=3,
+                    label=f"Threshold {point['threshold']:.3f}")
+        plt.xlabel("Recall (Sensitivity)")
+        plt.ylabel("Precision")
+        plt.legend(loc="lower left")
+        plt.savefig(os.path.join(results_to, "pr_curve.png"))
+        plt.close()
+    except Exception as e:
+        raise Exception(f"An error occurred during the threshold analysis: {e}")
+    return summary
+
 @click.command()
-@click.option('--x-test', type=str, help="Path to the test features (CSV file)", required=True)
+@click.option('--x-test', type=str, help="Path to the test features (CSV, .npy, .npz, .parquet or .feather file)", required=True)
 @click.option('--y-test', type=str, help="Path to the test target labels (CSV file)", required=True)
 @click.option('--pipeline-from', type=str, help="Path to the saved pipeline object (Pickle file)", required=True)
 @click.option('--results-to', type=str, help="Directory to save evaluation results", required=True)
 @click.option('--seed', type=int, default=123, help="Random seed for reproducibility")
-def main(x_test, y_test, pipeline_from, results_to, seed):
+@click.option('--bootstrap', type=int, default=0, help="Number of bootstrap resamples of the test set for confidence intervals of the metrics (0 for none)")
+@click.option('--confidence', type=float, default=0.95, help="Confidence level of the bootstrap intervals")
+@click.option('--n-jobs', type=int, default=1, help="Number of processes drawing the bootstrap resamples (-1 for all CPUs)")
+@click.option('--thresholds', is_flag=True, help="Also sweep the decision threshold: ROC and precision-recall curves and an operating point")
+@click.option('--sensitivity', type=float, default=0.9, help="Sensitivity the operating point of --thresholds must reach")
+@click.option('--curve-points', 'max_points', type=int, default=1000, help="Maximum number of thresholds saved and drawn by --thresholds")
+def main(x_test, y_test, pipeline_from, results_to, seed, bootstrap, confidence, n_jobs, thresholds, sensitivity, max_points):
     """Evaluate a classifier on the test data and save the classification report with error handling."""
     try:
         np.random.seed(seed)
@@ -49,13 +102,27 @@ def main(x_test, y_test, pipeline_from, results_to, seed):
         X_test, y_test = load_data(x_test, y_test)
         pipeline = load_pipeline(pipeline_from)
         
-        # Evaluate the model
-        report_df = evaluate_model(pipeline, X_test, y_test)
+        # Evaluate the model, predicting once for the report and the bootstrap
+        y_pred = pipeline.predict(X_test)
+        report_df = evaluate_model(pipeline, X_test, y_test, y_pred)
         
         # Save the classification report
         save_classification_report(report_df, results_to)
         
         click.echo(f"Classification report saved in {results_to}")
+
+        # Confidence intervals of the metrics of the positive class, next to the report
+        if bootstrap:
+            ci_df = bootstrap_confidence_intervals(y_test, y_pred, bootstrap, confidence, n_jobs=n_jobs, random_state=seed)
+            ci_df.to_csv(os.path.join(results_to, "bootstrap_ci.csv"))
+            click.echo(f"{confidence:.0%} bootstrap confidence intervals ({bootstrap} resamples) saved in {results_to}")
+            click.echo(ci_df.round(3).to_string())
+
+        # Threshold sweep from one predict_proba call and one sort of the scores
+        if thresholds:
+            summary = analyze_thresholds(pipeline, X_test, y_test, results_to, sensitivity, max_points)
+            click.echo(f"Threshold analysis saved in {results_to}")
+            click.echo(summary.round(3).to_string())
     except Exception as e:
         raise Exception(f"An error occurred in the main function: {e}")
 
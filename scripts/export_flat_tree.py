@@ -0,0 +1,25 @@
+# export_flat_tree.py
+# date: 2026-10-18
+
+import click
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.load_pipeline import load_pipeline
+from src.flat_tree import flatten_tree
+
+@click.command()
+@click.option('--pipeline-from', type=str, default="results/models/decision_tree.pkl", help="Path to the fitted decision tree pipeline (Pickle file)")
+@click.option('--tree-to', type=str, default="results/models/decision_tree_flat", help="Directory of the flat node arrays (.npy files)")
+def main(pipeline_from, tree_to):
+    """Export the fitted decision tree as flat node arrays scored without scikit-learn."""
+    try:
+        tree = flatten_tree(load_pipeline(pipeline_from))
+        tree.save(tree_to)
+        click.echo(f"Flat tree with {len(tree.feature)} nodes saved in {tree_to}")
+    except Exception as e:
+        raise Exception(f"An error occurred in the main function: {e}")
+
+if __name__ == '__main__':
+    main()
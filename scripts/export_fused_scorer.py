@@ -0,0 +1,29 @@
+# export_fused_scorer.py
+# date: 2026-10-18
+
+import click
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.load_pipeline import load_pipeline
+from src.fused_logistic import compile_logistic_scorer
+from src.create_dir_if_not_exist import create_dir_if_not_exist
+
+@click.command()
+@click.option('--preprocessor-from', type=str, default="results/models/preprocessor.pickle", help="Path to the fitted preprocessor (Pickle file)")
+@click.option('--pipeline-from', type=str, default="results/models/logistic_regression.pkl", help="Path to the fitted logistic regression pipeline (Pickle file)")
+@click.option('--scorer-to', type=str, default="results/models/logistic_regression_scorer.npz", help="Path of the fused scorer artifact (.npz file)")
+def main(preprocessor_from, pipeline_from, scorer_to):
+    """Fold the preprocessor and logistic regression into one NumPy scorer saved as a .npz artifact."""
+    try:
+        scorer = compile_logistic_scorer(load_pipeline(preprocessor_from), load_pipeline(pipeline_from))
+        create_dir_if_not_exist(os.path.dirname(scorer_to) or ".")
+        scorer.save(scorer_to)
+        click.echo(f"Fused scorer with {len(scorer.numeric_features)} numeric and "
+                   f"{len(scorer.categorical_features)} categorical features saved in {scorer_to}")
+    except Exception as e:
+        raise Exception(f"An error occurred in the main function: {e}")
+
+if __name__ == '__main__':
+    main()
@@ -8,17 +8,41 @@ import os
 import pandas as pd
 import numpy as np
 from sklearn.tree import DecisionTreeClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import cross_validate, cross_val_predict
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.pipeline import make_pipeline
 from sklearn.metrics import ConfusionMatrixDisplay
-import matplotlib.pyplot as plt
 import pickle
+import json
+from scipy.stats import randint, loguniform
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.load_data import load_data
+from src.cross_validate_folds import cross_validate_models, SCORERS
+from src.hyperparameter_search import search_hyperparameters, FoldScoreCache, SEARCH_STRATEGIES
+
+MODEL_NAMES = ['decision_tree', 'logistic_regression']
+# Models that update_model.py can update with new batches (partial_fit); not part of 'all'
+INCREMENTAL_MODEL_NAMES = ['sgd_logistic_regression']
+
+# Hyperparameter distributions sampled by --search
+SEARCH_SPACES = {
+    'decision_tree': {
+        'decisiontreeclassifier__max_depth': randint(2, 16),
+        'decisiontreeclassifier__min_samples_leaf': randint(1, 20),
+        'decisiontreeclassifier__min_samples_split': randint(2, 20),
+        'decisiontreeclassifier__criterion': ['gini', 'entropy']
+    },
+    'logistic_regression': {
+        'logisticregression__C': loguniform(1e-3, 1e2),
+        'logisticregression__class_weight': [None, 'balanced']
+    },
+    'sgd_logistic_regression': {
+        # class_weight='balanced' is not supported by partial_fit, so it is not searched
+        'sgdclassifier__alpha': loguniform(1e-6, 1e-1)
+    }
+}
 
 def create_directories(base_dir, model_name):
     """Creates necessary directories for saving models and tables with error handling."""
@@ -31,34 +55,66 @@ def create_directories(base_dir, model_name):
         raise Exception(f"An error occurred while creating directories to save models and tables: {e}")
     return model_dir, tables_dir
 
-def train_and_evaluate_model(X_train, y_train, model_name, random_state):
-    """Trains a model using cross-validation and returns the trained pipeline and cross-validation results with error handling."""
+def build_pipeline(model_name, random_state):
+    """Returns the unfitted pipeline of a model name."""
+    if model_name == 'decision_tree':
+        estimator = DecisionTreeClassifier(random_state=random_state)
+    elif model_name == 'logistic_regression':
+        estimator = LogisticRegression(random_state=random_state, max_iter=1000)
+    elif model_name == 'sgd_logistic_regression':
+        # logistic regression fitted by stochastic gradient descent, which partial_fit continues
+        estimator = SGDClassifier(loss='log_loss', random_state=random_state)
+    else:
+        raise ValueError(f"Invalid model name. Choose one of {MODEL_NAMES + INCREMENTAL_MODEL_NAMES}.")
+    return make_pipeline(estimator)
+
+def search_model_params(X_train, y_train, model_name, random_state, strategy, n_candidates, scoring, cache_dir, n_jobs=1):
+    """
+    Searches the hyperparameters of a model over SEARCH_SPACES with error handling and returns the
+    best parameters and the search results. Fold scores are cached in cache_dir/<model_name>.jsonl.
+    """
     try:
-        if model_name == 'decision_tree':
-            estimator = DecisionTreeClassifier(random_state=random_state)
-        elif model_name == 'logistic_regression':
-            estimator = LogisticRegression(random_state=random_state, max_iter=1000)
-        else:
-            raise ValueError("Invalid model name. Choose 'decision_tree' or 'logistic_regression'.")
-        
-        pipeline = make_pipeline(estimator)
+        cache = FoldScoreCache(os.path.join(cache_dir, f"{model_name}.jsonl")) if cache_dir else None
+        best_params, search_results = search_hyperparameters(
+            build_pipeline(model_name, random_state), SEARCH_SPACES[model_name], X_train, y_train,
+            strategy=strategy, n_candidates=n_candidates, cv=5, scoring=scoring, n_jobs=n_jobs,
+            random_state=random_state, cache=cache
+        )
+    except Exception as e:
+        raise Exception(f"An error occurred while searching hyperparameters: {e}")
+    return best_params, search_results
+
+def train_and_evaluate_models(X_train, y_train, model_names, random_state, n_jobs=1, params=None):
+    """
+    Trains models using cross-validation and returns, per model name, the trained pipeline, the
+    cross-validation results and the fold results (out-of-fold predictions, fold estimators)
+    with error handling. All models share one set of folds, and every fold and final model is
+    fitted once, on up to n_jobs processes. params optionally maps model names to the
+    hyperparameters to set on their pipelines.
+    """
+    try:
+        params = params or {}
+        pipelines = {
+            model_name: build_pipeline(model_name, random_state).set_params(**params.get(model_name, {}))
+            for model_name in model_names
+        }
         
-        # Cross-validation
+        # Cross-validation, with the final models fitted on the full training data alongside the folds
         scoring = ['accuracy', 'precision', 'recall', 'f1']
-        cross_val_results = pd.DataFrame(
-            cross_validate(pipeline, X_train, y_train, scoring=scoring, cv=5, return_train_score=True)
-        ).agg(['mean', 'std']).round(3).T
-        
-        # Fit final model on the full training data
-        pipeline.fit(X_train, y_train)
+        cv_results = cross_validate_models(pipelines, X_train, y_train, cv=5, scoring=scoring, n_jobs=n_jobs)
     
     except Exception as e:
         raise Exception(f"An error occurred while training the model: {e}")
     
-    return pipeline, cross_val_results
+    return {
+        model_name: (cv_folds["estimator"], cv_folds["scores"].agg(['mean', 'std']).round(3).T, cv_folds)
+        for model_name, cv_folds in cv_results.items()
+    }
 
-def save_model_and_results(pipeline, cross_val_results, model_dir, tables_dir, model_name, X_train, y_train):
+def save_model_and_results(pipeline, cross_val_results, model_dir, tables_dir, model_name, X_train, y_train, y_pred):
     """Saves the trained model, cross-validation results, and generates confusion matrix and coefficient plots with error handling."""
+    # matplotlib is only needed for the plots, so it is not imported with the module
+    import matplotlib.pyplot as plt
     try:
         model_file = os.path.join(model_dir, f"{model_name}.pkl")
         pickle.dump(pipeline, open(model_file, 'wb'))
@@ -66,8 +122,7 @@ def save_model_and_results(pipeline, cross_val_results, model_dir, tables_dir, m
         # Save cross-validation results
         cross_val_results.to_csv(os.path.join(tables_dir, f"{model_name}_cv_results.csv"))
         
-        # Predict and display confusion matrix
-        y_pred = cross_val_predict(pipeline, X_train, y_train, cv=5)
+        # Display the confusion matrix of the out-of-fold predictions
         ConfusionMatrixDisplay.from_predictions(y_train, y_pred)
         plt.title(f"{model_name.capitalize()} Confusion Matrix")
         plt.savefig(os.path.join(tables_dir, f"{model_name}_confusion_matrix.png"))
@@ -94,28 +149,62 @@ def save_model_and_results(pipeline, cross_val_results, model_dir, tables_dir, m
     except Exception as e:
         raise Exception(f"An error occurred while saving model and results: {e}")
 
+def fit_and_save_models(X_train, y_train, model_names, output_dir, random_state, n_jobs=1, search='none',
+                        n_candidates=20, search_scoring='accuracy', cache_dir="results/cache/search"):
+    """
+    Optionally searches the hyperparameters, then trains and evaluates the models and saves the
+    models, search results and cross-validation results in output_dir. Returns the trained models
+    as returned by train_and_evaluate_models.
+    """
+    # Optionally tune the hyperparameters, writing the best ones next to the cv results
+    best_params = {}
+    if search != 'none':
+        for model_name in model_names:
+            best_params[model_name], search_results = search_model_params(
+                X_train, y_train, model_name, random_state, search, n_candidates, search_scoring, cache_dir, n_jobs
+            )
+            _, tables_dir = create_directories(output_dir, model_name)
+            search_results.to_csv(os.path.join(tables_dir, f"{model_name}_search_results.csv"), index=False)
+            with open(os.path.join(tables_dir, f"{model_name}_best_params.json"), 'w') as f:
+                json.dump({"strategy": search, "scoring": search_scoring, "params": best_params[model_name]}, f, indent=2)
+    
+    trained = train_and_evaluate_models(X_train, y_train, model_names, random_state, n_jobs, best_params)
+    
+    for model_name, (pipeline, cross_val_results, cv_folds) in trained.items():
+        # Create necessary directories
+        model_dir, tables_dir = create_directories(output_dir, model_name)
+        
+        # Save model and evaluation results
+        save_model_and_results(pipeline, cross_val_results, model_dir, tables_dir, model_name, X_train, y_train,
+                               cv_folds["oof_predictions"])
+    
+    return trained
+
 @click.command()
-@click.option('--x-train', type=str, help="Path to the preprocessed training features (CSV file)", required=True)
+@click.option('--x-train', type=str, help="Path to the preprocessed training features (CSV, .npy, .npz, .parquet or .feather file)", required=True)
 @click.option('--y-train', type=str, help="Path to the training target labels (CSV file)", required=True)
-@click.option('--model', type=click.Choice(['decision_tree', 'logistic_regression']), help="Model to use", required=True)
+@click.option('--model', 'models', type=click.Choice(MODEL_NAMES + INCREMENTAL_MODEL_NAMES + ['all']), multiple=True, required=True,
+              help="Model(s) to fit; repeat the option or pass 'all' to fit the decision tree and logistic regression on shared folds")
 @click.option('--output-dir', type=str, help="Base directory to save results and plots", required=True)
 @click.option('--random-state', type=int, default=123, help="Random seed for reproducibility")
-def main(x_train, y_train, model, output_dir, random_state):
-    """Train a model on separate features and labels and evaluate its performance with error handling."""
+@click.option('--n-jobs', type=int, default=1, help="Number of processes fitting the cross-validation folds (-1 for all CPUs)")
+@click.option('--search', type=click.Choice(['none'] + SEARCH_STRATEGIES), default='none',
+              help="Tune hyperparameters first with randomized search or successive halving")
+@click.option('--n-candidates', type=int, default=20, help="Number of hyperparameter sets sampled by --search")
+@click.option('--search-scoring', type=click.Choice(list(SCORERS)), default='accuracy', help="Metric --search maximizes")
+@click.option('--cache-dir', type=str, default="results/cache/search", help="Directory caching the (parameters, fold) scores of --search ('' disables it)")
+def main(x_train, y_train, models, output_dir, random_state, n_jobs, search, n_candidates, search_scoring, cache_dir):
+    """Train one or more models on separate features and labels and evaluate their performance with error handling."""
     try:
         np.random.seed(random_state)
         
         # Load training data
         X_train, y_train = load_data(x_train, y_train)
         
-        # Create necessary directories
-        model_dir, tables_dir = create_directories(output_dir, model)
-        
-        # Train and evaluate the model
-        pipeline, cross_val_results = train_and_evaluate_model(X_train, y_train, model, random_state)
-        
-        # Save model and evaluation results
-        save_model_and_results(pipeline, cross_val_results, model_dir, tables_dir, model, X_train, y_train)
+        # Train and evaluate the models
+        model_names = MODEL_NAMES if 'all' in models else list(dict.fromkeys(models))
+        fit_and_save_models(X_train, y_train, model_names, output_dir, random_state, n_jobs,
+                            search, n_candidates, search_scoring, cache_dir)
         
         click.echo(f"Model training and evaluation completed. Results saved in {output_dir}")
     except Exception as e:
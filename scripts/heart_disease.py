@@ -0,0 +1,59 @@
+# heart_disease.py
+# date: 2026-10-18
+#
+# Single entry point to the pipeline scripts:
+# python scripts/heart_disease.py <clean|validate|split|fit|evaluate|predict|update> [OPTIONS]
+
+import click
+import importlib
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Subcommand name to (module, command, short help). The module of a subcommand is only
+# imported when that subcommand runs, so no subcommand pays for the imports of the others.
+SUBCOMMANDS = {
+    "clean": ("clean_data", "main", "Clean the raw data and validate the result."),
+    "validate": ("heart_disease", "validate", "Validate a cleaned data file."),
+    "split": ("split_n_preprocess", "main", "Split the cleaned data and fit the preprocessor."),
+    "fit": ("fit_model", "main", "Fit and cross-validate the models."),
+    "evaluate": ("evaluate_model", "main", "Score a fitted model on the test data."),
+    "predict": ("predict", "main", "Score new records with a fitted model."),
+    "update": ("update_model", "main", "Update a model with new labeled records.")
+}
+
+class LazyGroup(click.Group):
+    """Click group that imports the module of a subcommand only when it is invoked."""
+
+    def list_commands(self, ctx):
+        return list(SUBCOMMANDS)
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in SUBCOMMANDS:
+            return None
+        module_name, command_name, _ = SUBCOMMANDS[cmd_name]
+        module = sys.modules[__name__] if module_name == "heart_disease" else importlib.import_module(module_name)
+        return getattr(module, command_name)
+
+    def format_commands(self, ctx, formatter):
+        # list the short help without importing every subcommand
+        with formatter.section("Commands"):
+            formatter.write_dl([(name, short_help) for name, (_, _, short_help) in SUBCOMMANDS.items()])
+
+@click.command()
+@click.option('--data', type=str, help="Path to the cleaned CSV file, Parquet file or directory of Parquet partitions", required=True)
+@click.option('--correlation-engine', type=click.Choice(['native', 'deepchecks']), default='native', help="Engine used for the correlation checks (deepchecks is slower)")
+@click.option('--correlation-samples', type=int, default=None, help="Stratified sample size for the correlation checks (default: all rows)")
+def validate(data, correlation_engine, correlation_samples):
+    """Validate a cleaned data file against the cleaned-data schema and correlation checks."""
+    from src.validate_data import validate_csv_schema
+
+    validate_csv_schema(data, correlation_engine, correlation_samples)
+
+@click.group(cls=LazyGroup)
+def main():
+    """Heart disease predictor pipeline."""
+
+if __name__ == '__main__':
+    main()
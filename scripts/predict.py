@@ -0,0 +1,74 @@
+# predict.py
+# date: 2026-10-18
+
+import click
+import os
+import time
+import sys
+import pandas as pd
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.load_pipeline import load_pipeline
+from src.read_batches import read_batches
+from src.score_batch import score_batch, PREDICTION_COLUMNS
+from src.validate_data import compact_dtypes
+from src.create_dir_if_not_exist import create_dir_if_not_exist
+
+def predict(input_path, preprocessor_path, pipeline_path, output_path, batch_size):
+    """
+    Scores a dataset batch by batch and appends the predictions to a CSV file.
+
+    The preprocessor and model are loaded once, then the input is streamed so only
+    one batch of records is held in memory at a time. An input without records gets
+    a predictions file with the headers only.
+
+    Parameters:
+    input_path (str): CSV file, Parquet file or directory of Parquet partitions in the cleaned-data schema.
+    preprocessor_path (str): Path to the fitted preprocessor (Pickle file).
+    pipeline_path (str): Path to the fitted model pipeline (Pickle file).
+    output_path (str): Path of the predictions CSV file.
+    batch_size (int): Number of records scored per batch.
+
+    Returns:
+    tuple: Number of records scored and the elapsed time in seconds.
+    """
+    preprocessor = load_pipeline(preprocessor_path)
+    pipeline = load_pipeline(pipeline_path)
+    feature_names = preprocessor.get_feature_names_out()
+
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        create_dir_if_not_exist(output_dir)
+
+    n_rows = 0
+    start = time.perf_counter()
+    # new records are not validated, so only the text columns are read as categoricals
+    dtype = compact_dtypes(trusted=False)
+    for batch in read_batches(input_path, batch_size, dtype):
+        if batch.empty:
+            continue
+        predictions = score_batch(preprocessor, pipeline, batch, feature_names)
+        predictions.to_csv(output_path, mode="a" if n_rows else "w", header=not n_rows, index=False)
+        n_rows += len(batch)
+    if n_rows == 0:
+        pd.DataFrame(columns=PREDICTION_COLUMNS).to_csv(output_path, index=False)
+
+    return n_rows, time.perf_counter() - start
+
+@click.command()
+@click.option('--input', 'input_path', type=str, help="Path to records in the cleaned-data schema (CSV, Parquet file or Parquet directory)", required=True)
+@click.option('--preprocessor-from', type=str, default="results/models/preprocessor.pickle", help="Path to the fitted preprocessor (Pickle file)")
+@click.option('--pipeline-from', type=str, help="Path to the saved pipeline object (Pickle file)", required=True)
+@click.option('--predictions-to', type=str, help="Path of the CSV file predictions are written to", required=True)
+@click.option('--batch-size', type=int, default=100_000, help="Number of records scored per batch")
+def main(input_path, preprocessor_from, pipeline_from, predictions_to, batch_size):
+    """Score new records in batches and write their predicted probability and class."""
+    try:
+        n_rows, elapsed = predict(input_path, preprocessor_from, pipeline_from, predictions_to, batch_size)
+        click.echo(f"Scored {n_rows} records in {elapsed:.2f}s ({n_rows / max(elapsed, 1e-9):,.0f} rows/sec). "
+                   f"Predictions saved in {predictions_to}")
+    except Exception as e:
+        raise Exception(f"An error occurred in the main function: {e}")
+
+if __name__ == '__main__':
+    main()
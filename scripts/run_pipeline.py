@@ -0,0 +1,146 @@
+# run_pipeline.py
+# date: 2026-10-18
+
+import click
+import os
+import sys
+import time
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from src.async_writer import AsyncWriter
+from src.create_dir_if_not_exist import create_dir_if_not_exist
+from src.save_classification_report import save_classification_report
+from src.save_data import STORAGE_FORMATS
+from src.fused_logistic import compile_logistic_scorer
+from src.flat_tree import flatten_tree
+from src.fetch_file import fetch_file
+from src.hyperparameter_search import SEARCH_STRATEGIES
+from src.validate_data import validate_dataframe
+from clean_data import clean_chunk
+from split_n_preprocess import split_and_preprocess, save_split, SPLIT_METHODS
+from eda import create_eda_plots
+from fit_model import fit_and_save_models, MODEL_NAMES
+from evaluate_model import evaluate_model, analyze_thresholds
+
+DATA_URL = "https://archive.ics.uci.edu/static/public/45/data.csv"
+
+@contextmanager
+def timed(timings, name):
+    """Records the wall time of the block under name."""
+    start = time.perf_counter()
+    yield
+    timings[name] = time.perf_counter() - start
+
+def numeric_categories(data):
+    """
+    Returns the data with its categorical columns of numeric labels (e.g. diagnosis) cast back to
+    numbers, as they read back from the persisted CSV files that make validates and draws the
+    EDA plots from.
+    """
+    def cast(col):
+        if isinstance(col.dtype, pd.CategoricalDtype) and pd.api.types.is_numeric_dtype(col.cat.categories):
+            return col.astype(col.cat.categories.dtype)
+        return col
+    return data.apply(cast) if isinstance(data, pd.DataFrame) else cast(data)
+
+def run_pipeline(url, data_dir="data", results_dir="results", pre_seed=42, fit_seed=123, n_jobs=1, search="none",
+                 storage="csv", correlation_engine="native", writer=None, sha256=None, mirror_dir=None,
+                 split_method="random"):
+    """
+    Runs every stage of the Makefile pipeline in one process, handing DataFrames and fitted
+    objects from stage to stage in memory, and returns the wall time of each stage.
+
+    The artifacts are written to the same paths as by make, on the writer's background
+    threads, so the next stage starts without waiting for (or re-reading) them. Plots are
+    drawn on the calling thread because pyplot is not thread-safe.
+    """
+    timings = {}
+    writer = writer if writer is not None else AsyncWriter()
+    raw_dir = os.path.join(data_dir, "raw")
+    cleaned_dir = os.path.join(data_dir, "cleaned")
+    processed_dir = os.path.join(data_dir, "processed")
+    model_dir = os.path.join(results_dir, "models")
+    for directory in (raw_dir, cleaned_dir, processed_dir, model_dir):
+        create_dir_if_not_exist(directory)
+
+    with timed(timings, "download"):
+        raw_path = os.path.join(raw_dir, "raw_heart_disease_data.csv")
+        fetch_file(url, raw_path, sha256=sha256, mirror_dir=mirror_dir)
+        raw = pd.read_csv(raw_path)
+
+    with timed(timings, "clean"):
+        cleaned = clean_chunk(raw).reset_index(drop=True)
+        writer.submit("cleaned data", cleaned.to_csv, os.path.join(cleaned_dir, "cleaned_heart_disease_data.csv"), index=False)
+
+    with timed(timings, "validate"):
+        # with the dtypes the cleaned CSV file reads back with, which make validates, so the
+        # correlation checks pick the same association measures
+        validate_dataframe(numeric_categories(cleaned), correlation_engine)
+
+    with timed(timings, "split"):
+        np.random.seed(pre_seed)
+        split = split_and_preprocess(cleaned, pre_seed, split_method, sparse=storage == "npz")
+        writer.submit("split data", save_split, split, processed_dir, model_dir, storage)
+
+    with timed(timings, "eda"):
+        create_eda_plots(numeric_categories(split["X_train"]), numeric_categories(split["y_train"]),
+                         os.path.join(results_dir, "eda_plot"))
+
+    with timed(timings, "fit"):
+        np.random.seed(fit_seed)
+        trained = fit_and_save_models(split["X_train_enc"], split["y_train"].reset_index(drop=True), MODEL_NAMES,
+                                      results_dir, fit_seed, n_jobs, search)
+
+    with timed(timings, "export"):
+        scorer = compile_logistic_scorer(split["preprocessor"], trained["logistic_regression"][0])
+        writer.submit("fused scorer", scorer.save, os.path.join(model_dir, "logistic_regression_scorer.npz"))
+        tree = flatten_tree(trained["decision_tree"][0])
+        writer.submit("flat tree", tree.save, os.path.join(model_dir, "decision_tree_flat"))
+
+    with timed(timings, "evaluate"):
+        y_test = split["y_test"].reset_index(drop=True)
+        for model_name, (pipeline, _, _) in trained.items():
+            report_df = evaluate_model(pipeline, split["X_test_enc"], y_test)
+            writer.submit(f"{model_name} classification report", save_classification_report, report_df,
+                          os.path.join(results_dir, "tables", model_name))
+            analyze_thresholds(pipeline, split["X_test_enc"], y_test, os.path.join(results_dir, "tables", model_name))
+
+    with timed(timings, "write (remaining)"):
+        writer.wait()
+
+    return timings
+
+@click.command()
+@click.option('--url', type=str, default=DATA_URL, help="URL or path of the raw CSV dataset")
+@click.option('--data-dir', type=str, default="data", help="Base directory of the raw, cleaned and processed data")
+@click.option('--results-dir', type=str, default="results", help="Base directory of the models, tables and plots")
+@click.option('--pre-seed', type=int, default=42, help="Random seed of the train/test split")
+@click.option('--split-method', type=click.Choice(SPLIT_METHODS), default="random", help="'random' or stable 'hash' train/test split")
+@click.option('--fit-seed', type=int, default=123, help="Random seed of the model fits")
+@click.option('--n-jobs', type=int, default=1, help="Number of processes fitting the cross-validation folds (-1 for all CPUs)")
+@click.option('--search', type=click.Choice(['none'] + SEARCH_STRATEGIES), default='none', help="Tune hyperparameters before fitting")
+@click.option('--storage', type=click.Choice(STORAGE_FORMATS), default="csv", help="Storage format of the transformed feature matrices")
+@click.option('--correlation-engine', type=click.Choice(['native', 'deepchecks']), default='native', help="Engine used for the correlation checks")
+@click.option('--sha256', type=str, default=None, help="Expected SHA-256 of the raw dataset")
+@click.option('--mirror-dir', type=str, default=".data_mirror", help="Directory of local copies of the download ('' disables it)")
+@click.option('--writers', type=int, default=2, help="Number of background threads writing artifacts")
+def main(url, data_dir, results_dir, pre_seed, split_method, fit_seed, n_jobs, search, storage, correlation_engine, sha256, mirror_dir, writers):
+    """Run the whole analysis (everything make all builds but the report) in one process and print the time of each stage."""
+    try:
+        start = time.perf_counter()
+        with AsyncWriter(writers) as writer:
+            timings = run_pipeline(url, data_dir, results_dir, pre_seed, fit_seed, n_jobs, search, storage,
+                                   correlation_engine, writer, sha256 or None, mirror_dir or None, split_method)
+        for name, seconds in timings.items():
+            click.echo(f"{name:<20}{seconds:>8.2f}s")
+        click.echo(f"{'total':<20}{time.perf_counter() - start:>8.2f}s "
+                   f"({writer.write_time:.2f}s of writes in the background)")
+    except Exception as e:
+        raise Exception(f"An error occurred in the main function: {e}")
+
+if __name__ == '__main__':
+    main()
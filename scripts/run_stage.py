@@ -0,0 +1,43 @@
+# run_stage.py
+# date: 2026-10-18
+#
+# Runs one pipeline stage through the content-addressed stage cache, e.g.
+# python scripts/run_stage.py --name=clean --input=data/raw/raw_heart_disease_data.csv \
+#     --output=data/cleaned/cleaned_heart_disease_data.csv -- python scripts/clean_data.py ...
+
+import click
+import os
+import subprocess
+import time
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.stage_cache import EXECUTION_OPTIONS, StageCache, command_params, run_stage, source_files
+
+@click.command(context_settings={"ignore_unknown_options": True})
+@click.option('--name', type=str, help="Name of the stage", required=True)
+@click.option('--input', 'inputs', type=str, multiple=True, help="Input file of the stage (repeatable)")
+@click.option('--output', 'outputs', type=str, multiple=True, required=True,
+              help="Output file, directory or glob pattern of the stage (repeatable)")
+@click.option('--store', type=str, default=".stage_cache", help="Directory of the artifact store")
+@click.option('--ignore-option', 'ignore', type=str, multiple=True,
+              help=f"Option of COMMAND that does not change its outputs (repeatable; always includes {', '.join(EXECUTION_OPTIONS)})")
+@click.argument('command', nargs=-1, type=click.UNPROCESSED, required=True)
+def main(name, inputs, outputs, store, ignore, command):
+    """Run COMMAND, or restore its outputs if it already ran with the same inputs, output-affecting arguments and code."""
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    sources = sorted({path for arg in command if arg.endswith(".py") and os.path.isfile(arg)
+                      for path in source_files(arg, root)})
+
+    def run():
+        result = subprocess.run(list(command))
+        if result.returncode != 0:
+            raise SystemExit(result.returncode)
+
+    start = time.perf_counter()
+    restored = run_stage(name, run, inputs=inputs, outputs=outputs, params=command_params(command, EXECUTION_OPTIONS + ignore), sources=sources,
+                         cache=StageCache(store))
+    click.echo(f"[{name}] {'restored from cache' if restored else 'ran'} in {time.perf_counter() - start:.2f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+# serve.py
+# date: 2026-10-18
+
+import asyncio
+import click
+import json
+import os
+import time
+import pandas as pd
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.load_pipeline import load_pipeline
+from src.score_batch import score_batch
+from src.micro_batcher import MicroBatcher, LatencyTracker
+from src.validate_data import check_record_schema
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+def load_scorers(models_dir, model_names):
+    """
+    Loads the preprocessor and each model once and returns one scoring function per model.
+
+    Parameters:
+    models_dir (str): Directory holding preprocessor.pickle and the <model>.pkl files.
+    model_names (list): Names of the models to serve.
+
+    Returns:
+    dict: Model name to a function scoring a DataFrame of cleaned-schema records.
+    """
+    preprocessor = load_pipeline(os.path.join(models_dir, "preprocessor.pickle"))
+    feature_names = preprocessor.get_feature_names_out()
+    scorers = {}
+    for name in model_names:
+        pipeline = load_pipeline(os.path.join(models_dir, f"{name}.pkl"))
+        scorers[name] = lambda records, pipeline=pipeline: score_batch(preprocessor, pipeline, records, feature_names)
+    return scorers
+
+class ScoringServer:
+    """
+    Minimal HTTP/1.1 JSON scoring server built on asyncio streams.
+
+    Endpoints:
+    POST /predict/<model>  body: one record or a list of records in the cleaned-data schema.
+                           Returns the probability of heart disease and the predicted class.
+    GET  /metrics          Returns p50/p99 latency and throughput counters per model.
+    GET  /health           Returns the served models.
+    """
+
+    def __init__(self, scorers, max_batch_size=256, max_wait=0.002):
+        self.trackers = {name: LatencyTracker() for name in scorers}
+        self.batchers = {
+            name: MicroBatcher(score_fn, max_batch_size, max_wait, self.trackers[name])
+            for name, score_fn in scorers.items()
+        }
+
+    async def predict(self, model, body):
+        start = time.perf_counter()
+        payload = json.loads(body)
+        records = pd.DataFrame(payload if isinstance(payload, list) else [payload])
+        # reject a malformed request alone, before it joins a batch with other requests
+        check_record_schema(records)
+        results = await self.batchers[model].submit(records)
+        self.trackers[model].record(time.perf_counter() - start, len(records))
+        return {"model": model, "predictions": results.to_dict(orient="records")}
+
+    async def route(self, method, path, body):
+        """Returns the status code and JSON response of one request."""
+        if path == "/health":
+            return 200, {"status": "ok", "models": list(self.batchers)}
+        if path == "/metrics":
+            return 200, {name: tracker.summary() for name, tracker in self.trackers.items()}
+        if path.startswith("/predict/"):
+            model = path[len("/predict/"):]
+            if model not in self.batchers:
+                return 404, {"error": f"Unknown model '{model}'. Choose one of {list(self.batchers)}."}
+            if method != "POST":
+                return 405, {"error": "Use POST to score records."}
+            try:
+                return 200, await self.predict(model, body)
+            except (ValueError, KeyError, TypeError) as e:
+                return 400, {"error": f"Invalid records: {e}"}
+        return 404, {"error": f"Unknown path '{path}'."}
+
+    async def handle_connection(self, reader, writer):
+        """Serves requests on one (keep-alive) connection until the client closes it."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                try:
+                    status, response = await self.route(method, path, body)
+                except Exception as e:
+                    status, response = 500, {"error": str(e)}
+
+                content = json.dumps(response).encode()
+                keep_alive = headers.get("connection", "keep-alive").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(content)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + content
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host, port):
+        """Starts listening and returns the asyncio server."""
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def stop(self):
+        for batcher in self.batchers.values():
+            await batcher.stop()
+
+async def serve(scorers, host, port, max_batch_size, max_wait):
+    server = ScoringServer(scorers, max_batch_size, max_wait)
+    async with await server.start(host, port) as listener:
+        click.echo(f"Serving {list(scorers)} on http://{host}:{port}")
+        await listener.serve_forever()
+
+@click.command()
+@click.option('--models-dir', type=str, default="results/models", help="Directory with preprocessor.pickle and the model .pkl files")
+@click.option('--model', 'models', type=click.Choice(['decision_tree', 'logistic_regression']), multiple=True,
+              default=['decision_tree', 'logistic_regression'], help="Model(s) to serve")
+@click.option('--host', type=str, default="127.0.0.1", help="Host to listen on")
+@click.option('--port', type=int, default=8000, help="Port to listen on")
+@click.option('--max-batch-size', type=int, default=256, help="Maximum number of records scored per micro-batch")
+@click.option('--max-wait-ms', type=float, default=2.0, help="Maximum time a request waits for a micro-batch to fill, in milliseconds")
+def main(models_dir, models, host, port, max_batch_size, max_wait_ms):
+    """Serve the fitted models over HTTP, grouping concurrent requests into micro-batches."""
+    scorers = load_scorers(models_dir, models)
+    try:
+        asyncio.run(serve(scorers, host, port, max_batch_size, max_wait_ms / 1000))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
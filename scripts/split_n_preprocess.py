@@ -8,69 +8,269 @@ import os
 import click
 import sys
 
-sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
-from create_dir_if_not_exist import create_dir_if_not_exist
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.create_dir_if_not_exist import create_dir_if_not_exist
+from src.save_data import save_data, STORAGE_FORMATS, TableWriter
+from src.load_data import read_table
+from src.read_batches import read_batches
+from src.incremental_preprocessor import IncrementalColumnTransformer
+from src.hash_split import hash_split
+from src.feature_frame import feature_frame, is_sparse_frame
+from src.validate_data import compact_dtypes
+
+NUMERIC_FEATURES = [
+    "age", 
+    "resting_blood_pressure", 
+    "fasting_blood_sugar", 
+    "cholesterol", 
+    "max_heart_rate", 
+    "st_depression", 
+    "sex"
+]
+CATEGORICAL_FEATURES = [
+    "chest_pain_type", 
+    "rest_ecg", 
+    "exercise_induced_angina", 
+    "slope", 
+    "num_of_vessels", 
+    "thalassemia"
+]
+# 'random' is sklearn's shuffled stratified split; 'hash' assigns every record from a hash
+# of its key and the seed, so appending rows never moves existing ones (see src/hash_split.py)
+SPLIT_METHODS = ["random", "hash"]
+TEST_SIZE = 0.3
+
+def make_preprocessor(sparse=False):
+    """
+    Returns the unfitted preprocessor: scaled numeric features and one-hot encoded categorical features.
+
+    With sparse=True it always outputs a CSR matrix (only the non-zero values) instead of
+    a dense array whenever the one-hot features are mostly zero.
+    """
+    numeric_transformer = StandardScaler()
+    categorical_transformer = OneHotEncoder(drop="if_binary", handle_unknown="ignore")
+
+    return make_column_transformer(
+        (numeric_transformer, NUMERIC_FEATURES),
+        (categorical_transformer, CATEGORICAL_FEATURES),
+        sparse_threshold=1.0 if sparse else 0.3
+    )
+
+def split_and_preprocess(df, seed, split_method="random", split_key=None, sparse=False):
+    """
+    Splits the cleaned data into stratified train and test sets and fits the
+    preprocessor on the training set.
+
+    Parameters:
+    df (DataFrame): The cleaned data, including the 'diagnosis' target.
+    seed (int): Random seed of the split.
+    split_method (str): 'random' (shuffled train_test_split) or 'hash' (hash_split, the
+                        rows keep their order).
+    split_key (list of str): Columns identifying a record in 'hash' splits; every column by default.
+    sparse (bool): Keep the transformed features sparse (frames of sparse columns, see
+                   src/feature_frame.py) instead of densifying them.
+
+    Returns:
+    dict: 'X_train', 'X_test', 'y_train', 'y_test', the transformed 'X_train_enc'
+          and 'X_test_enc', and the fitted 'preprocessor'.
+    """
+    X = df.drop(columns=["diagnosis"])
+    y = df["diagnosis"]
+
+    if split_method not in SPLIT_METHODS:
+        raise ValueError(f"Invalid split method. Choose one of {SPLIT_METHODS}.")
+    if split_method == "hash":
+        in_test = hash_split(df, seed, TEST_SIZE, split_key, stratify="diagnosis")
+        X_train, X_test, y_train, y_test = X[~in_test], X[in_test], y[~in_test], y[in_test]
+    else:
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=TEST_SIZE, random_state=seed, stratify=y)
+
+    preprocessor = make_preprocessor(sparse)
+
+    X_train_enc = feature_frame(preprocessor.fit_transform(X_train), preprocessor.get_feature_names_out())
+    X_test_enc = feature_frame(preprocessor.transform(X_test), preprocessor.get_feature_names_out())
+
+    return {
+        "X_train": X_train,
+        "X_test": X_test,
+        "y_train": y_train,
+        "y_test": y_test,
+        "X_train_enc": X_train_enc,
+        "X_test_enc": X_test_enc,
+        "preprocessor": preprocessor
+    }
+
+def save_split(split, data_to, preprocessor_to, storage="csv"):
+    """Writes the preprocessor, the transformed feature matrices and the train and test sets returned by split_and_preprocess."""
+    create_dir_if_not_exist(preprocessor_to)
+    pickle.dump(split["preprocessor"], open(os.path.join(preprocessor_to, "preprocessor.pickle"), "wb"))
+    create_dir_if_not_exist(data_to)
+    save_data(split["X_train_enc"], data_to, "X_train_transformed", storage)
+    save_data(split["X_test_enc"], data_to, "X_test_transformed", storage)
+    split["y_train"].to_csv(os.path.join(data_to, "y_train.csv"), index=False)
+    split["y_test"].to_csv(os.path.join(data_to, "y_test.csv"), index=False)
+    split["X_train"].to_csv(os.path.join(data_to, "X_train.csv"), index=False)
+    split["X_test"].to_csv(os.path.join(data_to, "X_test.csv"), index=False)
+
+def split_and_preprocess_chunked(raw_data, data_to, preprocessor_to, seed, chunksize, storage="csv",
+                                 split_method="random", split_key=None):
+    """
+    Does what split_and_preprocess and save_split do, reading the cleaned data chunksize
+    rows at a time, for data that does not fit in memory.
+
+    With the 'random' split method only the 'diagnosis' column is read in full, to draw
+    the same stratified split as split_and_preprocess; 'hash' splits each chunk on its
+    own. A first pass writes the train and test sets chunk by chunk while
+    the preprocessor is fitted incrementally (scaler partial fits and one-hot category
+    counts, see src/incremental_preprocessor.py); a second pass transforms the data and
+    writes the feature matrices chunk by chunk. The fitted preprocessor is equivalent to
+    the one split_and_preprocess fits. The train and test rows keep their order in the
+    cleaned data, also for 'random' splits, which split_and_preprocess shuffles.
+
+    Parameters:
+    raw_data (str): Path to the cleaned data (CSV, Parquet file or directory of Parquet partitions).
+    data_to (str): Directory the train and test sets and feature matrices are written to.
+    preprocessor_to (str): Directory preprocessor.pickle is written to.
+    seed (int): Random seed of the split.
+    chunksize (int): Rows read at a time.
+    storage (str): Storage format of the transformed feature matrices; 'npz' keeps them sparse.
+    split_method (str): 'random' or 'hash', as in split_and_preprocess.
+    split_key (list of str): Columns identifying a record in 'hash' splits.
+    """
+    if split_method not in SPLIT_METHODS:
+        raise ValueError(f"Invalid split method. Choose one of {SPLIT_METHODS}.")
+    if split_method == "random":
+        y = pd.concat(batch["diagnosis"] for batch in read_batches(raw_data, chunksize, compact_dtypes())).reset_index(drop=True)
+        train_rows, _ = train_test_split(np.arange(len(y)), test_size=TEST_SIZE, random_state=seed, stratify=y)
+        in_train = np.zeros(len(y), dtype=bool)
+        in_train[train_rows] = True
+
+    fitter = IncrementalColumnTransformer(make_preprocessor(sparse=storage == "npz"))
+    with TableWriter(data_to, "X_train") as X_train, TableWriter(data_to, "X_test") as X_test, \
+            TableWriter(data_to, "y_train") as y_train, TableWriter(data_to, "y_test") as y_test:
+        start = 0
+        for chunk in read_batches(raw_data, chunksize, compact_dtypes()):
+            if split_method == "hash":
+                mask = ~hash_split(chunk, seed, TEST_SIZE, split_key, stratify="diagnosis")
+            else:
+                mask = in_train[start:start + len(chunk)]
+            start += len(chunk)
+            X, target = chunk.drop(columns=["diagnosis"]), chunk["diagnosis"]
+            fitter.partial_fit(X[mask])
+            X_train.write(X[mask])
+            X_test.write(X[~mask])
+            y_train.write(target[mask])
+            y_test.write(target[~mask])
+    preprocessor = fitter.finalize()
+
+    create_dir_if_not_exist(preprocessor_to)
+    pickle.dump(preprocessor, open(os.path.join(preprocessor_to, "preprocessor.pickle"), "wb"))
+
+    columns = preprocessor.get_feature_names_out()
+    for name, n_rows in [("X_train", X_train.rows_written), ("X_test", X_test.rows_written)]:
+        with TableWriter(data_to, f"{name}_transformed", storage, n_rows=n_rows) as writer:
+            for chunk in read_batches(os.path.join(data_to, f"{name}.csv"), chunksize, compact_dtypes()):
+                writer.write(feature_frame(preprocessor.transform(chunk), columns))
+
+def append_table(data, directory, name, storage="csv"):
+    """Adds rows to the end of a table written by save_data: in place for CSV, otherwise by rewriting it."""
+    path = os.path.join(directory, f"{name}.{storage}")
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} does not exist; split the data before appending to it.")
+    data = data.to_frame() if isinstance(data, pd.Series) else data
+    if storage == "csv":
+        data.to_csv(path, mode="a", header=False, index=False)
+        return
+    existing = read_table(path)
+    combined = pd.concat([existing, data], ignore_index=True)
+    # release the memory map of 'npy' files before they are overwritten
+    del existing
+    save_data(combined, directory, name, storage)
+
+def append_split(df, data_to, preprocessor_to, seed, storage="csv", split_key=None):
+    """
+    Splits records appended to the cleaned data with the 'hash' method and adds them to the
+    end of the train and test sets and feature matrices already in data_to.
+
+    Hash splits decide every record from its own key, so the earlier records keep their
+    sets without being read again. The new features are transformed with the fitted
+    preprocessor in preprocessor_to, which is left unchanged so the feature matrices stay
+    consistent with the models fitted on them; a full split refits it.
+
+    Parameters:
+    df (DataFrame): The appended records only, including the 'diagnosis' target.
+    data_to (str): Directory holding the train and test sets and feature matrices.
+    preprocessor_to (str): Directory holding preprocessor.pickle.
+    seed (int): Seed of the earlier 'hash' split.
+    storage (str): Storage format of the existing transformed feature matrices.
+    split_key (list of str): Columns identifying a record, as in the earlier split.
+    """
+    with open(os.path.join(preprocessor_to, "preprocessor.pickle"), "rb") as f:
+        preprocessor = pickle.load(f)
+    columns = preprocessor.get_feature_names_out()
+    in_test = hash_split(df, seed, TEST_SIZE, split_key, stratify="diagnosis")
+    X, y = df.drop(columns=["diagnosis"]), df["diagnosis"]
+    for name, rows in [("train", ~in_test), ("test", in_test)]:
+        if not rows.any():
+            continue
+        append_table(X[rows], data_to, f"X_{name}")
+        append_table(y[rows], data_to, f"y_{name}")
+        append_table(feature_frame(preprocessor.transform(X[rows]), columns), data_to, f"X_{name}_transformed", storage)
+
+def report_feature_sizes(data_to, storage, split=None):
+    """Prints the size on disk of the transformed feature matrices, and in memory when split holds them."""
+    for name in ["X_train", "X_test"]:
+        path = os.path.join(data_to, f"{name}_transformed.{storage}")
+        line = f"{name}_transformed.{storage}: {os.path.getsize(path) / 1e6:.3f} MB on disk"
+        if split is not None:
+            X = split[f"{name}_enc"]
+            layout = "sparse" if is_sparse_frame(X) else "dense"
+            line += f", {X.memory_usage(deep=True).sum() / 1e6:.3f} MB in memory ({layout}, {X.shape[0]} x {X.shape[1]})"
+        click.echo(line)
 
 @click.command()
 @click.option('--raw-data', type=str, help="Path to raw data")
 @click.option('--data-to', type=str, help="Path to directory where processed data will be written to")
 @click.option('--preprocessor-to', type=str, help="Path to directory where the preprocessor object will be written to")
 @click.option('--seed', type=int, help="Random seed", default=123)
+@click.option('--storage', type=click.Choice(STORAGE_FORMATS), default="csv", help="Storage format of the transformed feature matrices")
+@click.option('--chunksize', type=int, default=None, help="Read, fit and transform the data this many rows at a time instead of loading it")
+@click.option('--split-method', type=click.Choice(SPLIT_METHODS), default="random",
+              help="'random' shuffles; 'hash' assigns each record from a hash of its key, stable as rows are appended")
+@click.option('--split-key', type=str, multiple=True, help="Column identifying a record in hash splits (repeatable; default every column)")
+@click.option('--append', is_flag=True, default=False,
+              help="--raw-data holds only records appended since an earlier hash split: add them to its outputs without refitting the preprocessor")
 
-def main(raw_data, data_to, preprocessor_to, seed):
+def main(raw_data, data_to, preprocessor_to, seed, storage, chunksize, split_method, split_key, append):
     '''This script splits the raw data into train and test sets, 
     and then preprocesses the data for use in model training.
-    It also saves the preprocessor to be used in the model training script.'''
+    It also saves the preprocessor to be used in the model training script.
+    The transformed feature matrices are written in the chosen storage format
+    ('npy' is memory-mapped by load_data instead of parsed; 'npz' keeps the
+    one-hot features sparse from the preprocessor to the models).'''
     
     np.random.seed(seed)
-    
-    df = pd.read_csv(raw_data)
 
-    X = df.drop(columns=["diagnosis"])
-    y = df["diagnosis"]
-
-   
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=seed, stratify=y)
-
-    numeric_features = [
-        "age", 
-        "resting_blood_pressure", 
-        "fasting_blood_sugar", 
-        "cholesterol", 
-        "max_heart_rate", 
-        "st_depression", 
-        "sex"
-    ]
-    categorical_features = [
-        "chest_pain_type", 
-        "rest_ecg", 
-        "exercise_induced_angina", 
-        "slope", 
-        "num_of_vessels", 
-        "thalassemia"
-    ]
+    if append:
+        if split_method != "hash":
+            raise ValueError("--append requires --split-method=hash.")
+        append_split(pd.read_csv(raw_data, dtype=compact_dtypes()), data_to, preprocessor_to, seed, storage,
+                     list(split_key) or None)
+        report_feature_sizes(data_to, storage)
+        return
 
-    numeric_transformer = StandardScaler()
-    categorical_transformer = OneHotEncoder(drop="if_binary", handle_unknown="ignore")
+    if chunksize is not None:
+        split_and_preprocess_chunked(raw_data, data_to, preprocessor_to, seed, chunksize, storage,
+                                     split_method, list(split_key) or None)
+        report_feature_sizes(data_to, storage)
+        return
 
-    preprocessor = make_column_transformer(
-        (numeric_transformer, numeric_features),
-        (categorical_transformer, categorical_features)
-    )
+    df = pd.read_csv(raw_data, dtype=compact_dtypes())
 
-    X_train_enc = pd.DataFrame(preprocessor.fit_transform(X_train), columns=preprocessor.get_feature_names_out())
-    X_test_enc = pd.DataFrame(preprocessor.transform(X_test), columns=preprocessor.get_feature_names_out())
+    split = split_and_preprocess(df, seed, split_method, list(split_key) or None, sparse=storage == "npz")
+    save_split(split, data_to, preprocessor_to, storage)
+    report_feature_sizes(data_to, storage, split)
 
-    create_dir_if_not_exist(preprocessor_to)
-    pickle.dump(preprocessor, open(os.path.join(preprocessor_to, "preprocessor.pickle"), "wb"))
-    create_dir_if_not_exist(data_to)
-    X_train_enc.to_csv(os.path.join(data_to, "X_train_transformed.csv"), index=False)
-    X_test_enc.to_csv(os.path.join(data_to, "X_test_transformed.csv"), index=False)
-    y_train.to_csv(os.path.join(data_to, "y_train.csv"), index=False)
-    y_test.to_csv(os.path.join(data_to, "y_test.csv"), index=False)
-    X_train.to_csv(os.path.join(data_to, "X_train.csv"), index=False)
-    X_test.to_csv(os.path.join(data_to, "X_test.csv"), index=False)
-    
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,111 @@
+# update_model.py
+# date: 2026-10-18
+
+import click
+import copy
+import os
+import time
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.load_pipeline import load_pipeline
+from src.read_batches import read_batches
+from src.update_batch import update_batch
+from src.validate_data import compact_dtypes
+from src.model_versions import version_path, latest_version
+
+METRICS = ['accuracy', 'precision', 'recall', 'f1']
+
+def holdout_metrics(pipeline, X_test, y_test):
+    """Returns the accuracy, precision, recall and F1 score of a pipeline on the holdout data."""
+    from src.cross_validate_folds import SCORERS
+
+    y_pred = pipeline.predict(X_test)
+    return {name: SCORERS[name](y_test, y_pred) for name in METRICS}
+
+def update_model(data_path, preprocessor_path, pipeline_path, batch_size):
+    """
+    Updates a fitted model with new labeled records, batch by batch, without refitting it.
+
+    The records are streamed batch_size at a time, so only one batch is held in memory,
+    and every batch is passed once to the partial_fit of the model (see src/update_batch.py).
+    The cost of an update grows with the number of new records, not with the data the
+    model was fitted on before.
+
+    Parameters:
+    data_path (str): CSV file, Parquet file or directory of Parquet partitions of records in the
+                     cleaned-data schema, with their 'diagnosis' labels.
+    preprocessor_path (str): Path to the fitted preprocessor (Pickle file); it is not refitted.
+    pipeline_path (str): Path to the model version to update (Pickle file).
+    batch_size (int): Number of records per partial_fit call.
+
+    Returns:
+    tuple: The model before and after the update, the number of records and the elapsed time in seconds.
+    """
+    preprocessor = load_pipeline(preprocessor_path)
+    previous = load_pipeline(pipeline_path)
+    pipeline = copy.deepcopy(previous)
+    feature_names = preprocessor.get_feature_names_out()
+
+    n_rows = 0
+    start = time.perf_counter()
+    # new records are not validated, so only the text columns are read as categoricals
+    for batch in read_batches(data_path, batch_size, compact_dtypes(trusted=False)):
+        update_batch(preprocessor, pipeline, batch, feature_names)
+        n_rows += len(batch)
+    if n_rows == 0:
+        raise ValueError(f"No records in {data_path}.")
+
+    return previous, pipeline, n_rows, time.perf_counter() - start
+
+def compare_versions(previous, updated, X_test, y_test, previous_version, version):
+    """Returns the holdout metrics of the previous and the updated version and their change, one row per metric."""
+    import pandas as pd
+
+    comparison = pd.DataFrame({
+        f"v{previous_version}": holdout_metrics(previous, X_test, y_test),
+        f"v{version}": holdout_metrics(updated, X_test, y_test)
+    })
+    comparison["change"] = comparison[f"v{version}"] - comparison[f"v{previous_version}"]
+    comparison.index.name = "metric"
+    return comparison
+
+@click.command()
+@click.option('--data', type=str, help="Path to new labeled records in the cleaned-data schema (CSV, Parquet file or Parquet directory)", required=True)
+@click.option('--model', 'model_name', type=str, default="sgd_logistic_regression", help="Name of the model to update")
+@click.option('--model-dir', type=str, default="results/models", help="Directory holding the versions of the model")
+@click.option('--preprocessor-from', type=str, default="results/models/preprocessor.pickle", help="Path to the fitted preprocessor (Pickle file)")
+@click.option('--version', 'from_version', type=int, default=None, help="Version to update (default: the latest in --model-dir)")
+@click.option('--x-test', type=str, default="data/processed/X_test_transformed.csv", help="Path to the holdout features (CSV, .npy, .npz, .parquet or .feather file)")
+@click.option('--y-test', type=str, default="data/processed/y_test.csv", help="Path to the holdout target labels (CSV file)")
+@click.option('--results-to', type=str, default=None, help="Directory the holdout comparison is saved in (default: results/tables/<model>)")
+@click.option('--batch-size', type=int, default=100_000, help="Number of records per incremental update")
+def main(data, model_name, model_dir, preprocessor_from, from_version, x_test, y_test, results_to, batch_size):
+    """Update a model with new labeled records, save it as a new version and compare it with the previous version on the holdout data."""
+    try:
+        import pickle
+        from src.load_data import load_data
+
+        previous_version = latest_version(model_dir, model_name) if from_version is None else from_version
+        version = latest_version(model_dir, model_name) + 1
+        previous, updated, n_rows, elapsed = update_model(
+            data, preprocessor_from, version_path(model_dir, model_name, previous_version), batch_size
+        )
+
+        model_path = version_path(model_dir, model_name, version)
+        with open(model_path, 'wb') as f:
+            pickle.dump(updated, f)
+
+        X_test, y_test = load_data(x_test, y_test)
+        comparison = compare_versions(previous, updated, X_test, y_test, previous_version, version)
+        results_to = results_to or os.path.join("results", "tables", model_name)
+        os.makedirs(results_to, exist_ok=True)
+        comparison.to_csv(os.path.join(results_to, f"update_v{version}_holdout.csv"))
+
+        click.echo(f"Updated v{previous_version} with {n_rows} records in {elapsed:.2f}s. Saved v{version} in {model_path}")
+        click.echo(comparison.round(3).to_string())
+    except Exception as e:
+        raise Exception(f"An error occurred while updating the model: {e}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncWriter:
+    """
+    Persists artifacts on background threads while the caller keeps computing.
+
+    Every write is a callable submitted with its arguments; the caller must not mutate
+    the objects it handed over until wait() returns. Writes only release the GIL while
+    doing I/O, so they overlap with the next stage rather than with each other.
+
+    Parameters:
+    ----------
+    max_workers : int, optional
+        Number of writer threads. Defaults to 2.
+    """
+
+    def __init__(self, max_workers=2):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="artifact-writer")
+        self.pending = []
+        self.write_time = 0.0
+        self._lock = threading.Lock()
+
+    def _timed(self, fn, args, kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        with self._lock:
+            self.write_time += time.perf_counter() - start
+        return result
+
+    def submit(self, description, fn, *args, **kwargs):
+        """Schedules fn(*args, **kwargs); description names the artifact in error messages."""
+        self.pending.append((description, self.pool.submit(self._timed, fn, args, kwargs)))
+
+    def wait(self):
+        """
+        Blocks until every submitted write has finished.
+
+        Raises:
+        ------
+        Exception
+            If a write failed, naming the artifact; the remaining writes still complete.
+        """
+        pending, self.pending = self.pending, []
+        errors = []
+        for description, future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                errors.append(f"{description}: {e}")
+        if errors:
+            raise Exception(f"An error occurred while writing artifacts: {'; '.join(errors)}")
+
+    def close(self):
+        """Waits for the pending writes and stops the writer threads."""
+        try:
+            self.wait()
+        finally:
+            self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.pool.shutdown()
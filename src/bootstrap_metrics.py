@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+from src.cross_validate_folds import run_in_pool
+
+BOOTSTRAP_METRICS = ["accuracy", "precision", "recall", "f1"]
+
+# Elements of the index matrix of a chunk of resamples when no chunk_size is given (80 MB)
+CHUNK_ELEMENTS = 10_000_000
+
+# Outcome codes of a prediction: index into the (tn, fp, fn, tp) counts
+TN, FP, FN, TP = range(4)
+
+
+def outcome_codes(y_true, y_pred, positive=1):
+    """Returns the outcome code (TN, FP, FN or TP) of every prediction as an int8 array."""
+    actual = np.asarray(y_true) == positive
+    predicted = np.asarray(y_pred) == positive
+    return (2 * actual + predicted).astype(np.int8)
+
+
+def metrics_from_counts(counts):
+    """
+    Returns the accuracy, precision, recall and F1 score of the positive class from confusion counts.
+
+    Parameters:
+    ----------
+    counts : numpy.ndarray
+        (tn, fp, fn, tp) counts along the last axis, for any number of leading axes.
+
+    Returns:
+    -------
+    dict
+        Metric name to an array of the leading shape. Undefined ratios (no positive
+        predictions or labels) are 0, as in sklearn's classification_report.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    tn, fp, fn, tp = (counts[..., code] for code in (TN, FP, FN, TP))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+        recall = np.where(tp + fn > 0, tp / (tp + fn), 0.0)
+        f1 = np.where(2 * tp + fp + fn > 0, 2 * tp / (2 * tp + fp + fn), 0.0)
+    return {
+        "accuracy": (tp + tn) / counts.sum(axis=-1),
+        "precision": precision,
+        "recall": recall,
+        "f1": f1
+    }
+
+
+def _resample_counts(codes, n_resamples, seed):
+    """Draws n_resamples bootstrap resamples of the outcome codes as one index matrix and returns their counts."""
+    rng = np.random.default_rng(seed)
+    n = len(codes)
+    index = rng.integers(0, n, size=(n_resamples, n))
+    # offset the codes of every resample, so one bincount counts all of them
+    offsets = 4 * np.arange(n_resamples)[:, None]
+    return np.bincount((codes[index] + offsets).ravel(), minlength=4 * n_resamples).reshape(n_resamples, 4)
+
+
+def bootstrap_confidence_intervals(y_true, y_pred, n_resamples=2000, confidence=0.95, positive=1,
+                                   chunk_size=None, n_jobs=1, random_state=123):
+    """
+    Computes percentile bootstrap confidence intervals of the accuracy, precision, recall and
+    F1 score of the positive class from cached predictions.
+
+    The predictions are reduced to one outcome code per row, and each chunk of chunk_size
+    resamples is drawn as one (chunk_size, n) index matrix into the codes and counted with
+    a single bincount, so no metric is computed row by row or resample by resample in Python.
+    Chunks bound the memory of the index matrix and run on up to n_jobs processes. Every
+    chunk has its own random stream spawned from random_state, so the intervals do not
+    depend on n_jobs.
+
+    Parameters:
+    ----------
+    y_true : array-like
+        The true labels.
+    y_pred : array-like
+        The predicted labels, computed once.
+    n_resamples : int, optional
+        Number of bootstrap resamples. Defaults to 2000.
+    confidence : float, optional
+        Confidence level of the intervals. Defaults to 0.95.
+    positive : optional
+        The positive label. Defaults to 1.
+    chunk_size : int, optional
+        Resamples drawn at a time. Defaults to as many as fit CHUNK_ELEMENTS indices.
+    n_jobs : int, optional
+        Number of processes (-1 for all CPUs). Defaults to 1.
+    random_state : int, optional
+        Seed of the resamples. Defaults to 123.
+
+    Returns:
+    -------
+    pandas.DataFrame
+        One row per metric with its estimate on all rows and the lower and upper bounds.
+    """
+    if n_resamples < 1 or (chunk_size is not None and chunk_size < 1):
+        raise ValueError("n_resamples and chunk_size must be positive integers.")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1.")
+    codes = outcome_codes(y_true, y_pred, positive)
+    if len(codes) == 0:
+        raise ValueError("No predictions to resample.")
+    chunk_size = chunk_size or max(1, CHUNK_ELEMENTS // len(codes))
+
+    sizes = [min(chunk_size, n_resamples - start) for start in range(0, n_resamples, chunk_size)]
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+    counts = np.concatenate(run_in_pool(_resample_counts, [(codes, size, seed) for size, seed in zip(sizes, seeds)], n_jobs))
+
+    resampled = metrics_from_counts(counts)
+    estimate = metrics_from_counts(np.bincount(codes, minlength=4))
+    alpha = (1 - confidence) / 2
+    return pd.DataFrame(
+        [[float(estimate[name]), *np.quantile(resampled[name], [alpha, 1 - alpha])] for name in BOOTSTRAP_METRICS],
+        index=pd.Index(BOOTSTRAP_METRICS, name="metric"),
+        columns=["estimate", "lower", "upper"]
+    )
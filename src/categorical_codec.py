@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+# Raw UCI codes -> labels used throughout the cleaned dataset.
+# Columns whose raw values are already the desired labels (e.g. the 0/1 codes
+# of fasting_blood_sugar) map onto themselves so they survive the relabel.
+CATEGORY_CODECS = {
+    "chest_pain_type": {
+        1: "typical angina",
+        2: "atypical angina",
+        3: "non-anginal pain",
+        4: "asymptomatic",
+    },
+    "fasting_blood_sugar": {
+        "yes": 1,
+        "no": 0,
+        1: 1,
+        0: 0,
+    },
+    "rest_ecg": {
+        0: "normal",
+        1: "ST-T wave abnormality",
+        2: "left ventricular hypertrophy",
+    },
+    "exercise_induced_angina": {
+        0: "no",
+        1: "yes",
+    },
+    "slope": {
+        1: "upsloping",
+        2: "flat",
+        3: "downsloping",
+    },
+    "thalassemia": {
+        3.: "normal",
+        6.: "fixed defect",
+        7.: "reversable defect",
+    },
+    "diagnosis": {
+        0: 0,
+        1: 1,
+        2: 1,
+        3: 1,
+        4: 1,
+    },
+}
+
+
+def encode_column(series, codec):
+    """
+    Relabels a column with a codec in a single vectorized pass.
+
+    Each value is looked up once against the codec's raw codes and the result
+    is built directly as a pandas ``category`` column, so no intermediate
+    object column is materialized.
+
+    Parameters:
+    ----------
+    series : pandas.Series
+        The raw column to relabel.
+    codec : dict
+        Mapping of raw codes to labels. Several codes may share a label.
+
+    Returns:
+    -------
+    pandas.Series
+        The relabelled column with ``category`` dtype. Missing values stay missing.
+        Values not present in the codec keep their raw value, as extra categories,
+        so validation rejects them instead of their rows being dropped as missing.
+    """
+    categories = list(dict.fromkeys(codec.values()))
+
+    # Numeric columns are matched against the numeric codes only so the lookup
+    # stays on a float64 hash table instead of boxing every value.
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        pairs = [(raw, label) for raw, label in codec.items()
+                 if isinstance(raw, (int, float, np.number)) and not isinstance(raw, bool)]
+        raw_codes = pd.Index(np.array([raw for raw, _ in pairs], dtype=np.float64))
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    else:
+        pairs = list(codec.items())
+        raw_codes = pd.Index([raw for raw, _ in pairs], dtype=object)
+        values = series.to_numpy(dtype=object)
+
+    label_positions = np.array([categories.index(label) for _, label in pairs] + [-1], dtype=np.int8)
+    positions = raw_codes.get_indexer(values)
+    # get_indexer returns -1 for unmatched values, which picks the trailing -1
+    codes = label_positions[positions]
+
+    unknown = (positions == -1) & ~pd.isna(values)
+    if unknown.any():
+        raw_unknown = pd.Index(values[unknown]).unique()
+        codes = codes.astype(np.int64)
+        codes[unknown] = len(categories) + raw_unknown.get_indexer(values[unknown])
+        categories = categories + list(raw_unknown)
+
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=categories),
+        index=series.index,
+        name=series.name,
+    )
+
+
+def apply_codecs(df, codecs=CATEGORY_CODECS):
+    """
+    Relabels every column of a dataframe that has a codec.
+
+    Parameters:
+    ----------
+    df : pandas.DataFrame
+        The dataframe with raw codes. It is modified in place.
+    codecs : dict, optional
+        Mapping of column name to codec. Defaults to ``CATEGORY_CODECS``.
+
+    Returns:
+    -------
+    pandas.DataFrame
+        The same dataframe with the codec columns converted to ``category``.
+    """
+    for column, codec in codecs.items():
+        if column in df.columns:
+            df[column] = encode_column(df[column], codec)
+    return df
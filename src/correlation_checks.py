@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+
+
+def stratified_sample(df, label, n_samples=None, random_state=42):
+    """
+    Draws a sample of rows that keeps the class proportions of the label.
+
+    Parameters:
+    ----------
+    df : pandas.DataFrame
+        The data to sample from.
+    label : str
+        Name of the label column to stratify on.
+    n_samples : int, optional
+        Approximate number of rows to keep. The full frame is returned when None
+        or when the frame is not larger than n_samples.
+    random_state : int, optional
+        Seed of the sample. Defaults to 42.
+
+    Returns:
+    -------
+    pandas.DataFrame
+        The sampled rows.
+    """
+    if n_samples is None or len(df) <= n_samples:
+        return df
+    return df.groupby(label, group_keys=False, observed=True).sample(
+        frac=n_samples / len(df), random_state=random_state
+    )
+
+
+def _factorize(series):
+    """Returns integer codes and the number of levels of a column."""
+    codes, uniques = pd.factorize(series, sort=True)
+    return codes, len(uniques)
+
+
+def correlation_ratio(codes, n_levels, values):
+    """
+    Correlation ratio (eta) between a categorical column and each numeric column.
+
+    Parameters:
+    ----------
+    codes : numpy.ndarray
+        Integer codes of the categorical column.
+    n_levels : int
+        Number of levels of the categorical column.
+    values : numpy.ndarray
+        Numeric columns as a 2-D array of shape (n_rows, n_columns).
+
+    Returns:
+    -------
+    numpy.ndarray
+        One eta per numeric column, between 0 and 1.
+    """
+    counts = np.bincount(codes, minlength=n_levels)
+    centered = values - values.mean(axis=0)
+    group_sums = np.stack([np.bincount(codes, weights=centered[:, j], minlength=n_levels)
+                           for j in range(centered.shape[1])], axis=1)
+    between = (group_sums ** 2 / np.maximum(counts, 1)[:, None]).sum(axis=0)
+    total = (centered ** 2).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, np.sqrt(between / total), 0.0)
+
+
+def cramers_v(codes_a, n_a, codes_b, n_b):
+    """
+    Cramer's V between two categorical columns given as integer codes.
+
+    Returns:
+    -------
+    float
+        The association, between 0 and 1.
+    """
+    if min(n_a, n_b) < 2:
+        return 0.0
+    observed = np.bincount(codes_a * n_b + codes_b, minlength=n_a * n_b).reshape(n_a, n_b)
+    n = observed.sum()
+    expected = np.outer(observed.sum(axis=1), observed.sum(axis=0)) / n
+    with np.errstate(invalid="ignore", divide="ignore"):
+        chi2 = np.nansum((observed - expected) ** 2 / expected)
+    return float(np.sqrt(chi2 / n / (min(n_a, n_b) - 1)))
+
+
+def association_matrix(df, categorical=None):
+    """
+    Computes the pairwise association of every column of a frame in one go.
+
+    Numeric pairs use Spearman correlation (one ranking of all numeric columns and a
+    single correlation matrix), categorical pairs use Cramer's V and mixed pairs use
+    the correlation ratio. Rows with missing values are dropped first.
+
+    Parameters:
+    ----------
+    df : pandas.DataFrame
+        The data.
+    categorical : list, optional
+        Columns to treat as categorical. Defaults to the object and category columns.
+
+    Returns:
+    -------
+    pandas.DataFrame
+        Symmetric matrix of associations indexed by column name.
+    """
+    df = df.dropna()
+    if categorical is None:
+        categorical = df.select_dtypes(include=["object", "category"]).columns.tolist()
+    numeric = [col for col in df.columns if col not in categorical]
+    columns = numeric + list(categorical)
+    matrix = pd.DataFrame(np.eye(len(columns)), index=columns, columns=columns)
+
+    if numeric:
+        ranks = df[numeric].rank().to_numpy(dtype=np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            matrix.loc[numeric, numeric] = np.corrcoef(ranks, rowvar=False).reshape(len(numeric), len(numeric))
+
+    encoded = {col: _factorize(df[col]) for col in categorical}
+    values = df[numeric].to_numpy(dtype=np.float64)
+    for i, col in enumerate(categorical):
+        codes, n_levels = encoded[col]
+        if numeric:
+            eta = correlation_ratio(codes, n_levels, values)
+            matrix.loc[numeric, col] = eta
+            matrix.loc[col, numeric] = eta
+        for other in categorical[i + 1:]:
+            v = cramers_v(codes, n_levels, *encoded[other])
+            matrix.loc[col, other] = v
+            matrix.loc[other, col] = v
+
+    return matrix
+
+
+def check_correlations(df, label, threshold=0.9, n_samples=None, random_state=42, categorical=None):
+    """
+    Checks feature-label and feature-feature associations against a threshold.
+
+    The association matrix is computed once over the features and the label (the
+    label is treated as categorical) on an optional stratified sample.
+
+    Parameters:
+    ----------
+    df : pandas.DataFrame
+        The data including the label column.
+    label : str
+        Name of the label column.
+    threshold : float, optional
+        Largest acceptable absolute association. Defaults to 0.9.
+    n_samples : int, optional
+        Size of the stratified sample. Uses every row when None.
+    random_state : int, optional
+        Seed of the sample. Defaults to 42.
+    categorical : list, optional
+        Feature columns to treat as categorical. Defaults to the object and category columns.
+
+    Returns:
+    -------
+    dict
+        'feature_label': Series of each feature's association with the label,
+        'feature_feature': DataFrame of pairwise feature associations,
+        'label_failures': features whose association with the label is at or above the threshold,
+        'pair_failures': feature pairs whose association is above the threshold.
+    """
+    sample = stratified_sample(df, label, n_samples, random_state)
+    if categorical is None:
+        categorical = sample.drop(columns=label).select_dtypes(include=["object", "category"]).columns.tolist()
+    matrix = association_matrix(sample, categorical=list(categorical) + [label]).abs()
+
+    features = [col for col in matrix.columns if col != label]
+    feature_label = matrix.loc[features, label].sort_values(ascending=False)
+    feature_feature = matrix.loc[features, features]
+
+    upper = np.triu(feature_feature.to_numpy() > threshold, k=1)
+    pair_failures = [(features[i], features[j]) for i, j in zip(*np.nonzero(upper))]
+
+    return {
+        "feature_label": feature_label,
+        "feature_feature": feature_feature,
+        "label_failures": feature_label[feature_label >= threshold].index.tolist(),
+        "pair_failures": pair_failures
+    }
@@ -0,0 +1,166 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from sklearn.base import clone, is_classifier
+from sklearn.model_selection import check_cv
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+
+SCORERS = {
+    "accuracy": accuracy_score,
+    "precision": precision_score,
+    "recall": recall_score,
+    "f1": f1_score
+}
+
+def _take(data, index):
+    return data.iloc[index] if hasattr(data, "iloc") else data[index]
+
+def _fit_fold(X, y, estimator, train, test, scoring):
+    """Fits one clone of estimator and scores it on its train and test indices."""
+    estimator = clone(estimator)
+    start = time.perf_counter()
+    estimator.fit(_take(X, train), _take(y, train))
+    fit_time = time.perf_counter() - start
+    if test is None:
+        return estimator, None, None, {"fit_time": fit_time}
+
+    X_test, y_test = _take(X, test), _take(y, test)
+    start = time.perf_counter()
+    test_pred = estimator.predict(X_test)
+    test_scores = {name: SCORERS[name](y_test, test_pred) for name in scoring}
+    score_time = time.perf_counter() - start
+    test_proba = estimator.predict_proba(X_test) if hasattr(estimator, "predict_proba") else None
+
+    y_train = _take(y, train)
+    train_pred = estimator.predict(_take(X, train))
+    scores = {"fit_time": fit_time, "score_time": score_time}
+    for name in scoring:
+        scores[f"test_{name}"] = test_scores[name]
+        scores[f"train_{name}"] = SCORERS[name](y_train, train_pred)
+    return estimator, test_pred, test_proba, scores
+
+# Arguments every task of a worker process shares, set once by the pool initializer
+_shared = ()
+
+def _set_shared(shared):
+    global _shared
+    _shared = shared
+
+def _call_with_shared(fn, task):
+    return fn(*_shared, *task)
+
+def run_in_pool(fn, tasks, n_jobs=1, shared=()):
+    """
+    Calls fn(*shared, *task) for every task and returns the results in order.
+
+    Runs in-process when n_jobs is 1, otherwise on a pool of up to n_jobs worker
+    processes (-1 uses every CPU). The shared arguments, such as the training data,
+    are sent to each worker once through the pool initializer; only the tasks are
+    pickled one by one.
+    """
+    n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+    if n_jobs is None or n_jobs <= 1 or len(tasks) <= 1:
+        return [fn(*shared, *task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks)), initializer=_set_shared, initargs=(shared,)) as pool:
+        futures = [pool.submit(_call_with_shared, fn, task) for task in tasks]
+        return [future.result() for future in futures]
+
+def _collect(folds, fold_results, refit_result, y):
+    """Assembles the results of one estimator from its fold results."""
+    y_values = np.asarray(y)
+    oof_predictions = np.empty(len(y_values), dtype=y_values.dtype)
+    oof_proba = None
+    for (train, test), (_, test_pred, test_proba, _) in zip(folds, fold_results):
+        oof_predictions[test] = test_pred
+        if test_proba is not None:
+            if oof_proba is None:
+                oof_proba = np.empty((len(y_values), test_proba.shape[1]))
+            oof_proba[test] = test_proba
+
+    return {
+        "scores": pd.DataFrame([fold_scores for *_, fold_scores in fold_results]),
+        "estimators": [fold_estimator for fold_estimator, *_ in fold_results],
+        "folds": folds,
+        "oof_predictions": oof_predictions,
+        "oof_proba": oof_proba,
+        "estimator": refit_result[0] if refit_result is not None else None
+    }
+
+def cross_validate_models(estimators, X, y, cv=5, scoring=("accuracy", "precision", "recall", "f1"), n_jobs=1, refit=True):
+    """
+    Cross-validates several estimators on one set of folds, fitting every (estimator, fold) once.
+
+    The folds are split once and shared by all estimators, and the fits of every estimator
+    and fold (and the refits on all the data) go through one pool of worker processes.
+
+    Parameters:
+    ----------
+    estimators : dict
+        Name to unfitted estimator or pipeline; each fold fits a clone.
+    X, y, cv, scoring, n_jobs, refit :
+        As in cross_validate_folds.
+
+    Returns:
+    -------
+    dict
+        Name to the results of that estimator, as returned by cross_validate_folds.
+    """
+    unknown = [name for name in scoring if name not in SCORERS]
+    if unknown:
+        raise ValueError(f"Unknown scoring {unknown}. Choose from {list(SCORERS)}.")
+
+    classifier = all(is_classifier(estimator) for estimator in estimators.values())
+    folds = list(check_cv(cv, y, classifier=classifier).split(X, y))
+    tasks = [(name, train, test) for name in estimators for train, test in folds]
+    if refit:
+        tasks += [(name, np.arange(len(y)), None) for name in estimators]
+
+    results = run_in_pool(_fit_fold, [(estimators[name], train, test, scoring) for name, train, test in tasks], n_jobs,
+                          shared=(X, y))
+
+    by_name = {name: [] for name in estimators}
+    for (name, _, _), result in zip(tasks, results):
+        by_name[name].append(result)
+    return {
+        name: _collect(folds, name_results[:len(folds)], name_results[len(folds)] if refit else None, y)
+        for name, name_results in by_name.items()
+    }
+
+def cross_validate_folds(estimator, X, y, cv=5, scoring=("accuracy", "precision", "recall", "f1"), n_jobs=1, refit=True):
+    """
+    Fits every cross-validation fold exactly once and keeps everything the folds produce.
+
+    The folds are the ones sklearn's cross_validate and cross_val_predict use for the
+    same ``cv``, so the scores match cross_validate(..., return_train_score=True), and the
+    out-of-fold predictions match cross_val_predict, without fitting the folds twice.
+
+    Parameters:
+    ----------
+    estimator : sklearn estimator
+        The unfitted estimator or pipeline; each fold fits a clone.
+    X : pandas.DataFrame or numpy.ndarray
+        The training features.
+    y : pandas.Series or numpy.ndarray
+        The training labels.
+    cv : int, cross-validation splitter or list of (train, test) indices, optional
+        Number of folds, a splitter or precomputed folds. Defaults to 5 (stratified for classifiers).
+    scoring : sequence of str, optional
+        Names of the metrics in SCORERS. Defaults to accuracy, precision, recall and f1.
+    n_jobs : int, optional
+        Number of worker processes; 1 fits in-process, -1 uses every CPU. Defaults to 1.
+    refit : bool, optional
+        Also fit the estimator on all of X and y, alongside the folds. Defaults to True.
+
+    Returns:
+    -------
+    dict
+        'scores': DataFrame with one row per fold, columns as in cross_validate.
+        'estimators': the fitted fold estimators.
+        'folds': the (train, test) indices of each fold.
+        'oof_predictions': out-of-fold prediction of every row.
+        'oof_proba': out-of-fold class probabilities, or None without predict_proba.
+        'estimator': the estimator refitted on all the data, or None when refit=False.
+    """
+    return cross_validate_models({"estimator": estimator}, X, y, cv, scoring, n_jobs, refit)["estimator"]
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+
+def bin_codes(values, edges):
+    """
+    Returns the bin of every value for equal-width edges.
+
+    Missing and out-of-range values get the overflow code ``len(edges) - 1``, one past the
+    last bin, so counts can be taken with a plain bincount and the overflow bin dropped.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    bins = len(edges) - 1
+    width = (edges[-1] - edges[0]) / bins
+    with np.errstate(invalid="ignore"):
+        codes = np.floor((values - edges[0]) / (width if width > 0 else 1.0))
+        # the upper edge belongs to the last bin, like np.histogram
+        codes[values == edges[-1]] = bins - 1
+        codes[~((codes >= 0) & (codes < bins))] = bins
+    return codes.astype(np.int64)
+
+
+def histogram_summary(df, columns, label, bins=50, edges=None):
+    """
+    Aggregates a frame into the binned counts the large-data EDA figures are drawn from.
+
+    Every column is cut into ``bins`` equal-width bins. One pass over the rows per column
+    gives the per-class 1-D histograms, and one bincount per column pair the 2-D
+    histograms, so the summary has the same small size whatever the number of rows.
+
+    Parameters:
+    ----------
+    df : pandas.DataFrame
+        The data, including the label column.
+    columns : list of str
+        Numeric columns to histogram.
+    label : str
+        Column whose classes split the 1-D histograms.
+    bins : int, optional
+        Number of bins per column. Defaults to 50.
+    edges : dict, optional
+        Column to bin edges. Defaults to ``bins`` equal-width bins over each column's range.
+
+    Returns:
+    -------
+    dict
+        'columns', 'classes', 'class_counts' (pandas.Series), 'edges' (column to edges),
+        'hist1d' (column to an (n_classes, bins) array) and 'hist2d' ((column, column) to a
+        (bins, bins) array of counts, first column along the rows).
+    """
+    labels = df[label]
+    classes = np.sort(pd.unique(labels.dropna()))
+    class_codes = pd.Categorical(labels, categories=classes).codes.astype(np.int64)
+    if edges is None:
+        edges = {}
+        for col in columns:
+            values = df[col].to_numpy(dtype=np.float64)
+            finite = values[np.isfinite(values)]
+            low, high = (finite.min(), finite.max()) if len(finite) else (0.0, 1.0)
+            edges[col] = np.linspace(low, high if high > low else low + 1.0, bins + 1)
+
+    codes = {col: bin_codes(df[col], edges[col]) for col in columns}
+    n_classes = len(classes)
+    class_codes[class_codes < 0] = n_classes
+    hist1d = {}
+    for col in columns:
+        n_bins = len(edges[col]) - 1
+        counts = np.bincount(class_codes * (n_bins + 1) + codes[col], minlength=(n_classes + 1) * (n_bins + 1))
+        hist1d[col] = counts.reshape(n_classes + 1, n_bins + 1)[:n_classes, :n_bins]
+
+    hist2d = {}
+    for i, first in enumerate(columns):
+        for second in columns[i + 1:]:
+            n_first, n_second = len(edges[first]) - 1, len(edges[second]) - 1
+            counts = np.bincount(codes[first] * (n_second + 1) + codes[second], minlength=(n_first + 1) * (n_second + 1))
+            hist2d[first, second] = counts.reshape(n_first + 1, n_second + 1)[:n_first, :n_second]
+
+    return {
+        "columns": list(columns),
+        "classes": classes,
+        "class_counts": pd.Series(np.bincount(class_codes, minlength=n_classes + 1)[:n_classes], index=classes),
+        "edges": edges,
+        "hist1d": hist1d,
+        "hist2d": hist2d
+    }
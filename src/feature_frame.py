@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+def feature_frame(values, columns, index=None):
+    """
+    Wraps a transformed feature matrix in a DataFrame.
+
+    A scipy sparse matrix (such as the output of a ColumnTransformer with a sparse
+    OneHotEncoder) becomes a frame of sparse columns, which holds only the non-zero
+    values and which scikit-learn estimators take as a sparse matrix, so it is never
+    densified. Dense arrays become ordinary frames.
+
+    Parameters:
+    ----------
+    values : numpy.ndarray or scipy.sparse matrix
+        The feature matrix.
+    columns : list of str
+        The feature names.
+    index : pandas.Index, optional
+        Row labels. Defaults to a RangeIndex.
+
+    Returns:
+    -------
+    pandas.DataFrame
+    """
+    if sparse.issparse(values):
+        frame = pd.DataFrame.sparse.from_spmatrix(values, columns=columns)
+        if index is not None:
+            frame.index = index
+        return frame
+    return pd.DataFrame(values, columns=columns, index=index)
+
+
+def is_sparse_frame(data):
+    """Tells whether every column of a DataFrame is sparse."""
+    return len(data.columns) > 0 and all(isinstance(dtype, pd.SparseDtype) for dtype in data.dtypes)
+
+
+def to_csr(data):
+    """
+    Returns the values of a DataFrame (sparse or dense columns) as a float CSR matrix.
+
+    The stored values of sparse columns are stacked into a CSC matrix directly, which
+    copies them once instead of going through DataFrame.sparse.to_coo.
+    """
+    if not is_sparse_frame(data):
+        return sparse.csr_matrix(data.to_numpy(dtype=np.float64))
+    arrays = [data[col].array for col in data.columns]
+    if any(array.fill_value != 0 for array in arrays):
+        return data.sparse.to_coo().tocsr().astype(np.float64)
+    indptr = np.concatenate([[0], np.cumsum([array.sp_index.npoints for array in arrays])])
+    values = np.concatenate([np.asarray(array.sp_values, dtype=np.float64) for array in arrays])
+    indices = np.concatenate([array.sp_index.indices for array in arrays])
+    return sparse.csc_matrix((values, indices, indptr), shape=data.shape).tocsr()
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import shutil
+import urllib.error
+import urllib.parse
+import urllib.request
+
+CHUNK_SIZE = 1 << 20
+
+
+def file_sha256(path):
+    """Returns the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _meta_path(path):
+    return f"{path}.meta.json"
+
+
+def _read_json(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _open(url, method="GET", headers=None, timeout=30):
+    """Opens url, returning the response, or None for 304 Not Modified."""
+    request = urllib.request.Request(url, method=method, headers=headers or {})
+    try:
+        return urllib.request.urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None
+        raise
+
+
+def _is_current(url, path, meta, timeout):
+    """Asks the server with one conditional HEAD request whether the local copy is still current."""
+    validators = {"If-None-Match": meta.get("etag"), "If-Modified-Since": meta.get("last_modified")}
+    headers = {name: value for name, value in validators.items() if value}
+    if not headers:
+        return False
+    response = _open(url, "HEAD", headers, timeout)
+    if response is None:
+        return True
+    with response:
+        etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+    if etag or meta.get("etag"):
+        return etag == meta.get("etag")
+    return last_modified is not None and last_modified == meta.get("last_modified")
+
+
+def _hash_file(path, digest, chunk_size):
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest
+
+
+def _complete(path, part_path, part_meta_path, url, etag, last_modified, digest):
+    """Moves a finished '.part' file to path and writes its metadata."""
+    os.replace(part_path, path)
+    os.remove(part_meta_path)
+    meta = {"url": url, "etag": etag, "last_modified": last_modified, "sha256": digest.hexdigest(),
+            "size": os.path.getsize(path)}
+    _write_json(_meta_path(path), meta)
+    return meta
+
+
+def _download(url, path, timeout, chunk_size):
+    """
+    Streams url to path through a '.part' file, resuming a previous partial download with
+    a Range request when the server still has the same version (If-Range). A '.part' file
+    that already holds the whole file (416 Range Not Satisfiable, with the local size as
+    the total) is completed without a transfer.
+    """
+    part_path = f"{path}.part"
+    part_meta_path = f"{part_path}.json"
+    part_meta = _read_json(part_meta_path) or {}
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    validator = part_meta.get("etag") or part_meta.get("last_modified")
+
+    headers = {}
+    if offset and validator and part_meta.get("url") == url:
+        headers = {"Range": f"bytes={offset}-", "If-Range": validator}
+
+    digest = hashlib.sha256()
+    try:
+        response = _open(url, "GET", headers, timeout)
+    except urllib.error.HTTPError as e:
+        if e.code != 416 or not headers:
+            raise
+        total = (e.headers.get("Content-Range") or "").rpartition("/")[2]
+        if total.isdigit() and int(total) == offset:
+            meta = _complete(path, part_path, part_meta_path, url, part_meta.get("etag"),
+                             part_meta.get("last_modified"), _hash_file(part_path, digest, chunk_size))
+            return meta, "resumed"
+        # the partial file does not fit the server's file: start over
+        response = _open(url, "GET", {}, timeout)
+
+    with response:
+        resumed = response.status == 206
+        if resumed:
+            # re-hash the bytes that are already on disk, then append
+            _hash_file(part_path, digest, chunk_size)
+        else:
+            offset = 0
+        etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        _write_json(part_meta_path, {"url": url, "etag": etag, "last_modified": last_modified})
+
+        expected = response.headers.get("Content-Length")
+        received = 0
+        with open(part_path, "ab" if resumed else "wb") as f:
+            for chunk in iter(lambda: response.read(chunk_size), b""):
+                f.write(chunk)
+                digest.update(chunk)
+                received += len(chunk)
+
+    if expected is not None and received != int(expected):
+        raise IOError(f"Download of {url} was interrupted after {offset + received} bytes; run it again to resume.")
+
+    meta = _complete(path, part_path, part_meta_path, url, etag, last_modified, digest)
+    return meta, "resumed" if resumed else "downloaded"
+
+
+def _fetch(url, path, timeout, chunk_size):
+    """Brings path up to date with url; returns its metadata and what was done."""
+    meta = _read_json(_meta_path(path))
+    if (os.path.exists(path) and meta is not None and meta.get("url") == url
+            and os.path.getsize(path) == meta.get("size")):
+        try:
+            if _is_current(url, path, meta, timeout):
+                return meta, "not-modified"
+        except urllib.error.URLError as e:
+            if isinstance(e, urllib.error.HTTPError):
+                raise
+            # offline: keep the copy we have
+            return meta, "offline"
+    return _download(url, path, timeout, chunk_size)
+
+
+def fetch_file(url, path, sha256=None, mirror_dir=None, timeout=30, chunk_size=CHUNK_SIZE):
+    """
+    Downloads a file by streaming its bytes to disk, skipping the transfer when the local copy is current.
+
+    A completed download stores the server's ETag and Last-Modified headers and the file's
+    SHA-256 in ``<file>.meta.json``. Later runs revalidate the copy with a single conditional
+    HEAD request (If-None-Match / If-Modified-Since) and only download again when the server
+    has a new version. An interrupted download leaves a ``.part`` file that the next run
+    resumes with an HTTP Range request, provided the server still serves the same version.
+    Local paths and file:// URLs are copied.
+
+    Parameters:
+    ----------
+    url : str
+        http(s) or file:// URL, or a local path.
+    path : str
+        Destination file. Its directory is created if needed.
+    sha256 : str, optional
+        Expected SHA-256 hex digest of the file. No check when None.
+    mirror_dir : str, optional
+        Directory of local copies shared between runs (and survivors of ``make clean``).
+        When given, the file is downloaded into and revalidated in the mirror, then copied
+        to path. When the server cannot be reached, a mirrored or existing copy is used.
+    timeout : float, optional
+        Socket timeout in seconds. Defaults to 30.
+    chunk_size : int, optional
+        Number of bytes read and written at a time. Defaults to 1 MiB.
+
+    Returns:
+    -------
+    dict
+        'path', 'sha256', 'size' and 'status': one of 'downloaded', 'resumed',
+        'not-modified', 'offline' or 'copied' (local source).
+
+    Raises:
+    ------
+    ValueError
+        If the file does not match the expected SHA-256; the mismatching file is removed.
+    IOError
+        If the transfer ends early; the partial file is kept for the next run.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    scheme = urllib.parse.urlparse(url).scheme
+
+    if scheme in ("http", "https"):
+        store_path = path
+        if mirror_dir:
+            os.makedirs(mirror_dir, exist_ok=True)
+            name = os.path.basename(urllib.parse.urlparse(url).path) or "download"
+            store_path = os.path.join(mirror_dir, f"{hashlib.sha256(url.encode()).hexdigest()[:12]}-{name}")
+        meta, status = _fetch(url, store_path, timeout, chunk_size)
+    else:
+        store_path = urllib.request.url2pathname(urllib.parse.urlparse(url).path) if scheme == "file" else url
+        meta, status = {"sha256": file_sha256(store_path), "size": os.path.getsize(store_path)}, "copied"
+
+    if sha256 is not None and meta["sha256"] != sha256.lower():
+        for stale in (store_path, _meta_path(store_path)):
+            if status != "copied" and os.path.exists(stale):
+                os.remove(stale)
+        raise ValueError(f"Checksum mismatch for {url}: expected {sha256}, got {meta['sha256']}.")
+
+    if os.path.abspath(store_path) != os.path.abspath(path):
+        # only rewrite the destination when its content differs, so its timestamp stays put
+        if not os.path.exists(path) or os.path.getsize(path) != meta["size"] or file_sha256(path) != meta["sha256"]:
+            shutil.copyfile(store_path, path)
+
+    return {"path": path, "sha256": meta["sha256"], "size": meta["size"], "status": status}
@@ -0,0 +1,161 @@
+import os
+import numpy as np
+
+FLAT_TREE_ARRAYS = ["feature", "threshold", "left", "right", "missing_left", "value", "classes", "feature_names"]
+
+
+class FlatTree:
+    """
+    Decision tree classifier stored as flat node arrays and scored without scikit-learn.
+
+    Node ``i`` splits on ``X[:, feature[i]] <= threshold[i]`` and continues with
+    ``left[i]`` or ``right[i]``; leaves have ``left[i] == -1``. Rows are scored in
+    cache-sized blocks, and every row of a block advances one level at a time with
+    vectorized gathers. Leaves point to themselves, so a fixed number of levels
+    (the tree depth) brings every row to its leaf without per-level bookkeeping.
+
+    Parameters:
+    ----------
+    feature : numpy.ndarray
+        Split feature index of each node (-2 for leaves).
+    threshold : numpy.ndarray
+        Split threshold of each node.
+    left, right : numpy.ndarray
+        Child node indices (-1 for leaves).
+    missing_left : numpy.ndarray
+        Whether rows with a missing (NaN) split value go to the left child.
+    value : numpy.ndarray
+        Class weights of each node, shape (n_nodes, n_classes).
+    classes : numpy.ndarray
+        Class labels, in the column order of ``value``.
+    feature_names : numpy.ndarray
+        Names of the features, in the column order of the input matrix.
+    block_size : int, optional
+        Number of rows traversed together. Defaults to 16,384.
+    """
+
+    def __init__(self, feature, threshold, left, right, missing_left, value, classes, feature_names, block_size=16_384):
+        self.feature = np.asarray(feature, dtype=np.intp)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left = np.asarray(left, dtype=np.intp)
+        self.right = np.asarray(right, dtype=np.intp)
+        self.missing_left = np.asarray(missing_left, dtype=bool)
+        self.value = np.asarray(value, dtype=np.float64)
+        self.classes = np.asarray(classes)
+        self.feature_names = np.asarray(feature_names)
+        self.block_size = block_size
+
+        # traversal tables: leaves split on feature 0 and loop back to themselves,
+        # and the children of node i sit at 2 * i (left) and 2 * i + 1 (right)
+        nodes = np.arange(len(self.left))
+        leaf = self.left == -1
+        self._split_feature = np.where(leaf, 0, self.feature)
+        self._children = np.column_stack([np.where(leaf, nodes, self.left), np.where(leaf, nodes, self.right)]).ravel()
+        normalizer = self.value.sum(axis=1, keepdims=True)
+        self._proba = self.value / np.where(normalizer == 0.0, 1.0, normalizer)
+        self.depth = 0
+        level = np.array([0])
+        while not leaf[level].all():
+            level = self._children[2 * level[~leaf[level]][:, None] + [0, 1]].ravel()
+            self.depth += 1
+
+    def _apply_block(self, X):
+        flat = X.ravel()
+        offsets = np.arange(len(X)) * X.shape[1]
+        nodes = np.zeros(len(X), dtype=np.intp)
+        index = np.empty(len(X), dtype=np.intp)
+        has_missing = np.isnan(flat).any()
+        for _ in range(self.depth):
+            np.add(offsets, np.take(self._split_feature, nodes), out=index)
+            values = np.take(flat, index)
+            go_right = values > np.take(self.threshold, nodes)
+            if has_missing:
+                go_right = np.where(np.isnan(values), ~np.take(self.missing_left, nodes), go_right)
+            np.multiply(nodes, 2, out=nodes)
+            np.add(nodes, go_right, out=nodes)
+            nodes = np.take(self._children, nodes)
+        return nodes
+
+    def apply(self, X):
+        """
+        Returns the index of the leaf each row ends in.
+
+        Parameters:
+        ----------
+        X : numpy.ndarray
+            Feature matrix with the columns in the order of ``feature_names``.
+
+        Returns:
+        -------
+        numpy.ndarray
+            Leaf node index of each row.
+        """
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != len(self.feature_names):
+            raise ValueError(f"Expected a 2-D array with {len(self.feature_names)} columns, got shape {X.shape}.")
+
+        leaves = np.empty(len(X), dtype=np.intp)
+        for start in range(0, len(X), self.block_size):
+            # scikit-learn compares float32 feature values against float64 thresholds
+            block = np.ascontiguousarray(X[start:start + self.block_size], dtype=np.float32)
+            leaves[start:start + self.block_size] = self._apply_block(block)
+        return leaves
+
+    def predict_proba(self, X):
+        """Returns the class probabilities of each row, like DecisionTreeClassifier.predict_proba."""
+        return np.take(self._proba, self.apply(X), axis=0)
+
+    def predict(self, X):
+        """Returns the predicted class of each row."""
+        return np.take(self.classes, np.take(np.argmax(self.value, axis=1), self.apply(X)))
+
+    def save(self, directory):
+        """Saves every node array as its own .npy file in directory."""
+        os.makedirs(directory, exist_ok=True)
+        for name in FLAT_TREE_ARRAYS:
+            array = getattr(self, name)
+            np.save(os.path.join(directory, f"{name}.npy"), array.astype(str) if array.dtype == object else array)
+
+    @classmethod
+    def load(cls, directory, mmap_mode=None):
+        """Loads a tree saved with save(); mmap_mode='r' memory-maps the node arrays."""
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+                  for name in FLAT_TREE_ARRAYS}
+        return cls(**arrays)
+
+
+def flatten_tree(pipeline, feature_names=None):
+    """
+    Exports a fitted DecisionTreeClassifier into a FlatTree.
+
+    Parameters:
+    ----------
+    pipeline : sklearn.pipeline.Pipeline or sklearn.tree.DecisionTreeClassifier
+        The fitted model; the last pipeline step must be a single-output DecisionTreeClassifier.
+    feature_names : list, optional
+        Names of the input features. Defaults to the names the model was fitted with.
+
+    Returns:
+    -------
+    FlatTree
+        Tree matching pipeline.predict_proba(X).
+    """
+    model = pipeline[-1] if hasattr(pipeline, "steps") else pipeline
+    if type(model).__name__ != "DecisionTreeClassifier" or model.n_outputs_ != 1:
+        raise ValueError("Only a single-output DecisionTreeClassifier can be flattened.")
+
+    tree = model.tree_
+    if feature_names is None:
+        feature_names = getattr(model, "feature_names_in_", [f"x{i}" for i in range(model.n_features_in_)])
+    missing_left = getattr(tree, "missing_go_to_left", np.zeros(tree.node_count, dtype=bool))
+
+    return FlatTree(
+        tree.feature,
+        tree.threshold,
+        tree.children_left,
+        tree.children_right,
+        missing_left,
+        tree.value[:, 0, :],
+        model.classes_,
+        feature_names
+    )
@@ -0,0 +1,176 @@
+import numpy as np
+
+
+class FusedLogisticScorer:
+    """
+    Scores the preprocessor + logistic regression pipeline as one affine function of the raw features.
+
+    The StandardScaler means and scales are folded into one weight per numeric feature and
+    the bias, and every one-hot column becomes an offset looked up from the raw category.
+    Scoring needs NumPy only: no pandas or scikit-learn is imported at inference time.
+
+    Parameters:
+    ----------
+    numeric_features : numpy.ndarray
+        Names of the numeric features, in the order of ``weights``.
+    weights : numpy.ndarray
+        One weight per numeric feature, on the raw (unscaled) values.
+    bias : float
+        Intercept including the folded scaler means.
+    categorical_features : numpy.ndarray
+        Names of the categorical features.
+    categories : list of numpy.ndarray
+        Sorted categories of each categorical feature.
+    offsets : list of numpy.ndarray
+        Contribution of each category to the logit. Dropped and unknown categories add 0.
+    classes : numpy.ndarray
+        Class labels, negative class first.
+    """
+
+    def __init__(self, numeric_features, weights, bias, categorical_features, categories, offsets, classes):
+        self.numeric_features = np.asarray(numeric_features)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        self.categorical_features = np.asarray(categorical_features)
+        self.categories = [np.asarray(cats) for cats in categories]
+        self.offsets = [np.asarray(offs, dtype=np.float64) for offs in offsets]
+        self.classes = np.asarray(classes)
+
+    def decision_function(self, columns):
+        """
+        Computes the logit of each record.
+
+        Parameters:
+        ----------
+        columns : mapping
+            Column name to 1-D array of raw values (a dict of arrays, or a DataFrame).
+
+        Returns:
+        -------
+        numpy.ndarray
+            The logit of the positive class for each record.
+        """
+        numeric = np.column_stack([np.asarray(columns[name], dtype=np.float64) for name in self.numeric_features])
+        logit = numeric @ self.weights + self.bias
+
+        for name, cats, offs in zip(self.categorical_features, self.categories, self.offsets):
+            values = np.asarray(columns[name])
+            if cats.dtype.kind == "U":
+                # one equality pass per level is cheaper than converting object columns to fixed-width strings
+                for cat, offset in zip(cats, offs):
+                    if offset != 0.0:
+                        logit += offset * (values == cat)
+            else:
+                values = values.astype(cats.dtype)
+                positions = np.minimum(np.searchsorted(cats, values), len(cats) - 1)
+                logit += np.where(cats[positions] == values, offs[positions], 0.0)
+
+        return logit
+
+    def predict_proba(self, columns):
+        """Returns the probabilities of both classes, like LogisticRegression.predict_proba."""
+        positive = np.exp(-np.logaddexp(0.0, -self.decision_function(columns)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, columns):
+        """Returns the predicted class of each record."""
+        return self.classes[(self.decision_function(columns) > 0).astype(int)]
+
+    def save(self, scorer_path):
+        """Saves the scorer as a small uncompressed .npz artifact that loads without pickle."""
+        arrays = {
+            "numeric_features": self.numeric_features.astype(str),
+            "weights": self.weights,
+            "bias": np.array(self.bias),
+            "categorical_features": self.categorical_features.astype(str),
+            "classes": self.classes
+        }
+        for i, (cats, offs) in enumerate(zip(self.categories, self.offsets)):
+            arrays[f"categories_{i}"] = cats
+            arrays[f"offsets_{i}"] = offs
+        np.savez(scorer_path, **arrays)
+
+    @classmethod
+    def load(cls, scorer_path):
+        """Loads a scorer saved with save()."""
+        with np.load(scorer_path, allow_pickle=False) as arrays:
+            n_categorical = len(arrays["categorical_features"])
+            return cls(
+                arrays["numeric_features"],
+                arrays["weights"],
+                arrays["bias"],
+                arrays["categorical_features"],
+                [arrays[f"categories_{i}"] for i in range(n_categorical)],
+                [arrays[f"offsets_{i}"] for i in range(n_categorical)],
+                arrays["classes"]
+            )
+
+
+def compile_logistic_scorer(preprocessor, pipeline):
+    """
+    Folds a fitted ColumnTransformer and a binary logistic regression pipeline into a FusedLogisticScorer.
+
+    Supports StandardScaler, OneHotEncoder (any 'drop', handle_unknown='ignore'),
+    'passthrough' and 'drop' transformers.
+
+    Parameters:
+    ----------
+    preprocessor : sklearn.compose.ColumnTransformer
+        The fitted preprocessor.
+    pipeline : sklearn.pipeline.Pipeline or sklearn.linear_model.LogisticRegression
+        The fitted model; the last pipeline step must be a binary LogisticRegression.
+
+    Returns:
+    -------
+    FusedLogisticScorer
+        Scorer matching pipeline.predict_proba(preprocessor.transform(X)).
+    """
+    model = pipeline[-1] if hasattr(pipeline, "steps") else pipeline
+    if type(model).__name__ != "LogisticRegression" or model.coef_.shape[0] != 1:
+        raise ValueError("Only binary logistic regression can be compiled.")
+    coef = model.coef_.ravel()
+
+    numeric_features, weights = [], []
+    categorical_features, categories, offsets = [], [], []
+    bias = float(model.intercept_[0])
+    start = 0
+
+    for name, transformer, columns in preprocessor.transformers_:
+        if transformer == "drop" or len(columns) == 0:
+            continue
+        if transformer == "passthrough":
+            width = len(columns)
+            numeric_features += list(columns)
+            weights += list(coef[start:start + width])
+        elif type(transformer).__name__ == "StandardScaler":
+            width = len(columns)
+            w = coef[start:start + width]
+            mean = transformer.mean_ if transformer.mean_ is not None else np.zeros(width)
+            scale = transformer.scale_ if transformer.scale_ is not None else np.ones(width)
+            numeric_features += list(columns)
+            weights += list(w / scale)
+            bias -= float(np.sum(w * mean / scale))
+        elif type(transformer).__name__ == "OneHotEncoder":
+            if transformer.handle_unknown != "ignore" or getattr(transformer, "infrequent_categories_", None) is not None:
+                raise ValueError("Only OneHotEncoder(handle_unknown='ignore') without infrequent categories can be compiled.")
+            drop_idx = transformer.drop_idx_ if transformer.drop_idx_ is not None else [None] * len(columns)
+            width = 0
+            for column, cats, dropped in zip(columns, transformer.categories_, drop_idx):
+                kept = [i for i in range(len(cats)) if dropped is None or i != dropped]
+                offs = np.zeros(len(cats))
+                offs[kept] = coef[start + width:start + width + len(kept)]
+                width += len(kept)
+                cats = np.asarray(cats)
+                cats = cats.astype(str) if cats.dtype == object else cats
+                order = np.argsort(cats)
+                categorical_features.append(column)
+                categories.append(cats[order])
+                offsets.append(offs[order])
+        else:
+            raise ValueError(f"Cannot compile transformer '{name}' of type {type(transformer).__name__}.")
+        start += width
+
+    if start != len(coef):
+        raise ValueError("The preprocessor output does not match the number of model coefficients.")
+
+    return FusedLogisticScorer(numeric_features, weights, bias, categorical_features, categories, offsets, model.classes_)
@@ -0,0 +1,66 @@
+import hashlib
+import numpy as np
+import pandas as pd
+
+
+def record_keys(df, key_columns):
+    """
+    Returns the canonical text key of every row: the values of key_columns joined by a
+    unit separator. Numbers are written as floats, so a column keeps its keys whether it
+    is read as integers in one chunk or as floats in another.
+    """
+    parts = []
+    for col in key_columns:
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            parts.append(values.astype(np.float64).map(repr))
+        else:
+            parts.append(values.astype(str))
+    keys = parts[0].str.cat(parts[1:], sep="\x1f") if len(parts) > 1 else parts[0]
+    return keys.reset_index(drop=True)
+
+
+def hash_fractions(keys, seed):
+    """Maps every key (with the seed) to a fraction in [0, 1) through a 64-bit BLAKE2b digest."""
+    prefix = f"{seed}\x1f".encode()
+    return np.array([int.from_bytes(hashlib.blake2b(prefix + key.encode(), digest_size=8).digest(), "big")
+                     for key in keys], dtype=np.float64) / 2.0 ** 64
+
+
+def hash_split(df, seed, test_size=0.3, key_columns=None, stratify=None):
+    """
+    Assigns every row to the test set from a hash of its key and the seed.
+
+    A row's assignment depends on nothing but its own key, so rows can be split one
+    chunk at a time, reordering the rows changes nothing, and rows appended to the data
+    later never move an existing row to the other set. The catch is that the test share
+    is test_size on average rather than exactly: binomial, so within about
+    sqrt(test_size * (1 - test_size) / n) of it for n rows.
+
+    Parameters:
+    ----------
+    df : pandas.DataFrame
+        The rows to split.
+    seed : int
+        Seed mixed into every hash; another seed gives an independent split.
+    test_size : float, optional
+        Expected share of the rows in the test set. Defaults to 0.3.
+    key_columns : list of str, optional
+        Columns that identify a record. Defaults to every column, so identical
+        records always land in the same set.
+    stratify : str, optional
+        Label column, added to the key. As every row goes to the test set with
+        probability test_size, so does every class: the class shares of a stratified
+        train_test_split hold on average rather than exactly.
+
+    Returns:
+    -------
+    numpy.ndarray
+        Boolean mask of the test rows.
+    """
+    if not 0 < test_size < 1:
+        raise ValueError("test_size must be between 0 and 1.")
+    key_columns = list(df.columns) if key_columns is None else list(key_columns)
+    if stratify is not None and stratify not in key_columns:
+        key_columns.append(stratify)
+    return hash_fractions(record_keys(df, key_columns), seed) < test_size
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import math
+import os
+import time
+import warnings
+import numpy as np
+import pandas as pd
+from sklearn.base import clone, is_classifier
+from sklearn.exceptions import UndefinedMetricWarning
+from sklearn.model_selection import ParameterSampler, check_cv
+
+from src.cross_validate_folds import SCORERS, run_in_pool
+
+SEARCH_STRATEGIES = ["random", "halving"]
+
+
+def data_fingerprint(X, y):
+    """Returns a hash of the feature names, feature values and labels."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(col) for col in getattr(X, "columns", [])]).encode())
+    digest.update(pd.util.hash_pandas_object(pd.DataFrame(X), index=False).to_numpy().tobytes())
+    digest.update(pd.util.hash_pandas_object(pd.Series(np.asarray(y)), index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def estimator_fingerprint(estimator):
+    """Returns a hash of the estimator's steps and all of its (nested) parameters."""
+    params = {name: value for name, value in estimator.get_params(deep=True).items() if not hasattr(value, "get_params")}
+    params.pop("steps", None)
+    steps = [type(step).__name__ for _, step in getattr(estimator, "steps", [(None, estimator)])]
+    description = json.dumps({"steps": steps, "params": params}, sort_keys=True,
+                             default=lambda value: value.item() if isinstance(value, np.generic) else repr(value))
+    return hashlib.sha256(description.encode()).hexdigest()
+
+
+class FoldScoreCache:
+    """
+    On-disk cache of the test scores of one (estimator parameters, fold, training size).
+
+    Entries are appended to a JSON-lines file, so a rerun or a widened search only fits
+    the (parameters, fold) pairs that are not in the file yet. Keys also hash the data,
+    so the cache never returns scores of a different training set.
+
+    Parameters:
+    ----------
+    path : str
+        Path of the JSON-lines file. Created (with its directory) on the first save.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.entries = {}
+        self.unsaved = []
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry["key"]] = entry["scores"]
+
+    @staticmethod
+    def key(estimator, data_hash, train, test):
+        """Returns the cache key of fitting estimator on the train rows and scoring it on the test rows."""
+        rows = hashlib.sha256(np.asarray(train, dtype=np.int64).tobytes() + b"|" + np.asarray(test, dtype=np.int64).tobytes())
+        return hashlib.sha256(f"{estimator_fingerprint(estimator)}|{data_hash}|{rows.hexdigest()}".encode()).hexdigest()
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def put(self, key, scores):
+        self.entries[key] = scores
+        self.unsaved.append({"key": key, "scores": scores})
+
+    def save(self):
+        """Appends the new entries to the cache file."""
+        if not self.unsaved:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a") as f:
+            for entry in self.unsaved:
+                f.write(json.dumps(entry) + "\n")
+        self.unsaved = []
+
+
+def _score_fold(X, y, estimator, train, test, scoring):
+    """Fits estimator on the train indices and returns its test scores and fit time."""
+    estimator = clone(estimator)
+    X_train, y_train = (X.iloc[train], y.iloc[train]) if hasattr(X, "iloc") else (X[train], y[train])
+    X_test, y_test = (X.iloc[test], y.iloc[test]) if hasattr(X, "iloc") else (X[test], y[test])
+    start = time.perf_counter()
+    estimator.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+    y_pred = estimator.predict(X_test)
+    with warnings.catch_warnings():
+        # weak candidates on small subsamples may predict one class only; their precision is scored 0
+        warnings.simplefilter("ignore", UndefinedMetricWarning)
+        scores = {name: float(SCORERS[name](y_test, y_pred)) for name in scoring}
+    scores["fit_time"] = fit_time
+    return scores
+
+
+def _halving_resources(n_candidates, n_max, factor, min_resources):
+    """Returns the training size of every successive-halving round, the last one being n_max."""
+    n_rounds = 1 + int(math.log(max(n_candidates, 1), factor)) if n_candidates > 1 else 1
+    first = max(min_resources, int(n_max / factor ** (n_rounds - 1)))
+    return [min(n_max, int(first * factor ** i)) for i in range(n_rounds - 1)] + [n_max]
+
+
+def search_hyperparameters(estimator, param_distributions, X, y, strategy="random", n_candidates=20, factor=3,
+                           cv=5, scoring="accuracy", n_jobs=1, random_state=123, cache=None, min_resources=30):
+    """
+    Searches hyperparameters with randomized search or successive halving.
+
+    Both strategies draw ``n_candidates`` parameter sets with ParameterSampler. 'random'
+    scores every candidate on every fold. 'halving' scores all candidates on a subsample
+    of each fold's training rows, keeps the best 1/``factor`` of them, and repeats with
+    ``factor`` times more rows until the survivors are scored on the full folds. The
+    subsamples are nested prefixes of a fixed shuffle of each fold, and the last round
+    trains on the full folds like 'random' does, so both strategies share cached scores.
+
+    Parameters:
+    ----------
+    estimator : sklearn estimator
+        The unfitted estimator or pipeline.
+    param_distributions : dict
+        Parameter name (e.g. 'decisiontreeclassifier__max_depth') to a list of values or a
+        scipy.stats distribution.
+    X : pandas.DataFrame
+        The training features.
+    y : pandas.Series
+        The training labels.
+    strategy : str, optional
+        'random' (default) or 'halving'.
+    n_candidates : int, optional
+        Number of parameter sets drawn. Defaults to 20.
+    factor : int, optional
+        Halving factor between successive-halving rounds. Defaults to 3.
+    cv : int or cross-validation splitter, optional
+        The folds. Defaults to 5 (stratified for classifiers).
+    scoring : str, optional
+        Metric of SCORERS used to rank candidates. Every metric is cached. Defaults to 'accuracy'.
+    n_jobs : int, optional
+        Number of worker processes fitting (candidate, fold) pairs. Defaults to 1.
+    random_state : int, optional
+        Seed of the candidate draws and the halving subsamples. Defaults to 123.
+    cache : FoldScoreCache, optional
+        Cache of (parameters, fold) scores. Nothing is cached when None.
+    min_resources : int, optional
+        Smallest number of training rows in a halving round. Defaults to 30.
+
+    Returns:
+    -------
+    dict
+        The best parameters.
+    pandas.DataFrame
+        One row per (round, candidate): the parameters, the training rows per fold (the smallest
+        fold size in full rounds), the mean and standard deviation of every metric, the number of
+        folds read from the cache and the rank in the round.
+    """
+    if strategy not in SEARCH_STRATEGIES:
+        raise ValueError(f"Invalid search strategy. Choose one of {SEARCH_STRATEGIES}.")
+    if scoring not in SCORERS:
+        raise ValueError(f"Unknown scoring '{scoring}'. Choose from {list(SCORERS)}.")
+
+    metrics = list(SCORERS)
+    folds = list(check_cv(cv, y, classifier=is_classifier(estimator)).split(X, y))
+    shuffled = [np.random.default_rng(random_state + i).permutation(train) for i, (train, _) in enumerate(folds)]
+    n_max = min(len(train) for train, _ in folds)
+    data_hash = data_fingerprint(X, y)
+
+    candidates = [
+        {name: value.item() if isinstance(value, np.generic) else value for name, value in params.items()}
+        for params in ParameterSampler(param_distributions, n_candidates, random_state=random_state)
+    ]
+    resources = _halving_resources(len(candidates), n_max, factor, min_resources) if strategy == "halving" else [n_max]
+
+    rows = []
+    for round_index, n_train in enumerate(resources):
+        full = n_train >= n_max
+        estimators = [clone(estimator).set_params(**params) for params in candidates]
+        keys, tasks = {}, []
+        for c, candidate in enumerate(estimators):
+            for f, (train, test) in enumerate(folds):
+                train_rows = train if full else np.sort(shuffled[f][:n_train])
+                key = FoldScoreCache.key(candidate, data_hash, train_rows, test)
+                keys[c, f] = key
+                if cache is None or cache.get(key) is None:
+                    tasks.append(((c, f), key, (candidate, train_rows, test, metrics)))
+
+        results = run_in_pool(_score_fold, [task[2] for task in tasks], n_jobs, shared=(X, y))
+        fresh = dict(zip([task[0] for task in tasks], results))
+        if cache is not None:
+            for index, key, _ in tasks:
+                cache.put(key, fresh[index])
+            cache.save()
+
+        round_rows = []
+        for c, params in enumerate(candidates):
+            fold_scores = [fresh[c, f] if (c, f) in fresh else cache.get(keys[c, f]) for f in range(len(folds))]
+            row = {"round": round_index, "n_train": n_train, "params": params}
+            row.update({f"param_{name}": value for name, value in params.items()})
+            for name in metrics:
+                values = [scores[name] for scores in fold_scores]
+                row[f"mean_test_{name}"] = float(np.mean(values))
+                row[f"std_test_{name}"] = float(np.std(values))
+            row["cached_folds"] = sum((c, f) not in fresh for f in range(len(folds)))
+            round_rows.append(row)
+
+        ranked = pd.DataFrame(round_rows)
+        ranked["rank"] = ranked[f"mean_test_{scoring}"].rank(ascending=False, method="first").astype(int)
+        rows.append(ranked)
+        if round_index < len(resources) - 1:
+            n_keep = max(1, math.ceil(len(candidates) / factor))
+            order = ranked.sort_values("rank").index[:n_keep]
+            candidates = [candidates[i] for i in order]
+
+    results = pd.concat(rows, ignore_index=True)
+    last = results[results["round"] == results["round"].max()]
+    best_params = last.sort_values("rank").iloc[0]["params"]
+    return best_params, results
@@ -0,0 +1,75 @@
+import subprocess
+import sys
+
+# Import-time budget, in milliseconds, of `heart_disease.py <subcommand> --help`
+# ('' is the group itself). About twice the measured startup of each subcommand.
+STARTUP_BUDGETS_MS = {
+    "": 200,
+    "clean": 1000,
+    "validate": 200,
+    "split": 2000,
+    "fit": 2000,
+    "evaluate": 2000,
+    "predict": 1000,
+    "update": 1000
+}
+
+# Modules no subcommand may import at startup; they load in the code paths that use them
+LAZY_MODULES = ["deepchecks", "pandera", "matplotlib", "seaborn"]
+
+
+def parse_importtime(stderr):
+    """
+    Parses the report printed by ``python -X importtime``.
+
+    Parameters:
+    ----------
+    stderr : str
+        Standard error of the interpreter; lines that are not part of the report are ignored.
+
+    Returns:
+    -------
+    list of tuple
+        (module, self microseconds, cumulative microseconds, nesting depth) of every import,
+        in the order they finished.
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2][1:]
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        imports.append((name.strip(), int(fields[0]), int(fields[1]), depth))
+    return imports
+
+
+def measure_startup(argv, python=sys.executable, cwd=None):
+    """
+    Runs ``python -X importtime <argv>`` and returns its total import time and imported modules.
+
+    Returns:
+    -------
+    float
+        Total import time in milliseconds (the cumulative time of the top-level imports).
+    list of tuple
+        The imports, as returned by parse_importtime.
+    """
+    process = subprocess.run([python, "-X", "importtime", *argv], cwd=cwd, capture_output=True, text=True, check=True)
+    imports = parse_importtime(process.stderr)
+    return sum(cumulative for _, _, cumulative, depth in imports if depth == 0) / 1000, imports
+
+
+def startup_violations(subcommand, total_ms, imports, budgets=None, lazy_modules=None):
+    """Returns the messages of every budget overrun and eagerly imported lazy module of a subcommand."""
+    budgets = STARTUP_BUDGETS_MS if budgets is None else budgets
+    lazy_modules = LAZY_MODULES if lazy_modules is None else lazy_modules
+    label = subcommand or "(group)"
+    violations = []
+    if subcommand in budgets and total_ms > budgets[subcommand]:
+        violations.append(f"{label}: startup {total_ms:.0f} ms exceeds the budget of {budgets[subcommand]} ms")
+    loaded = {module.split(".")[0] for module, *_ in imports}
+    violations += [f"{label}: imports {module} at startup" for module in lazy_modules if module in loaded]
+    return violations
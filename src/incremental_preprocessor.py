@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+
+class IncrementalColumnTransformer:
+    """
+    Fits a ColumnTransformer of StandardScaler and OneHotEncoder columns on chunks of
+    rows, for training data that does not fit in memory.
+
+    Every chunk passed to partial_fit updates the scalers with StandardScaler.partial_fit
+    and adds to the count of every category of the one-hot columns. finalize() then fits
+    the ColumnTransformer on a small frame holding every category seen, and puts the
+    incrementally fitted scalers in place, so the result has the same fitted attributes as
+    the ColumnTransformer fitted on all the rows at once (scaler statistics up to float
+    rounding, and the same choice of sparse or dense output).
+
+    Parameters:
+    ----------
+    preprocessor : sklearn.compose.ColumnTransformer
+        The unfitted transformer. Its transformers must be StandardScaler, OneHotEncoder
+        (without infrequent categories or an explicit drop list), 'drop' or 'passthrough'.
+
+    Example
+    ------------
+    fitter = IncrementalColumnTransformer(preprocessor)
+    for chunk in pd.read_csv("X_train.csv", chunksize=100_000):
+        fitter.partial_fit(chunk)
+    preprocessor = fitter.finalize()
+    """
+
+    def __init__(self, preprocessor):
+        for _, transformer, _ in preprocessor.transformers:
+            if isinstance(transformer, OneHotEncoder):
+                if transformer.min_frequency is not None or transformer.max_categories is not None:
+                    raise ValueError("Infrequent categories are not supported.")
+                if transformer.drop not in (None, "first", "if_binary") or not isinstance(transformer.categories, str):
+                    raise ValueError("Only drop=None, 'first' or 'if_binary' with categories='auto' is supported.")
+            elif not isinstance(transformer, StandardScaler) and transformer not in ("drop", "passthrough"):
+                raise ValueError(f"Unsupported transformer: {transformer!r}.")
+        if preprocessor.remainder != "drop":
+            raise ValueError("Only remainder='drop' is supported.")
+        self.preprocessor = clone(preprocessor)
+        self.scalers = {name: clone(transformer) for name, transformer, _ in preprocessor.transformers
+                        if isinstance(transformer, StandardScaler)}
+        self.category_counts = {}
+        self.example = None
+        self.n_rows = 0
+
+    def partial_fit(self, X):
+        """Updates the statistics with a DataFrame chunk and returns self."""
+        if len(X) == 0:
+            return self
+        if self.example is None:
+            self.example = X.iloc[:1]
+        for name, transformer, columns in self.preprocessor.transformers:
+            if name in self.scalers:
+                self.scalers[name].partial_fit(X[columns])
+            elif isinstance(transformer, OneHotEncoder):
+                for col in columns:
+                    counts = X[col].value_counts(dropna=False)
+                    # categorical columns also count the categories that do not occur
+                    counts = counts[counts > 0]
+                    self.category_counts[col] = counts if col not in self.category_counts else \
+                        self.category_counts[col].add(counts, fill_value=0)
+        self.n_rows += len(X)
+        return self
+
+    def finalize(self):
+        """Returns the fitted ColumnTransformer."""
+        if self.example is None:
+            raise ValueError("No rows were passed to partial_fit.")
+        categorical = list(self.category_counts)
+        n_rows = max([len(self.category_counts[col]) for col in categorical] + [1])
+        frame = self.example.iloc[np.zeros(n_rows, dtype=int)].reset_index(drop=True)
+        for col in categorical:
+            # every category appears at least once, so the encoder finds all of them
+            values = np.resize(np.asarray(self.category_counts[col].index, dtype=object), n_rows)
+            frame[col] = pd.Series(values).astype(self.example[col].dtype)
+        preprocessor = self.preprocessor.fit(frame)
+
+        nnz = 0
+        for i, (name, transformer, columns) in enumerate(preprocessor.transformers_):
+            if name in self.scalers:
+                preprocessor.transformers_[i] = (name, self.scalers[name], columns)
+            if isinstance(transformer, OneHotEncoder) and transformer.sparse_output:
+                nnz += sum(self.n_rows - self._dropped_count(transformer, j, col) for j, col in enumerate(columns))
+            else:
+                # dense outputs count as fully non-zero
+                output = preprocessor.output_indices_[name]
+                nnz += self.n_rows * (output.stop - output.start)
+        # the rule ColumnTransformer.fit_transform applies to the transformed training data
+        any_sparse = any(isinstance(t, OneHotEncoder) and t.sparse_output for _, t, _ in preprocessor.transformers_)
+        n_outputs = len(preprocessor.get_feature_names_out())
+        preprocessor.sparse_output_ = bool(any_sparse and nnz / (self.n_rows * n_outputs) < preprocessor.sparse_threshold)
+        return preprocessor
+
+    def _dropped_count(self, encoder, index, col):
+        """Returns the number of rows of the category the encoder drops from column col (0 if none)."""
+        if encoder.drop_idx_ is None or encoder.drop_idx_[index] is None:
+            return 0
+        dropped = encoder.categories_[index][encoder.drop_idx_[index]]
+        counts = self.category_counts[col]
+        if pd.isna(dropped):
+            return int(counts[counts.index.isna()].sum())
+        return int(counts[dropped])
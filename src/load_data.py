@@ -1,8 +1,57 @@
+import json
+import os
+import numpy as np
 import pandas as pd
 
+def column_sidecar(data_path):
+    """Returns the path of the JSON file holding the column names of a .npy or .npz file."""
+    return f"{os.path.splitext(str(data_path))[0]}.columns.json"
+
+def read_table(data_path):
+    """
+    Reads a table, choosing the reader from the file extension.
+
+    '.npy' files are memory-mapped rather than parsed, with their column names read
+    from the '.columns.json' sidecar written by save_data. '.npz' sparse matrices are
+    returned as frames of sparse columns (see src/feature_frame.py), never densified.
+    '.parquet' and '.feather' files are read with pandas (requires pyarrow). Anything
+    else is read as CSV, with the compact dtypes of the validated columns it has
+    (see compact_dtypes in src/validate_data.py).
+
+    Parameters:
+    data_path (str): Path to the file.
+
+    Returns:
+    DataFrame: The loaded data.
+    """
+    data_path = str(data_path)
+    if data_path.endswith(".npy"):
+        values = np.load(data_path, mmap_mode="r")
+        with open(column_sidecar(data_path)) as f:
+            columns = json.load(f)
+        return pd.DataFrame(values.reshape(len(values), -1), columns=columns, copy=False)
+    if data_path.endswith(".npz"):
+        from scipy import sparse
+        from src.feature_frame import feature_frame
+
+        with open(column_sidecar(data_path)) as f:
+            columns = json.load(f)
+        return feature_frame(sparse.load_npz(data_path).tocsr(), columns)
+    if data_path.endswith(".parquet"):
+        return pd.read_parquet(data_path)
+    if data_path.endswith(".feather"):
+        return pd.read_feather(data_path)
+    from src.validate_data import compact_dtypes
+
+    return pd.read_csv(data_path, dtype=compact_dtypes())
+
 def load_data(x_data_path, y_data_path):
     """
     Loads data from CSV files with error handling.
+
+    The format of each file is detected from its extension (see read_table), so
+    '.npy' feature matrices written by split_n_preprocess.py are memory-mapped
+    instead of parsed.
     
     Parameters:
     x_data_path (str): Path to the features CSV file.
@@ -16,8 +65,8 @@ def load_data(x_data_path, y_data_path):
     FileNotFoundError: If either of the files are not found.
     """
     try:
-        X_data = pd.read_csv(x_data_path)
-        y_data = pd.read_csv(y_data_path).squeeze()
+        X_data = read_table(x_data_path)
+        y_data = read_table(y_data_path).squeeze()
     except FileNotFoundError as e:
         raise FileNotFoundError(f"File not found: {e}")
     return X_data, y_data
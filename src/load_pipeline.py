@@ -0,0 +1,10 @@
+import pickle
+
+def load_pipeline(pipeline_path):
+    """Loads a saved pipeline object from a Pickle file with error handling."""
+    try:
+        with open(pipeline_path, 'rb') as f:
+            pipeline = pickle.load(f)
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"Pipeline file not found: {e}")
+    return pipeline
@@ -0,0 +1,188 @@
+import asyncio
+import time
+from collections import deque
+import numpy as np
+import pandas as pd
+
+
+class LatencyTracker:
+    """
+    Keeps request counters and the latencies of the most recent requests.
+
+    Parameters:
+    ----------
+    window : int, optional
+        Number of most recent latencies kept for the percentiles. Defaults to 10,000.
+    """
+
+    def __init__(self, window=10_000):
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.records = 0
+        self.batches = 0
+        self.errors = 0
+        self.started = time.perf_counter()
+
+    def record(self, seconds, n_records):
+        """Records one served request and its latency in seconds."""
+        self.latencies.append(seconds)
+        self.requests += 1
+        self.records += n_records
+
+    def summary(self):
+        """
+        Returns the counters as a dict.
+
+        Latency percentiles are in milliseconds over the latency window,
+        throughput is averaged over the uptime.
+        """
+        uptime = time.perf_counter() - self.started
+        latencies = np.array(self.latencies) * 1000 if self.latencies else np.array([np.nan])
+        return {
+            "requests": self.requests,
+            "records": self.records,
+            "batches": self.batches,
+            "errors": self.errors,
+            "mean_batch_records": self.records / self.batches if self.batches else 0.0,
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p99_ms": float(np.percentile(latencies, 99)),
+            "uptime_s": uptime,
+            "requests_per_s": self.requests / uptime,
+            "records_per_s": self.records / uptime
+        }
+
+
+class MicroBatcher:
+    """
+    Groups concurrent scoring requests into micro-batches.
+
+    Requests wait at most ``max_wait`` seconds after the first request of a batch
+    arrives, or until ``max_batch_size`` records are queued, and are then scored
+    together in one call of ``score_fn`` on an executor thread, so the event loop
+    keeps accepting requests while a batch is scored. A single request larger than
+    ``max_batch_size`` is scored on its own. When scoring a batch fails, its requests
+    are scored again one at a time, so one bad request does not fail the others.
+
+    Parameters:
+    ----------
+    score_fn : callable
+        Function taking a DataFrame of records and returning a DataFrame with one
+        row of results per record, in the same order.
+    max_batch_size : int, optional
+        Maximum number of records per batch. Defaults to 256.
+    max_wait : float, optional
+        Maximum time in seconds a request waits for others to join its batch. Defaults to 0.002.
+    tracker : LatencyTracker, optional
+        Receives the batch count. A new tracker is created when None.
+    """
+
+    def __init__(self, score_fn, max_batch_size=256, max_wait=0.002, tracker=None):
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.tracker = tracker if tracker is not None else LatencyTracker()
+        self.queue = asyncio.Queue()
+        self.pending = None
+        self.worker = None
+
+    def start(self):
+        """Starts the batching worker on the running event loop."""
+        if self.worker is None:
+            self.worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Cancels the batching worker."""
+        if self.worker is not None:
+            self.worker.cancel()
+            try:
+                await self.worker
+            except asyncio.CancelledError:
+                pass
+            self.worker = None
+
+    async def submit(self, records):
+        """
+        Queues records for scoring and waits for their results.
+
+        Parameters:
+        ----------
+        records : pandas.DataFrame
+            The records of one request.
+
+        Returns:
+        -------
+        pandas.DataFrame
+            The results of the records, in order.
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((records, future))
+        return await future
+
+    async def _collect(self):
+        """Waits for a first request, then gathers more until the batch is full or max_wait passes."""
+        loop = asyncio.get_running_loop()
+        if self.pending is not None:
+            batch, self.pending = [self.pending], None
+        else:
+            batch = [await self.queue.get()]
+        n_records = len(batch[0][0])
+        deadline = loop.time() + self.max_wait
+
+        while n_records < self.max_batch_size:
+            if self.queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = self.queue.get_nowait()
+            if n_records + len(item[0]) > self.max_batch_size:
+                # the request starts the next batch
+                self.pending = item
+                break
+            batch.append(item)
+            n_records += len(item[0])
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            frames = [records for records, _ in batch]
+            try:
+                results = await loop.run_in_executor(None, self.score_fn, pd.concat(frames, ignore_index=True))
+            except Exception as e:
+                if len(batch) == 1:
+                    self._fail(batch[0][1], e)
+                else:
+                    await self._score_one_by_one(batch)
+                continue
+
+            self.tracker.batches += 1
+            start = 0
+            for records, future in batch:
+                if not future.done():
+                    future.set_result(results.iloc[start:start + len(records)].reset_index(drop=True))
+                start += len(records)
+
+    async def _score_one_by_one(self, batch):
+        """Scores the requests of a failed batch separately, so only the requests that fail get the error."""
+        loop = asyncio.get_running_loop()
+        for records, future in batch:
+            try:
+                results = await loop.run_in_executor(None, self.score_fn, records)
+            except Exception as e:
+                self._fail(future, e)
+                continue
+            self.tracker.batches += 1
+            if not future.done():
+                future.set_result(results.reset_index(drop=True))
+
+    def _fail(self, future, error):
+        self.tracker.errors += 1
+        if not future.done():
+            future.set_exception(error)
@@ -0,0 +1,43 @@
+import os
+import re
+
+def version_path(model_dir, model_name, version):
+    """
+    Returns the path of a version of a model.
+
+    Version 0 is the model written by fit_model.py, '<model_name>.pkl'; every incremental
+    update writes the next version, '<model_name>_v<version>.pkl', next to it.
+
+    Parameters:
+    ----------
+    model_dir : str
+        The directory holding the models.
+    model_name : str
+        The name of the model, such as 'sgd_logistic_regression'.
+    version : int
+        The version number.
+
+    Returns:
+    -------
+    str
+        The path of the Pickle file.
+    """
+    if version < 0:
+        raise ValueError("version must be a non-negative integer.")
+    file_name = f"{model_name}.pkl" if version == 0 else f"{model_name}_v{version}.pkl"
+    return os.path.join(model_dir, file_name)
+
+def model_versions(model_dir, model_name):
+    """Returns the sorted version numbers of a model found in model_dir."""
+    if not os.path.isdir(model_dir):
+        return []
+    pattern = re.compile(rf"{re.escape(model_name)}(?:_v([1-9][0-9]*))?\.pkl")
+    matches = [pattern.fullmatch(file_name) for file_name in os.listdir(model_dir)]
+    return sorted(int(match.group(1) or 0) for match in matches if match)
+
+def latest_version(model_dir, model_name):
+    """Returns the highest version number of a model, raising FileNotFoundError if there is none."""
+    versions = model_versions(model_dir, model_name)
+    if not versions:
+        raise FileNotFoundError(f"No version of '{model_name}' in {model_dir}; fit it with fit_model.py first.")
+    return versions[-1]
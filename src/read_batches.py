@@ -0,0 +1,38 @@
+import glob
+import os
+import pandas as pd
+
+def read_batches(data_path, batch_size, dtype=None):
+    """
+    Reads a CSV or Parquet dataset as a stream of DataFrames of at most batch_size rows.
+
+    Parameters:
+    ----------
+    data_path : str
+        Path to a CSV file, a Parquet file, or a directory of Parquet partitions
+        (such as the one written by clean_data.py). Parquet requires pyarrow.
+    batch_size : int
+        Maximum number of rows per batch.
+    dtype : dict, optional
+        Column name to dtype (such as src.validate_data.compact_dtypes()), applied to
+        the columns the dataset has.
+
+    Returns:
+    -------
+    generator
+        Yields one pandas.DataFrame per batch, so only one batch is held in memory.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer.")
+
+    data_path = str(data_path)
+    if os.path.isdir(data_path) or data_path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        parts = sorted(glob.glob(os.path.join(data_path, "*.parquet"))) if os.path.isdir(data_path) else [data_path]
+        for part in parts:
+            for batch in pq.ParquetFile(part).iter_batches(batch_size=batch_size):
+                df = batch.to_pandas()
+                yield df if dtype is None else df.astype({col: dtype[col] for col in df.columns if col in dtype})
+    else:
+        yield from pd.read_csv(data_path, chunksize=batch_size, dtype=dtype)
@@ -0,0 +1,202 @@
+import json
+import os
+import shutil
+import zipfile
+import numpy as np
+import pandas as pd
+
+from src.load_data import column_sidecar
+
+STORAGE_FORMATS = ["csv", "npy", "npz", "parquet", "feather"]
+
+def save_data(data, directory, name, storage="csv"):
+    """
+    Saves a DataFrame or Series in the chosen storage format.
+
+    Parameters:
+    ----------
+    data : pandas.DataFrame or pandas.Series
+        The data to save. 'npy' and 'npz' storage require every column to be numeric.
+    directory : str
+        The directory the file is written to.
+    name : str
+        The file name without extension.
+    storage : str, optional
+        One of 'csv' (default), 'npy', 'npz', 'parquet' or 'feather'. 'npy' writes the
+        values as one C-contiguous array that load_data memory-maps, with the column names
+        in a '.columns.json' sidecar. 'npz' writes them as a scipy CSR matrix (only the
+        non-zero values, e.g. of one-hot features; sparse columns are never densified)
+        with the same sidecar. 'parquet' and 'feather' require pyarrow.
+
+    Returns:
+    -------
+    str
+        Path to the saved file.
+
+    Example
+    ------------
+    save_data(X_train_enc, "data/processed", "X_train_transformed", storage="npy")
+    """
+    if storage not in STORAGE_FORMATS:
+        raise ValueError(f"Invalid storage format. Choose one of {STORAGE_FORMATS}.")
+
+    data = data.to_frame() if isinstance(data, pd.Series) else data
+    os.makedirs(directory, exist_ok=True)
+    data_path = os.path.join(directory, f"{name}.{storage}")
+
+    if storage == "csv":
+        data.to_csv(data_path, index=False)
+    elif storage == "npy":
+        np.save(data_path, np.ascontiguousarray(data.to_numpy()))
+        with open(column_sidecar(data_path), "w") as f:
+            json.dump([str(col) for col in data.columns], f)
+    elif storage == "npz":
+        from scipy import sparse
+        from src.feature_frame import to_csr
+
+        sparse.save_npz(data_path, to_csr(data), compressed=False)
+        with open(column_sidecar(data_path), "w") as f:
+            json.dump([str(col) for col in data.columns], f)
+    elif storage == "parquet":
+        data.reset_index(drop=True).to_parquet(data_path, index=False)
+    else:
+        data.reset_index(drop=True).to_feather(data_path)
+
+    return data_path
+
+class TableWriter:
+    """
+    Writes a table chunk by chunk in the chosen storage format, so it never has to be in
+    memory at once. The file read back equals save_data of the concatenated chunks.
+
+    Parameters:
+    ----------
+    directory : str
+        The directory the file is written to.
+    name : str
+        The file name without extension.
+    storage : str, optional
+        One of STORAGE_FORMATS, as in save_data. Defaults to 'csv'.
+    n_rows : int, optional
+        Total number of rows; required by 'npy' storage, whose array is allocated on the
+        first write and filled in place.
+
+    Example
+    ------------
+    with TableWriter("data/processed", "X_train_transformed", "npy", n_rows=len(X)) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    """
+
+    def __init__(self, directory, name, storage="csv", n_rows=None):
+        if storage not in STORAGE_FORMATS:
+            raise ValueError(f"Invalid storage format. Choose one of {STORAGE_FORMATS}.")
+        if storage == "npy" and n_rows is None:
+            raise ValueError("npy storage requires the total number of rows.")
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{name}.{storage}")
+        self.storage = storage
+        self.n_rows = n_rows
+        self.rows_written = 0
+        self._out = None
+
+    def write(self, data):
+        """Appends the rows of a DataFrame or Series."""
+        data = data.to_frame() if isinstance(data, pd.Series) else data
+        if self.storage == "csv":
+            data.to_csv(self.path, index=False, header=self.rows_written == 0, mode="w" if self.rows_written == 0 else "a")
+        elif self.storage == "npy":
+            if self._out is None:
+                self._out = np.lib.format.open_memmap(self.path, mode="w+", dtype=data.to_numpy().dtype,
+                                                      shape=(self.n_rows, data.shape[1]))
+                with open(column_sidecar(self.path), "w") as f:
+                    json.dump([str(col) for col in data.columns], f)
+            self._out[self.rows_written:self.rows_written + len(data)] = data.to_numpy()
+        elif self.storage == "npz":
+            self._write_csr(data)
+        else:
+            import pyarrow as pa
+
+            table = pa.Table.from_pandas(data.reset_index(drop=True), preserve_index=False)
+            if self._out is None:
+                if self.storage == "parquet":
+                    import pyarrow.parquet as pq
+
+                    self._out = pq.ParquetWriter(self.path, table.schema)
+                else:
+                    self._out = pa.ipc.new_file(self.path, table.schema)
+            self._out.write_table(table)
+        self.rows_written += len(data)
+
+    def _write_csr(self, data):
+        """Appends the CSR arrays of a chunk to one temporary file per array."""
+        from src.feature_frame import to_csr
+
+        values = to_csr(data)
+        if self._out is None:
+            self._out = {key: open(f"{self.path}.{key}.part", "wb") for key in ("data", "indices", "indptr")}
+            self._out["indptr"].write(np.zeros(1, dtype=np.int64).tobytes())
+            self.columns, self.nnz = [str(col) for col in data.columns], 0
+        self._out["data"].write(values.data.astype(np.float64).tobytes())
+        self._out["indices"].write(values.indices.astype(np.int32).tobytes())
+        self._out["indptr"].write((values.indptr[1:].astype(np.int64) + self.nnz).tobytes())
+        self.nnz += values.nnz
+
+    def _finish_npz(self):
+        """Assembles the temporary array files into the .npz archive scipy.sparse.load_npz reads."""
+        members = [("indices", np.int32, self.nnz), ("indptr", np.int64, self.rows_written + 1), ("data", np.float64, self.nnz)]
+        with zipfile.ZipFile(self.path, "w", allowZip64=True) as archive:
+            for key, dtype, length in members:
+                with archive.open(f"{key}.npy", "w", force_zip64=True) as member, open(f"{self.path}.{key}.part", "rb") as part:
+                    header = {"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)), "fortran_order": False, "shape": (length,)}
+                    np.lib.format.write_array_header_1_0(member, header)
+                    shutil.copyfileobj(part, member)
+            for key, value in [("format", np.array(b"csr")), ("shape", np.array([self.rows_written, len(self.columns)]))]:
+                with archive.open(f"{key}.npy", "w") as member:
+                    np.lib.format.write_array(member, value)
+        with open(column_sidecar(self.path), "w") as f:
+            json.dump(self.columns, f)
+
+    def close(self):
+        """Finishes the file and returns its path."""
+        if self.storage == "npy" and self.rows_written != self.n_rows:
+            self._release()
+            raise ValueError(f"Expected {self.n_rows} rows, {self.rows_written} were written.")
+        if self.storage == "csv" and self.rows_written == 0 and not os.path.exists(self.path):
+            open(self.path, "w").close()
+        if self.storage == "npz" and self._out is None:
+            raise ValueError("Nothing was written to the npz file.")
+        self._release()
+        if self.storage == "npz":
+            try:
+                self._finish_npz()
+            finally:
+                self._remove_parts()
+        return self.path
+
+    def _remove_parts(self):
+        for key in ("data", "indices", "indptr"):
+            if os.path.exists(f"{self.path}.{key}.part"):
+                os.remove(f"{self.path}.{key}.part")
+
+    def _release(self):
+        if self._out is not None:
+            if self.storage == "npy":
+                self._out.flush()
+            elif self.storage == "npz":
+                for part in self._out.values():
+                    part.close()
+            else:
+                self._out.close()
+        self._out = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._release()
+            if self.storage == "npz":
+                self._remove_parts()
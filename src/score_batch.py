@@ -0,0 +1,37 @@
+import pandas as pd
+
+from src.feature_frame import feature_frame
+
+# Columns of the DataFrame score_batch returns
+PREDICTION_COLUMNS = ["probability", "prediction"]
+
+def score_batch(preprocessor, pipeline, batch, feature_names=None):
+    """
+    Scores one batch of records in the cleaned-data schema.
+
+    Parameters:
+    ----------
+    preprocessor : ColumnTransformer
+        The fitted preprocessor.
+    pipeline : Pipeline
+        The fitted model pipeline.
+    batch : pandas.DataFrame
+        Records with the cleaned-data columns. A 'diagnosis' column is ignored.
+    feature_names : numpy.ndarray, optional
+        Names of the transformed features the model was fitted on. Looked up from
+        the preprocessor when None; pass them in when scoring many batches.
+
+    Returns:
+    -------
+    pandas.DataFrame
+        The probability of heart disease and the predicted class of each record.
+    """
+    if feature_names is None:
+        feature_names = preprocessor.get_feature_names_out()
+    X = feature_frame(preprocessor.transform(batch.drop(columns="diagnosis", errors="ignore")),
+                      feature_names, index=batch.index)
+    proba = pipeline.predict_proba(X)
+    return pd.DataFrame({
+        "probability": proba[:, list(pipeline.classes_).index(1)],
+        "prediction": pipeline.classes_[proba.argmax(axis=1)]
+    }, index=batch.index)
@@ -0,0 +1,283 @@
+import ast
+import glob
+import hashlib
+import json
+import os
+import shutil
+import time
+
+CHUNK_SIZE = 1 << 20
+# Options that only change how a stage runs, not what it writes
+EXECUTION_OPTIONS = ("--n-jobs",)
+
+
+def file_digest(path):
+    """Returns the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_files(script_path, root="."):
+    """
+    Returns a script and every module of the ``src`` package it imports, directly or through other src modules.
+
+    Both ``from src.module import ...`` and the bare ``from module import ...`` used by scripts that put
+    ``src`` on ``sys.path`` are followed.
+
+    Parameters:
+    ----------
+    script_path : str
+        Path of the stage's script.
+    root : str, optional
+        Directory holding the ``src`` package. Defaults to the working directory.
+
+    Returns:
+    -------
+    list of str
+        Sorted paths of the script and the src modules, relative to the working directory.
+    """
+    def module_path(module):
+        parts = module.split(".")
+        parts = parts[1:] if parts[0] == "src" else parts
+        path = os.path.join(root, "src", *parts) + ".py"
+        return path if parts and os.path.isfile(path) else None
+
+    found, pending = set(), [script_path]
+    while pending:
+        path = os.path.relpath(pending.pop())
+        if path in found or not os.path.isfile(path):
+            continue
+        found.add(path)
+        with open(path) as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                modules = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            elif isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            else:
+                continue
+            pending += [path for path in map(module_path, modules) if path is not None]
+    return sorted(found)
+
+
+def command_params(command, ignore=EXECUTION_OPTIONS):
+    """
+    Returns a stage's command line without its execution-only options, as the params of stage_key.
+
+    Both the ``--option=value`` and the ``--option value`` forms are dropped.
+
+    Parameters:
+    ----------
+    command : sequence of str
+        The stage's command line.
+    ignore : sequence of str, optional
+        Options to leave out. Defaults to EXECUTION_OPTIONS.
+
+    Returns:
+    -------
+    list of str
+        The remaining arguments, in order.
+    """
+    params, args = [], iter(command)
+    for arg in args:
+        option = arg.split("=", 1)[0]
+        if option not in ignore:
+            params.append(arg)
+        elif "=" not in arg:
+            next(args, None)
+    return params
+
+
+def stage_key(name, inputs=(), params=(), sources=(), digest=file_digest):
+    """
+    Returns the content address of a stage run.
+
+    Parameters:
+    ----------
+    name : str
+        Name of the stage.
+    inputs : sequence of str
+        Input files; their content is hashed, not their timestamps.
+    params : sequence
+        JSON-serializable parameters, e.g. the stage's command line.
+    sources : sequence of str
+        Source files of the stage's code.
+    digest : callable, optional
+        Function returning the digest of a file. Defaults to file_digest.
+
+    Returns:
+    -------
+    str
+        The SHA-256 hex digest of the stage name, input contents, parameters and source code.
+    """
+    description = {
+        "name": name,
+        "inputs": {path: digest(path) for path in sorted(inputs)},
+        "params": list(params),
+        "sources": {path: digest(path) for path in sorted(sources)}
+    }
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+
+class StageCache:
+    """
+    Local content-addressed artifact store for pipeline stages.
+
+    Output files are stored once under ``objects/`` by the hash of their content, and
+    every stage run under ``stages/<key>.json`` as a manifest of output path to object.
+    File digests are memoized by (size, modification time) in ``digests.json``, so
+    unchanged inputs are not re-read on every lookup.
+
+    Parameters:
+    ----------
+    store_dir : str, optional
+        Directory of the store. Defaults to '.stage_cache'.
+    """
+
+    def __init__(self, store_dir=".stage_cache"):
+        self.store_dir = store_dir
+        self.memo_path = os.path.join(store_dir, "digests.json")
+        self.memo = {}
+        if os.path.exists(self.memo_path):
+            with open(self.memo_path) as f:
+                self.memo = json.load(f)
+
+    def digest(self, path):
+        """Returns the digest of a file, reusing the memoized one if its size and mtime are unchanged."""
+        stat = os.stat(path)
+        signature = [stat.st_size, stat.st_mtime_ns]
+        entry = self.memo.get(os.path.abspath(path))
+        if entry is not None and entry[:2] == signature:
+            return entry[2]
+        value = file_digest(path)
+        self.memo[os.path.abspath(path)] = signature + [value]
+        return value
+
+    def save_memo(self):
+        os.makedirs(self.store_dir, exist_ok=True)
+        tmp_path = f"{self.memo_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.memo, f)
+        os.replace(tmp_path, self.memo_path)
+
+    def key(self, name, inputs=(), params=(), sources=()):
+        return stage_key(name, inputs, params, sources, digest=self.digest)
+
+    def _object_path(self, value):
+        return os.path.join(self.store_dir, "objects", value[:2], value)
+
+    def _manifest_path(self, key):
+        return os.path.join(self.store_dir, "stages", f"{key}.json")
+
+    def lookup(self, key):
+        """Returns the manifest of a stored stage run, or None if it is missing or incomplete."""
+        manifest_path = self._manifest_path(key)
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if not all(os.path.exists(self._object_path(value)) for value in manifest["outputs"].values()):
+            return None
+        return manifest
+
+    def restore(self, manifest):
+        """Copies the outputs of a stored stage run back to their paths, skipping files that are already identical."""
+        for path, value in manifest["outputs"].items():
+            if os.path.isfile(path) and self.digest(path) == value:
+                continue
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            shutil.copyfile(self._object_path(value), path)
+            self.memo[os.path.abspath(path)] = [os.path.getsize(path), os.stat(path).st_mtime_ns, value]
+
+    def store(self, key, name, outputs):
+        """Stores output files and the manifest of a stage run."""
+        manifest = {"name": name, "outputs": {}}
+        for path in outputs:
+            value = self.digest(path)
+            object_path = self._object_path(value)
+            if not os.path.exists(object_path):
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                tmp_path = f"{object_path}.{os.getpid()}.tmp"
+                shutil.copyfile(path, tmp_path)
+                os.replace(tmp_path, object_path)
+            manifest["outputs"][path] = value
+
+        manifest_path = self._manifest_path(key)
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+        return manifest
+
+
+def expand_outputs(patterns, since=None):
+    """
+    Expands output paths, directories and glob patterns into the list of output files.
+
+    Plain file paths must exist. Directories expand to every file below them. Glob patterns
+    expand to the matching files, keeping only the files modified at or after ``since``
+    (a time.time() value) when it is given, so leftovers of earlier runs are not stored.
+
+    Raises:
+    ------
+    FileNotFoundError
+        If a path or pattern matches no file.
+    """
+    files = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = [path for path in sorted(glob.glob(pattern, recursive=True)) if os.path.isfile(path)]
+            if since is not None:
+                matches = [path for path in matches if os.path.getmtime(path) >= since]
+        elif os.path.isdir(pattern):
+            matches = sorted(os.path.join(dirpath, filename)
+                             for dirpath, _, filenames in os.walk(pattern) for filename in filenames)
+        else:
+            matches = [pattern] if os.path.isfile(pattern) else []
+        if not matches:
+            raise FileNotFoundError(f"Stage output '{pattern}' was not produced.")
+        files += matches
+    return list(dict.fromkeys(files))
+
+
+def run_stage(name, run, inputs=(), outputs=(), params=(), sources=(), cache=None):
+    """
+    Runs a stage unless a run with the same inputs, parameters and code is stored, then restores its outputs.
+
+    Parameters:
+    ----------
+    name : str
+        Name of the stage.
+    run : callable
+        Runs the stage and writes its outputs. Called without arguments on a cache miss.
+    inputs, params, sources :
+        As in stage_key.
+    outputs : sequence of str
+        Output files, directories or glob patterns (see expand_outputs).
+    cache : StageCache, optional
+        The artifact store. Defaults to StageCache().
+
+    Returns:
+    -------
+    bool
+        True if the outputs were restored from the store, False if the stage ran.
+    """
+    cache = cache if cache is not None else StageCache()
+    key = cache.key(name, inputs, params, sources)
+    manifest = cache.lookup(key)
+    if manifest is not None:
+        cache.restore(manifest)
+        cache.save_memo()
+        return True
+
+    # file modification times can be coarser than time.time(), so allow one second of slack
+    started = time.time() - 1
+    run()
+    cache.store(key, name, expand_outputs(outputs, since=started))
+    cache.save_memo()
+    return False
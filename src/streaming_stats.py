@@ -0,0 +1,329 @@
+import os
+import numpy as np
+import pandas as pd
+
+from src.cross_validate_folds import run_in_pool
+
+
+def _cover(axes, max_bins):
+    """
+    Returns the smallest (level, start, n_bins) axis holding every bin of the given axes.
+
+    Bin ``i`` of an axis with level ``l`` covers ``[i * 2**l, (i + 1) * 2**l)``, so an axis
+    is coarsened by raising its level, which halves the bin indices.
+    """
+    level = max(axis[0] for axis in axes)
+    while True:
+        low = min(start >> (level - axis_level) for axis_level, start, _ in axes)
+        high = max((start + n - 1) >> (level - axis_level) for axis_level, start, n in axes)
+        if high - low + 1 <= max_bins:
+            return level, low, high - low + 1
+        level += 1
+
+
+def _rebin(counts, dim, old, new):
+    """Moves the counts along dimension dim from axis old onto the (wider or coarser) axis new."""
+    old_level, old_start, old_n = old
+    new_level, new_start, new_n = new
+    if old == new:
+        return counts
+    index = ((old_start + np.arange(old_n)) >> (new_level - old_level)) - new_start
+    moved = np.moveaxis(counts, dim, 0)
+    out = np.zeros((new_n,) + moved.shape[1:], dtype=counts.dtype)
+    np.add.at(out, index, moved)
+    return np.moveaxis(out, 0, dim)
+
+
+def _chunk_moments(values):
+    """Returns the count, mean and co-moment matrix of the complete rows of a 2-D array."""
+    values = values[np.isfinite(values).all(axis=1)]
+    if len(values) == 0:
+        return 0, np.zeros(values.shape[1]), np.zeros((values.shape[1], values.shape[1]))
+    mean = values.mean(axis=0)
+    centered = values - mean
+    return len(values), mean, centered.T @ centered
+
+
+def _merge_moments(a, b):
+    """Merges two (count, mean, co-moment) triples (Chan et al.'s pairwise update)."""
+    n_a, mean_a, comoment_a = a
+    n_b, mean_b, comoment_b = b
+    if n_a == 0:
+        return b
+    if n_b == 0:
+        return a
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    return n, mean_a + delta * (n_b / n), comoment_a + comoment_b + np.outer(delta, delta) * (n_a * n_b / n)
+
+
+class StreamingStats:
+    """
+    One-pass, mergeable sufficient statistics of the EDA figures.
+
+    Chunks of rows are folded in with update(), and the statistics of different chunks or
+    worker processes are combined with merge(). Kept per chunk and merged exactly are:
+    the row count of every class, the mean and co-moment matrix of the numeric columns
+    (merged with Chan et al.'s stable pairwise formulas, giving the correlation matrix),
+    per-class 1-D histograms and 2-D histograms of the histogram columns, and per class
+    the rows with the smallest random keys, from which a stratified sample is drawn.
+
+    Histogram bins have power-of-two widths and are aligned on multiples of their width,
+    so no range has to be known in advance: when the data outgrows ``max_bins`` bins, the
+    width doubles and pairs of neighbouring bins are added together. Any two histograms
+    can thereby be brought onto a common axis and added.
+
+    Parameters:
+    ----------
+    label : str
+        Column of the classes.
+    hist_columns : list of str
+        Numeric columns to histogram.
+    max_bins : int, optional
+        Maximum number of bins per column. Defaults to 64.
+    sample_size : int, optional
+        Largest stratified sample that can be drawn. Defaults to 0 (no sample).
+    random_state : int or sequence, optional
+        Seed of the sample keys. Defaults to 123.
+    """
+
+    def __init__(self, label, hist_columns, max_bins=64, sample_size=0, random_state=123):
+        self.label = label
+        self.hist_columns = list(hist_columns)
+        self.max_bins = max_bins
+        self.sample_size = sample_size
+        self.rng = np.random.default_rng(random_state)
+        self.moment_columns = None
+        self.moments = None
+        self.class_counts = {}
+        self.axes = {}
+        self.hist1d = {col: {} for col in self.hist_columns}
+        self.hist2d = {}
+        self.samples = {}
+
+    def _set_axis(self, col, axis):
+        """Rebins every histogram of col onto a new axis."""
+        old = self.axes.get(col)
+        self.axes[col] = axis
+        if old is None:
+            return
+        for label, counts in self.hist1d[col].items():
+            self.hist1d[col][label] = _rebin(counts, 0, old, axis)
+        for (first, second), counts in self.hist2d.items():
+            if first == col:
+                self.hist2d[first, second] = _rebin(counts, 0, old, axis)
+            elif second == col:
+                self.hist2d[first, second] = _rebin(counts, 1, old, axis)
+
+    def _pairs(self):
+        return [(first, second) for i, first in enumerate(self.hist_columns) for second in self.hist_columns[i + 1:]]
+
+    def update(self, chunk):
+        """Folds a DataFrame chunk (with the label column) into the statistics and returns self."""
+        if self.moment_columns is None:
+            self.moment_columns = list(chunk.select_dtypes(include=["number"]).columns)
+            size = len(self.moment_columns)
+            self.moments = (0, np.zeros(size), np.zeros((size, size)))
+        self.moments = _merge_moments(self.moments, _chunk_moments(chunk[self.moment_columns].to_numpy(dtype=np.float64)))
+
+        class_codes, labels = pd.factorize(chunk[self.label], sort=True)
+        for code, label in enumerate(labels):
+            self.class_counts[label] = self.class_counts.get(label, 0) + int(np.count_nonzero(class_codes == code))
+
+        # grow or coarsen every axis to the chunk's values, then bin them
+        codes = {}
+        for col in self.hist_columns:
+            values = chunk[col].to_numpy(dtype=np.float64)
+            finite = values[np.isfinite(values)]
+            if len(finite):
+                low, high = finite.min(), finite.max()
+                level = self.axes[col][0] if col in self.axes else int(np.ceil(np.log2(max(high - low, 1e-12) / self.max_bins)))
+                chunk_axis = (level, int(np.floor(low / 2.0 ** level)), int(np.floor(high / 2.0 ** level) - np.floor(low / 2.0 ** level)) + 1)
+                self._set_axis(col, _cover([chunk_axis] + ([self.axes[col]] if col in self.axes else []), self.max_bins))
+            if col not in self.axes:
+                continue
+            level, start, n_bins = self.axes[col]
+            with np.errstate(invalid="ignore"):
+                col_codes = np.floor(values / 2.0 ** level) - start
+            col_codes[~np.isfinite(col_codes)] = n_bins
+            codes[col] = col_codes.astype(np.int64)
+
+        n_classes = len(labels)
+        class_codes = np.where(class_codes < 0, n_classes, class_codes)
+        for col, col_codes in codes.items():
+            n_bins = self.axes[col][2]
+            counts = np.bincount(class_codes * (n_bins + 1) + col_codes, minlength=(n_classes + 1) * (n_bins + 1))
+            counts = counts.reshape(n_classes + 1, n_bins + 1)[:n_classes, :n_bins]
+            for code, label in enumerate(labels):
+                self.hist1d[col][label] = self.hist1d[col].get(label, 0) + counts[code]
+
+        for first, second in self._pairs():
+            if first not in codes or second not in codes:
+                continue
+            n_first, n_second = self.axes[first][2], self.axes[second][2]
+            counts = np.bincount(codes[first] * (n_second + 1) + codes[second], minlength=(n_first + 1) * (n_second + 1))
+            counts = counts.reshape(n_first + 1, n_second + 1)[:n_first, :n_second]
+            self.hist2d[first, second] = self.hist2d.get((first, second), 0) + counts
+
+        if self.sample_size:
+            rows = chunk[self.hist_columns + [self.label]].assign(_key=self.rng.random(len(chunk)))
+            for code, label in enumerate(labels):
+                self._keep_sample(label, rows[class_codes == code])
+        return self
+
+    def _keep_sample(self, label, rows):
+        """Keeps the sample_size rows of a class with the smallest keys."""
+        if label in self.samples:
+            rows = pd.concat([self.samples[label], rows])
+        if len(rows) > self.sample_size:
+            rows = rows.iloc[np.argpartition(rows["_key"].to_numpy(), self.sample_size)[:self.sample_size]]
+        self.samples[label] = rows
+
+    def merge(self, other):
+        """Adds the statistics of another StreamingStats (over different rows) to these and returns self."""
+        if other.moment_columns is None:
+            return self
+        if self.moment_columns is None:
+            self.moment_columns, self.moments = other.moment_columns, other.moments
+        else:
+            self.moments = _merge_moments(self.moments, other.moments)
+        for label, count in other.class_counts.items():
+            self.class_counts[label] = self.class_counts.get(label, 0) + count
+
+        for col in self.hist_columns:
+            if col not in other.axes:
+                continue
+            axis = _cover([other.axes[col]] + ([self.axes[col]] if col in self.axes else []), self.max_bins)
+            self._set_axis(col, axis)
+            for label, counts in other.hist1d[col].items():
+                self.hist1d[col][label] = self.hist1d[col].get(label, 0) + _rebin(counts, 0, other.axes[col], axis)
+        for (first, second), counts in other.hist2d.items():
+            counts = _rebin(_rebin(counts, 0, other.axes[first], self.axes[first]), 1, other.axes[second], self.axes[second])
+            self.hist2d[first, second] = self.hist2d.get((first, second), 0) + counts
+
+        for label, rows in other.samples.items():
+            self._keep_sample(label, rows)
+        return self
+
+    @property
+    def n_rows(self):
+        return sum(self.class_counts.values())
+
+    def correlation(self):
+        """Returns the Pearson correlation matrix of the numeric columns over their complete rows."""
+        _, _, comoment = self.moments
+        scale = np.sqrt(np.diag(comoment))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = comoment / np.outer(scale, scale)
+        np.fill_diagonal(corr, np.where(scale > 0, 1.0, np.nan))
+        return pd.DataFrame(corr, index=self.moment_columns, columns=self.moment_columns)
+
+    def summary(self):
+        """
+        Returns the class counts and histograms in the format of
+        src.eda_aggregates.histogram_summary: 'columns', 'classes', 'class_counts',
+        'edges', 'hist1d' and 'hist2d'.
+        """
+        classes = np.array(sorted(self.class_counts))
+        columns = [col for col in self.hist_columns if col in self.axes]
+        edges, hist1d = {}, {}
+        for col in columns:
+            level, start, n_bins = self.axes[col]
+            edges[col] = (start + np.arange(n_bins + 1)) * 2.0 ** level
+            hist1d[col] = np.array([self.hist1d[col].get(label, np.zeros(n_bins, dtype=np.int64)) for label in classes])
+        return {
+            "columns": columns,
+            "classes": classes,
+            "class_counts": pd.Series([self.class_counts[label] for label in classes], index=classes),
+            "edges": edges,
+            "hist1d": hist1d,
+            "hist2d": {pair: counts for pair, counts in self.hist2d.items() if pair[0] in edges and pair[1] in edges}
+        }
+
+    def sample(self, n_samples=None):
+        """Returns a stratified sample of about n_samples rows (at most sample_size), proportional to the class sizes."""
+        n_samples = self.sample_size if n_samples is None else min(n_samples, self.sample_size)
+        if not n_samples or not self.samples:
+            return None
+        parts = []
+        for label, rows in self.samples.items():
+            n_class = round(self.class_counts[label] * n_samples / self.n_rows)
+            parts.append(rows.nsmallest(n_class, "_key"))
+        return pd.concat(parts).drop(columns="_key").reset_index(drop=True)
+
+
+def row_offset(path, row):
+    """
+    Returns the byte offset in a CSV file of the start of a data row (0 is the first row
+    after the header), by counting newlines; the file size if the row is past the end.
+    """
+    needed, seen, position = row + 1, 0, 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            count = block.count(b"\n")
+            if seen + count >= needed:
+                index = -1
+                for _ in range(needed - seen):
+                    index = block.find(b"\n", index + 1)
+                return position + index + 1
+            seen += count
+            position += len(block)
+    return position
+
+
+def _accumulate_rows(x_path, y_path, start, stop, chunksize, stats_kwargs, dtype=None):
+    """Accumulates rows [start, stop) of the feature and target files into a StreamingStats."""
+    stats = StreamingStats(**stats_kwargs)
+    if stop <= start:
+        return stats
+    x_columns = pd.read_csv(x_path, nrows=0).columns
+    y_columns = pd.read_csv(y_path, nrows=0).columns
+    with open(x_path, "rb") as x_file, open(y_path, "rb") as y_file:
+        x_file.seek(row_offset(x_path, start))
+        y_file.seek(row_offset(y_path, start))
+        x_chunks = pd.read_csv(x_file, header=None, names=x_columns, nrows=stop - start, chunksize=chunksize,
+                               dtype=dtype)
+        y_chunks = pd.read_csv(y_file, header=None, names=y_columns, nrows=stop - start, chunksize=chunksize,
+                               dtype=dtype)
+        for x_chunk, y_chunk in zip(x_chunks, y_chunks):
+            stats.update(pd.concat([x_chunk.reset_index(drop=True), y_chunk[stats.label].reset_index(drop=True)], axis=1))
+    return stats
+
+
+def count_rows(path):
+    """Returns the number of data rows of a CSV file without a trailing blank line."""
+    newlines, last = 0, b"\n"
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            newlines += block.count(b"\n")
+            last = block[-1:]
+    return newlines - 1 + (last != b"\n")
+
+
+def accumulate_csv(x_path, y_path, label, hist_columns, chunksize=100_000, n_jobs=1, max_bins=64, sample_size=0,
+                   random_state=123, dtype=None):
+    """
+    Computes StreamingStats over a features CSV and its row-aligned target CSV in one pass.
+
+    The rows are split into one contiguous range per process. Each process seeks to its
+    range and reads it ``chunksize`` rows at a time, and the per-process statistics are
+    merged, so no process ever holds more than one chunk of the data. ``dtype`` is
+    passed to pandas.read_csv for both files.
+
+    Returns:
+    -------
+    StreamingStats
+        The merged statistics.
+    """
+    n_rows = count_rows(y_path)
+    n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+    n_parts = max(1, min(n_jobs, n_rows))
+    bounds = np.linspace(0, n_rows, n_parts + 1).astype(int)
+    kwargs = {"label": label, "hist_columns": hist_columns, "max_bins": max_bins, "sample_size": sample_size}
+    tasks = [(x_path, y_path, bounds[i], bounds[i + 1], chunksize, dict(kwargs, random_state=[random_state, i]), dtype)
+             for i in range(n_parts)]
+    parts = run_in_pool(_accumulate_rows, tasks, n_jobs)
+    stats = parts[0]
+    for part in parts[1:]:
+        stats.merge(part)
+    return stats
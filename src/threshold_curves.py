@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+
+def threshold_sweep(y_true, scores, positive=1):
+    """
+    Returns the confusion counts and rates of every distinct threshold on the scores.
+
+    The scores are sorted once, in decreasing order. Predicting every row with a score at or
+    above a threshold as positive, the true and false positives of all thresholds are the
+    cumulative sums of the sorted labels at the last row of each distinct score, so the
+    sweep takes O(n log n) for n rows and never rescores. The first row is the threshold
+    above every score (no positive predictions), so the curves start at the origin.
+
+    Parameters:
+    ----------
+    y_true : array-like
+        The true labels.
+    scores : array-like
+        The scores of the positive class, such as predict_proba(X)[:, 1].
+    positive : optional
+        The positive label. Defaults to 1.
+
+    Returns:
+    -------
+    pandas.DataFrame
+        One row per threshold, in decreasing order: threshold, tp, fp, fn, tn, tpr
+        (sensitivity, recall), fpr, specificity and precision (1 where nothing is
+        predicted positive, as in sklearn's precision_recall_curve).
+    """
+    actual = np.asarray(y_true) == positive
+    scores = np.asarray(scores, dtype=np.float64)
+    if len(scores) != len(actual):
+        raise ValueError("y_true and scores must have the same length.")
+    if len(scores) == 0:
+        raise ValueError("No scores to sweep.")
+
+    order = np.argsort(-scores, kind="stable")
+    sorted_scores, sorted_actual = scores[order], actual[order]
+    # the last row of every run of equal scores
+    last = np.r_[np.flatnonzero(np.diff(sorted_scores)), len(sorted_scores) - 1]
+    tp = np.r_[0, np.cumsum(sorted_actual)[last]]
+    fp = np.r_[0, last + 1 - tp[1:]]
+    n_positive, n_negative = int(actual.sum()), int(len(actual) - actual.sum())
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tpr = tp / n_positive if n_positive else np.zeros(len(tp))
+        fpr = fp / n_negative if n_negative else np.zeros(len(fp))
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 1.0)
+    return pd.DataFrame({
+        "threshold": np.r_[np.inf, sorted_scores[last]],
+        "tp": tp,
+        "fp": fp,
+        "fn": n_positive - tp,
+        "tn": n_negative - fp,
+        "tpr": tpr,
+        "fpr": fpr,
+        "specificity": 1 - fpr,
+        "precision": precision
+    })
+
+
+def roc_auc(sweep):
+    """Returns the area under the ROC curve of a threshold sweep (trapezoidal, as sklearn's roc_auc_score)."""
+    fpr, tpr = sweep["fpr"].to_numpy(), sweep["tpr"].to_numpy()
+    return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+
+
+def average_precision(sweep):
+    """Returns the average precision of a threshold sweep: the precision weighted by the increase in recall, as sklearn's average_precision_score."""
+    recall, precision = sweep["tpr"].to_numpy(), sweep["precision"].to_numpy()
+    return float(np.sum(np.diff(recall) * precision[1:]))
+
+
+def operating_point(sweep, sensitivity):
+    """
+    Returns the row of the highest threshold reaching a sensitivity (true positive rate).
+
+    As the thresholds decrease, sensitivity only grows and specificity only shrinks, so the
+    highest threshold with the sensitivity has the best specificity among those that reach it.
+    """
+    if not 0 <= sensitivity <= 1:
+        raise ValueError("sensitivity must be between 0 and 1.")
+    return sweep.iloc[int(np.argmax(sweep["tpr"].to_numpy() >= sensitivity))]
+
+
+def curve_points(sweep, max_points=1000):
+    """
+    Returns at most max_points rows of a sweep, evenly spaced and including the first and last,
+    to save and draw the curves of millions of scores. The areas are computed on the full sweep.
+    """
+    if len(sweep) <= max_points:
+        return sweep
+    return sweep.iloc[np.unique(np.linspace(0, len(sweep) - 1, max_points).round().astype(int))]
@@ -0,0 +1,39 @@
+from src.feature_frame import feature_frame
+
+def update_batch(preprocessor, pipeline, batch, feature_names=None):
+    """
+    Updates a fitted model with one batch of labeled records in the cleaned-data schema.
+
+    The batch is transformed by the fitted preprocessor, which is not refitted, and passed
+    to the partial_fit of the last step of the pipeline, so the cost of an update depends
+    on the size of the batch only.
+
+    Parameters:
+    ----------
+    preprocessor : ColumnTransformer
+        The fitted preprocessor.
+    pipeline : Pipeline
+        The fitted model pipeline. Its last step must support partial_fit (such as the
+        SGDClassifier of the 'sgd_logistic_regression' model of fit_model.py).
+    batch : pandas.DataFrame
+        Records with the cleaned-data columns and their 'diagnosis' labels. The labels
+        must be among the classes the model was fitted on.
+    feature_names : numpy.ndarray, optional
+        Names of the transformed features the model was fitted on. Looked up from
+        the preprocessor when None; pass them in when updating with many batches.
+
+    Returns:
+    -------
+    Pipeline
+        The pipeline, updated in place.
+    """
+    estimator = pipeline.steps[-1][1]
+    if not hasattr(estimator, "partial_fit"):
+        raise ValueError(f"{type(estimator).__name__} cannot be updated incrementally: it has no partial_fit.")
+    if feature_names is None:
+        feature_names = preprocessor.get_feature_names_out()
+    X = feature_frame(preprocessor.transform(batch.drop(columns="diagnosis")), feature_names, index=batch.index)
+    if len(pipeline) > 1:
+        X = pipeline[:-1].transform(X)
+    estimator.partial_fit(X, batch["diagnosis"])
+    return pipeline
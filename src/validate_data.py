@@ -2,12 +2,127 @@
 # author: Yeji Sohn
 # date: 2024-12-06
 
+import os
+import time
 import pandas as pd
 import numpy as np
-import pandera as pa
-from pandera import Column, Check, DataFrameSchema
-from deepchecks.tabular import Dataset
-from deepchecks.tabular.checks import FeatureLabelCorrelation, FeatureFeatureCorrelation, PredictionDrift
+from src.correlation_checks import check_correlations
+
+# pandera and deepchecks take seconds to import, so they are imported where they are used:
+# pandera when a check fails, deepchecks only by the 'deepchecks' correlation engine.
+
+# Column definitions of the cleaned dataset. Every column is required and may not contain
+# missing values. 'between' and 'isin' restrict the values, 'integral' requires whole numbers
+# (in float columns, which can hold missing values), 'max_null_fraction' caps the share of
+# missing values and 'balanced' is the tolerance passed to check_proportions. The dtypes the
+# data is read with are derived from these definitions by compact_dtypes.
+CLEANED_COLUMNS = {
+    "age": {"dtype": "int", "between": (0, 120)},
+    "sex": {"dtype": "int", "isin": [0, 1]},
+    "chest_pain_type": {"dtype": "str", "isin": ["typical angina", "atypical angina",
+                                                 "non-anginal pain", "asymptomatic"]},
+    "resting_blood_pressure": {"dtype": "int", "between": (70, 200)},
+    "cholesterol": {"dtype": "int", "between": (100, 600)},
+    "fasting_blood_sugar": {"dtype": "int", "isin": [0, 1]},
+    "rest_ecg": {"dtype": "str", "isin": ["normal", "ST-T wave abnormality",
+                                          "left ventricular hypertrophy"]},
+    "max_heart_rate": {"dtype": "int", "between": (60, 220)},
+    "exercise_induced_angina": {"dtype": "str", "isin": ["no", "yes"]},
+    "st_depression": {"dtype": "float"},
+    "slope": {"dtype": "str", "isin": ["upsloping", "flat", "downsloping"]},
+    "num_of_vessels": {"dtype": "float", "between": (0, 4), "integral": True, "max_null_fraction": 0.05},
+    "thalassemia": {"dtype": "str", "isin": ["normal", "fixed defect", "reversable defect"],
+                    "max_null_fraction": 0.05},
+    "diagnosis": {"dtype": "int", "isin": [0, 1], "balanced": 0.1}
+}
+
+# Native associations estimated from fewer rows than this reach the 0.9 correlation
+# thresholds by chance, so smaller frames get the deepchecks feature-label (PPS) check
+# instead, and their feature pairs are reported without failing (see validate_dataframe).
+MIN_CORRELATION_ROWS = 30
+
+DTYPE_CHECKS = {
+    "int": pd.api.types.is_integer_dtype,
+    "float": pd.api.types.is_float_dtype,
+    "str": lambda dtype: pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+}
+
+# Narrowest integer dtypes tried for bounded integer columns, smallest first
+COMPACT_INT_DTYPES = ["int8", "int16", "int32"]
+
+def compact_dtypes(columns=CLEANED_COLUMNS, trusted=True):
+    """
+    Returns the dtypes to read the cleaned data (or the splits of it) with, derived from the
+    column definitions.
+
+    Text columns become categoricals; with 'isin' their categories are the allowed levels,
+    so every chunk and split of the data shares one dtype. Integer columns get the smallest
+    of COMPACT_INT_DTYPES holding their 'between' or 'isin' range, and 'integral' float
+    columns with a 'between' range float32, which holds whole numbers up to 2**24 exactly.
+    Other numeric columns keep 64 bits: float32 would round measurements such as
+    st_depression and change the fitted models.
+
+    Narrowed integers wrap around and values outside the 'isin' levels are read as missing,
+    so this is only safe for data that passed validation. With trusted=False (for the
+    validator itself or new records to score) every value is kept: only the text columns
+    become categoricals, with the categories found in the data.
+
+    Parameters:
+        columns (dict): Column definitions, defaults to CLEANED_COLUMNS.
+        trusted (bool): Whether the data passed validation.
+
+    Returns:
+        dict: Column name to dtype, for pandas.read_csv(dtype=...) or DataFrame.astype.
+              pandas.read_csv ignores the columns a file does not have.
+    """
+    dtypes = {}
+    for name, spec in columns.items():
+        if spec["dtype"] == "str":
+            dtypes[name] = pd.CategoricalDtype(sorted(spec["isin"])) if trusted and "isin" in spec else "category"
+            continue
+        if not trusted:
+            continue
+        bounds = spec.get("between", (min(spec["isin"]), max(spec["isin"])) if "isin" in spec else None)
+        if spec["dtype"] == "int":
+            fits = [dtype for dtype in COMPACT_INT_DTYPES
+                    if bounds is not None and np.iinfo(dtype).min <= bounds[0] and bounds[1] <= np.iinfo(dtype).max]
+            dtypes[name] = fits[0] if fits else "int64"
+        elif spec["dtype"] == "float":
+            exact = spec.get("integral") and bounds is not None and max(abs(bound) for bound in bounds) <= 2 ** 24
+            dtypes[name] = "float32" if exact else "float64"
+    return dtypes
+
+def check_record_schema(df, columns=CLEANED_COLUMNS, label="diagnosis"):
+    """
+    Checks that records to score have every feature column of the cleaned data, with
+    values of the right kind, before they are scored together with other records.
+
+    Numeric columns must hold numbers (or only missing values), text columns text or
+    missing values. Values are not range-checked; the preprocessor ignores unknown levels.
+
+    Parameters:
+        df (DataFrame): The records, e.g. of one request to the scoring server.
+        columns (dict): Column definitions, defaults to CLEANED_COLUMNS.
+        label (str): The label column, which is not required.
+
+    Raises:
+        ValueError: Naming the missing columns and the columns of the wrong kind.
+    """
+    missing = [name for name in columns if name != label and name not in df.columns]
+    wrong = []
+    for name, spec in columns.items():
+        if name == label or name not in df.columns or df[name].isna().all():
+            continue
+        values = df[name]
+        if spec["dtype"] == "str":
+            valid = values.dropna().map(lambda value: isinstance(value, str)).all()
+        else:
+            valid = pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
+        if not valid:
+            wrong.append(f"'{name}' ({'text' if spec['dtype'] == 'str' else 'number'} expected)")
+    if missing or wrong:
+        problems = ([f"missing columns {missing}"] if missing else []) + ([f"wrong types in {', '.join(wrong)}"] if wrong else [])
+        raise ValueError("; ".join(problems) + ".")
 
 def check_proportions(series, tolerance=0.1):
     """
@@ -33,226 +148,232 @@ def check_proportions(series, tolerance=0.1):
     # Check if the proportions of 0 and 1 are within the acceptable tolerance of 0.5
     return np.abs(proportions.get(0, 0) - 0.5) <= tolerance and np.abs(proportions.get(1, 0) - 0.5) <= tolerance
 
-def validate_csv_schema(file_path):
+def _values_dtype(series):
+    """Returns the dtype of the values of a series, looking through categorical columns."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.categories.dtype
+    return series.dtype
+
+def build_validation_plan(columns=CLEANED_COLUMNS):
     """
-    Validate CSV schema.
+    Builds one merged validation plan from the column definitions.
+
+    Each rule is a tuple of (check name, column, function, error message). Column rules
+    receive the column as a Series, frame rules (column None) receive the DataFrame. Every
+    function is vectorized and returns the number of failing values, so 0 means passed.
 
     Parameters:
-        file_path (str): Path to the CSV file.
+        columns (dict): Column definitions, defaults to CLEANED_COLUMNS.
 
-    Raises:
-        ValueError: If the file cannot be read.
-        Exeption: If data is not cleaned.
+    Returns:
+        list: The rules of the plan.
+    """
+    plan = [
+        ("no_empty_rows", None, lambda df: int(df.isna().all(axis=1).sum()),
+         "Empty rows found."),
+        ("no_duplicates", None, lambda df: int(df.duplicated().sum()),
+         "Duplicate rows found.")
+    ]
+
+    for name, spec in columns.items():
+        dtype = spec["dtype"]
+        plan.append(("dtype", name, lambda s, dtype=dtype: int(not DTYPE_CHECKS[dtype](_values_dtype(s))),
+                     f"Column '{name}' is not of type {dtype}."))
+        plan.append(("not_null", name, lambda s: int(s.isna().sum()),
+                     f"Column '{name}' contains missing values."))
+
+        if "max_null_fraction" in spec:
+            plan.append(("max_null_fraction", name,
+                         lambda s, limit=spec["max_null_fraction"]: int(s.isna().mean() > limit),
+                         f"Too many null values in '{name}' column."))
+        if "between" in spec:
+            plan.append(("between", name,
+                         lambda s, bounds=spec["between"]: int((s.notna() & ~s.between(*bounds)).sum()),
+                         f"Column '{name}' has values outside {spec['between']}."))
+        if spec.get("integral"):
+            plan.append(("integral", name,
+                         lambda s: int((s.notna() & (s != np.floor(s))).sum()),
+                         f"Column '{name}' has values that are not whole numbers."))
+        if "isin" in spec:
+            plan.append(("isin", name,
+                         lambda s, levels=spec["isin"]: int((s.notna() & ~s.isin(levels)).sum()),
+                         f"Column '{name}' has values outside {spec['isin']}."))
+        if "balanced" in spec:
+            plan.append(("balanced", name,
+                         lambda s, tolerance=spec["balanced"]: int(not check_proportions(s, tolerance)),
+                         "Class proportions are not balanced."))
+
+    return plan
+
+def run_validation_plan(df, plan=None):
     """
+    Evaluates every rule of a validation plan on a DataFrame and collects all failures.
 
-    try:
-        df = pd.read_csv(file_path)
-    except Exception as e:
-        raise FileNotFoundError(f"❌ Error reading the CSV file: {e}")
-        raise e
-    
-    # 3. Check for empty observations
-    empty_obs_schema = pa.DataFrameSchema(
-        checks=[
-            Check(lambda df: ~(df.isna().all(axis=1)).any(), error="Empty rows found.")
-        ]
-    )
+    Rules on a missing column fail without being run, and a rule that raises (e.g. a range
+    check on a text column) counts as failed rather than stopping the run.
 
-    try:
-        empty_obs_schema.validate(df)
-        print("Validation passed: No empty observations found.")
-    except pa.errors.SchemaError as e:
-        print(f"Validation failed: {e}")
-        raise e
+    Parameters:
+        df (DataFrame): The data to validate.
+        plan (list, optional): Rules from build_validation_plan. Defaults to the plan for CLEANED_COLUMNS.
 
-    # 4. Missingness not beyond expected threshold
-    missingness_threshold_schema = pa.DataFrameSchema(
-        {
-            # a. Numeric columns with no missing values allowed
-            "age": pa.Column(int, pa.Check.between(0, 120), nullable=False),
-            "sex": pa.Column(int, pa.Check.isin([0, 1]), nullable=False),
-
-            # b. Numeric columns with missing values allowed up to 5%
-            "st_depression": Column(
-                float,
-
-                nullable=True
-            ),
-            "num_of_vessels": Column(
-                float,
-                checks=[
-                    Check(lambda s: np.isnan(s) | ((s >= 0) & (s <= 4)), element_wise=True),
-                    Check(lambda s: s.isnull().sum() / len(s) <= 0.05, element_wise=False,
-                        error="Too many null values in 'num_of_vessels' column.")
-                ],
-                nullable=True
-            ),
-
-            # c. Categorical column with missing values allowed up to 5%
-            "thalassemia": Column(
-                str,
-                checks=[
-                    Check.isin(["normal", "fixed defect", "reversable defect"]),
-                    Check(lambda s: s.isna().mean() <= 0.05, element_wise=False,
-                        error="Too many null values in 'thalassemia' column."),
-                ],
-                nullable=True
-            )
-        }
-    )
+    Returns:
+        DataFrame: One row per rule with the check name, column, number of failures,
+                   whether it passed, the time taken in seconds and the error message.
+    """
+    if plan is None:
+        plan = build_validation_plan()
+
+    records = []
+    for check, column, func, error in plan:
+        start = time.perf_counter()
+        if column is not None and column not in df.columns:
+            failures, error = 1, f"Column '{column}' not in dataframe."
+        else:
+            try:
+                failures = func(df if column is None else df[column])
+            except Exception as e:
+                failures, error = 1, f"{error} ({e})"
+        records.append({
+            "check": check,
+            "column": column,
+            "failures": failures,
+            "passed": failures == 0,
+            "seconds": time.perf_counter() - start,
+            "error": error
+        })
+
+    return pd.DataFrame(records)
+
+def validate_csv_schema(file_path, correlation_engine="native", n_samples=None, min_rows=MIN_CORRELATION_ROWS):
+    """
+    Validate CSV schema.
 
-    try:
-        missingness_threshold_schema.validate(df)
-        print("Validation passed: No missingness beyond expected threshold.")
-    except pa.errors.SchemaError as e:
-        print(f"Validation failed: {e}")
-        raise e
+    Reads the file and validates it with validate_dataframe.
 
-    # 2 & 5. Check for correct column names and correct data types in each column
-    column_type_schema = pa.DataFrameSchema(
-        {
-            "age": pa.Column(pa.Int),
-            "sex": pa.Column(pa.Int),
-            "chest_pain_type": pa.Column(pa.String),
-            "resting_blood_pressure": pa.Column(pa.Int),
-            "cholesterol": pa.Column(pa.Int),
-            "fasting_blood_sugar": pa.Column(pa.Int),
-            "rest_ecg": pa.Column(pa.String),
-            "max_heart_rate": pa.Column(pa.Int),
-            "exercise_induced_angina": pa.Column(pa.String),
-            "st_depression": pa.Column(pa.Float),
-            "slope": pa.Column(pa.String),
-            "num_of_vessels": pa.Column(pa.Float),
-            "thalassemia": pa.Column(pa.String),
-            "diagnosis": pa.Column(pa.Int)
-        }
-    )
+    Parameters:
+        file_path (str): Path to the CSV file, or to a Parquet file or directory of
+                         Parquet partitions written by clean_data.py.
+        correlation_engine (str, optional): 'native' (default) or 'deepchecks'.
+        n_samples (int, optional): Size of the stratified sample used by the correlation checks.
+        min_rows (int, optional): Fewest rows the native correlation checks run on.
 
-    try:
-        column_type_schema.validate(df)
-        print("Validation passed: All columns have correct data types.")
-    except pa.errors.SchemaError as e:
-        print(f"Validation failed: {e}")
-        raise e
+    Returns:
+        DataFrame: The per-check report from validate_dataframe.
 
-    # 6. No duplicate observations
-    duplicate_schema = pa.DataFrameSchema(
-        checks=[
-            Check(lambda df: ~df.duplicated().any(), error="Duplicate rows found.")
-        ]
-    )
+    Raises:
+        ValueError: If the file cannot be read.
+        SchemaError: If data is not cleaned, listing every failed check.
+        ValueError: If a correlation exceeds the 0.9 threshold.
+    """
 
     try:
-        duplicate_schema.validate(df)
-        print("Validation passed: No duplicates found.")
-    except pa.errors.SchemaError as e:
-        print(f"Validation failed: {e}")
+        if os.path.isdir(file_path) or str(file_path).endswith(".parquet"):
+            df = pd.read_parquet(file_path)
+        else:
+            df = pd.read_csv(file_path, dtype=compact_dtypes(trusted=False))
+    except Exception as e:
+        raise FileNotFoundError(f"❌ Error reading the CSV file: {e}")
         raise e
 
-    # 7. No Outlier or Anamalous Values
-    numerical_schema = pa.DataFrameSchema(
-        {
-            "age": Column(int, Check.between(0, 120), nullable=True),
-            "resting_blood_pressure": Column(int, Check.between(70, 200), nullable=True),
-            "cholesterol": Column(int, Check.between(100, 600), nullable=True),
-            "max_heart_rate": Column(int, Check.between(60, 220), nullable=True),
-            "fasting_blood_sugar": pa.Column(int, pa.Check.isin([0, 1]), nullable=False)  
-        }
-    )
+    return validate_dataframe(df, correlation_engine, n_samples, min_rows)
 
-    try:
-        numerical_schema.validate(df)
-        print("Validation passed: No outliers found.")
-    except pa.errors.SchemaError as e:
-        print(f"Validation failed: {e}")
-        raise e
+def validate_dataframe(df, correlation_engine="native", n_samples=None, min_rows=MIN_CORRELATION_ROWS):
+    """
+    Validate a cleaned DataFrame.
 
-    # 8: Correct Category Levels
-    map_categorical_schema = pa.DataFrameSchema(
-        {
-            "chest_pain_type": Column(
-                str, Check.isin(["typical angina", "atypical angina",
-                                "non-anginal pain", "asymptomatic"])
-            ),
-            "fasting_blood_sugar": Column(
-                int, Check.isin([0, 1])
-            ),
-            "rest_ecg": Column(
-                str, Check.isin(["normal", "ST-T wave abnormality",
-                                "left ventricular hypertrophy"])
-            ),
-            "exercise_induced_angina": Column(
-                str, Check.isin(["no", "yes"])
-            ),
-            "slope": Column(
-                str, Check.isin(["upsloping", "flat", "downsloping"])
-            ),
-            "thalassemia": Column(
-                str, Check.isin(["normal", "fixed defect", "reversable defect"])
-            ),
-            "diagnosis": Column(
-                int, Check.isin([0, 1])
-            )
-        }
-    )
+    All rules from CLEANED_COLUMNS are evaluated in a single pass over the data and every
+    failure is collected before raising, along with how long each check took.
 
-    try:
-        map_categorical_schema.validate(df)
-        print("Validation passed: All categorical mappings are correct.")
-    except pa.errors.SchemaError as e:
-        print(f"Validation failed: {e}")
-        raise e
+    Correlations are checked with the vectorized association matrices of
+    correlation_checks.py by default. The deepchecks FeatureLabelCorrelation (PPS) and
+    FeatureFeatureCorrelation checks are kept as the slower 'deepchecks' engine.
 
-    # 9. Check Target/Response Variable Data Distribution
-    proportion_check_schema = pa.DataFrameSchema(
-        {
-            "diagnosis": Column(
-                int,
-                Check(lambda s: check_proportions(s),
-                    error="Class proportions are not balanced.")
-            )
-        }
-    )
+    Parameters:
+        df (DataFrame): The cleaned data, as read from disk or straight from clean_data.clean_chunk.
+        correlation_engine (str, optional): 'native' (default) or 'deepchecks'.
+        n_samples (int, optional): Size of the stratified sample used by the correlation
+                                   checks. Uses every row (native) or the deepchecks
+                                   defaults when None.
+        min_rows (int, optional): Fewest rows the native correlation checks are enforced
+                                  on. Smaller frames get the deepchecks feature-label
+                                  (PPS) check instead, and the feature pairs above the
+                                  threshold are printed without failing. Defaults to
+                                  MIN_CORRELATION_ROWS; 0 always enforces the native checks.
 
-    try:
-        proportion_check_schema.validate(df)
-        print("Validation passed: Class proportions are as expected.")
-    except pa.errors.SchemaError as e:
-        print(f"Validation failed: {e}")
-        raise e
+    Returns:
+        DataFrame: The per-check report from run_validation_plan.
 
-    # 10. Deep check anomalous correlations between target/response variable and features/explanatory variables
-    deepchecks_dataset = Dataset(
-        df,
-        label="diagnosis",
-        cat_features=[]
-    )
+    Raises:
+        SchemaError: If data is not cleaned, listing every failed check.
+        ValueError: If a correlation exceeds the 0.9 threshold.
+    """
 
-    check_feat_lab_corr = FeatureLabelCorrelation()
+    # 2-9. Column names, data types, missingness, duplicates, outliers, category levels
+    # and target distribution, evaluated as one plan
+    report = run_validation_plan(df)
+    print(report.drop(columns="error").to_string(index=False))
+
+    failed = report[~report["passed"]]
+    if not failed.empty:
+        message = "\n".join(f"{row.check} ({row.column}): {row.error}" for row in failed.itertuples())
+        print(f"Validation failed: {len(failed)} of {len(report)} checks\n{message}")
+        import pandera as pa
+        raise pa.errors.SchemaError(None, df, message)
+
+    print(f"Validation passed: all {len(report)} checks in {report['seconds'].sum():.4f}s.")
+
+    # 10 & 11. Check anomalous correlations between the target/response variable and
+    # features/explanatory variables, and between features/explanatory variables
+    if correlation_engine not in ("native", "deepchecks"):
+        raise ValueError("Invalid correlation engine. Choose 'native' or 'deepchecks'.")
+
+    if correlation_engine == "native" and len(df) < min_rows:
+        feature_label_passed = deepchecks_feature_label_passed(df, n_samples)
+        pair_failures = check_correlations(df, label="diagnosis", threshold=0.9)["pair_failures"]
+        if pair_failures:
+            print(f"Feature pairs above 0.9 on {len(df)} rows (fewer than {min_rows}, not enforced): {pair_failures}")
+        feature_feature_passed = True
+    elif correlation_engine == "native":
+        correlations = check_correlations(df, label="diagnosis", threshold=0.9, n_samples=n_samples)
+        feature_label_passed = not correlations["label_failures"]
+        feature_feature_passed = not correlations["pair_failures"]
+    else:
+        from deepchecks.tabular import Dataset
+        from deepchecks.tabular.checks import FeatureFeatureCorrelation
+
+        deepchecks_dataset = Dataset(
+            df,
+            label="diagnosis",
+            cat_features=[]
+        )
+        sample_kwargs = {} if n_samples is None else {"n_samples": n_samples}
 
-    check_feat_lab_corr = (check_feat_lab_corr
-                        .add_condition_feature_pps_less_than(0.9))
+        feature_label_passed = deepchecks_feature_label_passed(df, n_samples)
 
-    result = check_feat_lab_corr.run(dataset=deepchecks_dataset)
+        check_feat_feat_corr = (FeatureFeatureCorrelation(**sample_kwargs)
+                                .add_condition_max_number_of_pairs_above_threshold(0.9))
+        feature_feature_passed = check_feat_feat_corr.run(dataset=deepchecks_dataset).passed_conditions()
 
-    if not result.passed_conditions():
+    if not feature_label_passed:
         raise ValueError(
             "Feature-Label correlation exceeds the acceptable threshold."
         )
 
-    # 11. Deep check anomalous correlations between features/explanatory variables
-
-    deepchecks_dataset = Dataset(
-        df,
-        label="diagnosis",
-        cat_features=[]
-    )
-
-    check_feat_feat_corr = FeatureFeatureCorrelation(threshold=0.9)
-    result = check_feat_feat_corr.run(dataset=deepchecks_dataset)
-
-    if not result.passed_conditions():
+    if not feature_feature_passed:
         raise ValueError(
             "Anomalous correlations between features found."
             "Some feature correlations exceed the acceptable threshold."
-        )
\ No newline at end of file
+        )
+
+    return report
+
+def deepchecks_feature_label_passed(df, n_samples=None):
+    """Returns whether every feature predicts the diagnosis with a deepchecks PPS below 0.9."""
+    from deepchecks.tabular import Dataset
+    from deepchecks.tabular.checks import FeatureLabelCorrelation
+
+    sample_kwargs = {} if n_samples is None else {"n_samples": n_samples}
+    check_feat_lab_corr = (FeatureLabelCorrelation(**sample_kwargs)
+                           .add_condition_feature_pps_less_than(0.9))
+    dataset = Dataset(df, label="diagnosis", cat_features=[])
+    return check_feat_lab_corr.run(dataset=dataset).passed_conditions()
\ No newline at end of file
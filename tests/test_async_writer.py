@@ -0,0 +1,40 @@
+import os
+import sys
+import threading
+import pytest
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.async_writer import AsyncWriter
+
+
+def test_writes_are_persisted_after_wait(tmp_path):
+    df = pd.DataFrame({"a": [1, 2, 3]})
+    writer = AsyncWriter()
+    writer.submit("a.csv", df.to_csv, tmp_path / "a.csv", index=False)
+    writer.submit("b.csv", df.to_csv, tmp_path / "b.csv", index=False)
+    writer.wait()
+    assert pd.read_csv(tmp_path / "a.csv").equals(df)
+    assert pd.read_csv(tmp_path / "b.csv").equals(df)
+    assert writer.pending == []
+    writer.close()
+
+
+def test_writes_run_off_the_calling_thread(tmp_path):
+    threads = []
+    with AsyncWriter() as writer:
+        writer.submit("thread", lambda: threads.append(threading.current_thread().name))
+    assert threads[0].startswith("artifact-writer")
+
+
+def test_failed_write_is_reported_after_the_others_finish(tmp_path):
+    def fail():
+        raise OSError("disk full")
+
+    writer = AsyncWriter(max_workers=1)
+    writer.submit("broken.csv", fail)
+    writer.submit("ok.txt", (tmp_path / "ok.txt").write_text, "ok")
+    with pytest.raises(Exception, match="broken.csv: disk full"):
+        writer.wait()
+    assert (tmp_path / "ok.txt").read_text() == "ok"
+    writer.close()
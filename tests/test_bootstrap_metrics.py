@@ -0,0 +1,54 @@
+import os
+import sys
+import numpy as np
+import pytest
+from sklearn.metrics import classification_report
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.bootstrap_metrics import bootstrap_confidence_intervals, metrics_from_counts, outcome_codes, _resample_counts
+
+rng = np.random.default_rng(0)
+y_true = rng.integers(0, 2, 90)
+y_pred = np.where(rng.random(90) < 0.8, y_true, 1 - y_true)
+
+def test_estimates_match_the_classification_report():
+    """Test that the estimates are the metrics of the positive class on all rows."""
+    ci = bootstrap_confidence_intervals(y_true, y_pred, n_resamples=200)
+    report = classification_report(y_true, y_pred, output_dict=True)
+    assert ci.loc["accuracy", "estimate"] == pytest.approx(report["accuracy"])
+    for metric, column in [("precision", "precision"), ("recall", "recall"), ("f1", "f1-score")]:
+        assert ci.loc[metric, "estimate"] == pytest.approx(report["1"][column])
+    assert (ci["lower"] <= ci["estimate"]).all() and (ci["estimate"] <= ci["upper"]).all()
+
+def test_resample_counts_match_a_loop_over_the_index_matrix():
+    """Test that the batched counts equal the metrics of every resample computed one at a time."""
+    codes = outcome_codes(y_true, y_pred)
+    counts = _resample_counts(codes, 50, np.random.SeedSequence(1))
+    index = np.random.default_rng(np.random.SeedSequence(1)).integers(0, len(codes), size=(50, len(codes)))
+    for row, resample in zip(counts, index):
+        report = classification_report(y_true[resample], y_pred[resample], output_dict=True, zero_division=0)
+        metrics = metrics_from_counts(row)
+        assert metrics["accuracy"] == pytest.approx(report["accuracy"])
+        assert metrics["f1"] == pytest.approx(report["1"]["f1-score"])
+
+def test_intervals_do_not_depend_on_the_processes():
+    """Test that the intervals depend on the seed and chunks, not on n_jobs."""
+    serial = bootstrap_confidence_intervals(y_true, y_pred, n_resamples=1000, chunk_size=300)
+    parallel = bootstrap_confidence_intervals(y_true, y_pred, n_resamples=1000, chunk_size=300, n_jobs=2)
+    assert serial.equals(parallel)
+    assert not serial.equals(bootstrap_confidence_intervals(y_true, y_pred, n_resamples=1000, chunk_size=300, random_state=1))
+
+def test_undefined_ratios_are_zero():
+    """Test that a resample without positive predictions gets a precision and F1 of 0."""
+    metrics = metrics_from_counts(np.array([[5, 0, 3, 0], [2, 1, 1, 2]]))
+    np.testing.assert_allclose(metrics["precision"], [0, 2 / 3])
+    np.testing.assert_allclose(metrics["f1"], [0, 2 / 3])
+
+def test_invalid_arguments():
+    """Test that invalid resample counts and confidence levels raise a ValueError."""
+    with pytest.raises(ValueError):
+        bootstrap_confidence_intervals(y_true, y_pred, n_resamples=0)
+    with pytest.raises(ValueError):
+        bootstrap_confidence_intervals(y_true, y_pred, confidence=1.5)
+    with pytest.raises(ValueError):
+        bootstrap_confidence_intervals([], [])
@@ -0,0 +1,54 @@
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.categorical_codec import encode_column, apply_codecs, CATEGORY_CODECS
+
+RAW_SAMPLE = pd.DataFrame({
+    "chest_pain_type": [1, 2, 3, 4],
+    "fasting_blood_sugar": [1, 0, 0, 1],
+    "rest_ecg": [0, 1, 2, 0],
+    "exercise_induced_angina": [0, 1, 1, 0],
+    "slope": [1, 2, 3, 1],
+    "thalassemia": [3.0, 6.0, 7.0, np.nan],
+    "diagnosis": [0, 1, 2, 4],
+    "age": [63, 67, 37, 41]
+})
+
+def test_apply_codecs_labels():
+    """Test that every codec column is relabelled to the expected labels."""
+    df = apply_codecs(RAW_SAMPLE.copy())
+    assert df["chest_pain_type"].tolist() == ["typical angina", "atypical angina", "non-anginal pain", "asymptomatic"]
+    assert df["rest_ecg"].tolist() == ["normal", "ST-T wave abnormality", "left ventricular hypertrophy", "normal"]
+    assert df["exercise_induced_angina"].tolist() == ["no", "yes", "yes", "no"]
+    assert df["slope"].tolist() == ["upsloping", "flat", "downsloping", "upsloping"]
+    assert df["diagnosis"].tolist() == [0, 1, 1, 1]
+    assert df["fasting_blood_sugar"].tolist() == [1, 0, 0, 1]
+
+def test_apply_codecs_category_dtype():
+    """Test that codec columns are categorical and other columns are untouched."""
+    df = apply_codecs(RAW_SAMPLE.copy())
+    for column in CATEGORY_CODECS:
+        assert isinstance(df[column].dtype, pd.CategoricalDtype)
+    assert df["age"].dtype == np.int64
+
+def test_encode_column_missing_and_unknown():
+    """Test that missing values stay missing and codes without a label keep their raw value."""
+    encoded = encode_column(pd.Series([3.0, np.nan, 5.0, 5.0]), CATEGORY_CODECS["thalassemia"])
+    assert encoded[0] == "normal"
+    assert pd.isna(encoded[1])
+    assert encoded[2:].tolist() == [5.0, 5.0]
+    assert list(encoded.cat.categories) == ["normal", "fixed defect", "reversable defect", 5.0]
+
+    encoded = encode_column(pd.Series(["yes", "maybe"]), CATEGORY_CODECS["fasting_blood_sugar"])
+    assert encoded.tolist() == [1, "maybe"]
+
+def test_encode_column_string_codes():
+    """Test that string codes are looked up as well as numeric ones."""
+    encoded = encode_column(pd.Series(["yes", "no", "yes"]), CATEGORY_CODECS["fasting_blood_sugar"])
+    assert encoded.tolist() == [1, 0, 1]
+
+# pytest tests/test_categorical_codec.py
@@ -0,0 +1,46 @@
+import os
+import sys
+import pandas as pd
+import pandera as pa
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+from clean_data import clean_data, clean_chunk
+from src.validate_data import validate_csv_schema
+
+RAW_DATA = os.path.join(os.path.dirname(__file__), '..', 'data', 'raw', 'raw_heart_disease_data.csv')
+
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    # the first 100 rows include one with a missing value
+    path = tmp_path / "raw.csv"
+    pd.read_csv(RAW_DATA).head(100).to_csv(path, index=False)
+    return path
+
+
+def test_chunked_csv_equals_in_memory_csv(raw_csv, tmp_path):
+    in_memory = clean_data(raw_csv, tmp_path / "memory")
+    chunked = clean_data(raw_csv, tmp_path / "chunked", chunksize=7)
+    assert open(chunked).read() == open(in_memory).read()
+    assert len(pd.read_csv(chunked)) == 99
+
+
+def test_parquet_partitions_equal_in_memory_output(raw_csv, tmp_path):
+    pytest.importorskip("pyarrow")
+    expected = clean_chunk(pd.read_csv(raw_csv)).reset_index(drop=True)
+    parquet = pd.read_parquet(clean_data(raw_csv, tmp_path / "parquet", chunksize=7, output_format="parquet"))
+    # pyarrow reads categoricals of integer codes (fasting_blood_sugar, diagnosis) back as integers
+    pd.testing.assert_frame_equal(parquet, expected, check_dtype=False, check_categorical=False)
+
+
+def test_unknown_codes_are_kept_for_validation_to_reject(raw_csv, tmp_path):
+    raw = pd.read_csv(raw_csv)
+    raw.loc[3, "cp"] = 9
+    raw.to_csv(raw_csv, index=False)
+
+    cleaned = clean_data(raw_csv, tmp_path / "cleaned", chunksize=7)
+    assert len(pd.read_csv(cleaned)) == 99
+    with pytest.raises(pa.errors.SchemaError, match="chest_pain_type"):
+        validate_csv_schema(cleaned)
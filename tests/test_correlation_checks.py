@@ -0,0 +1,61 @@
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.correlation_checks import stratified_sample, association_matrix, cramers_v, check_correlations
+
+rng = np.random.default_rng(123)
+SAMPLE_DF = pd.DataFrame({
+    "age": rng.integers(30, 80, size=200),
+    "cholesterol": rng.integers(150, 400, size=200),
+    "st_depression": rng.normal(1, 1, size=200).round(1),
+    "slope": rng.choice(["upsloping", "flat", "downsloping"], size=200),
+    "diagnosis": rng.integers(0, 2, size=200)
+})
+
+def test_association_matrix_matches_spearman():
+    """Test that numeric pairs match pandas' Spearman correlation."""
+    numeric = ["age", "cholesterol", "st_depression"]
+    matrix = association_matrix(SAMPLE_DF[numeric])
+    expected = SAMPLE_DF[numeric].corr(method="spearman")
+    np.testing.assert_allclose(matrix.loc[numeric, numeric].to_numpy(), expected.to_numpy())
+
+def test_association_matrix_symmetric():
+    """Test that the matrix is symmetric with ones on the diagonal."""
+    matrix = association_matrix(SAMPLE_DF, categorical=["slope", "diagnosis"])
+    np.testing.assert_allclose(matrix.to_numpy(), matrix.to_numpy().T)
+    np.testing.assert_allclose(np.diag(matrix.to_numpy()), 1.0)
+
+def test_cramers_v_perfect_and_independent():
+    """Test that identical columns are fully associated and a constant column is not."""
+    codes = np.array([0, 1, 2, 0, 1, 2])
+    assert cramers_v(codes, 3, codes, 3) == pytest.approx(1.0)
+    assert cramers_v(codes, 3, np.zeros(6, dtype=int), 1) == 0.0
+
+def test_stratified_sample_keeps_proportions():
+    """Test that the sample keeps the class proportions of the label."""
+    df = pd.DataFrame({"x": range(1000), "diagnosis": [0] * 800 + [1] * 200})
+    sample = stratified_sample(df, "diagnosis", n_samples=100)
+    assert len(sample) == 100
+    assert (sample["diagnosis"] == 1).sum() == 20
+    assert stratified_sample(df, "diagnosis", n_samples=2000) is df
+
+def test_check_correlations_flags_leaks():
+    """Test that a copy of the label and a duplicated feature are reported."""
+    df = SAMPLE_DF.copy()
+    df["leak"] = df["diagnosis"] * 10
+    df["age_copy"] = df["age"] + 1
+    result = check_correlations(df, label="diagnosis")
+    assert result["label_failures"] == ["leak"]
+    assert result["pair_failures"] == [("age", "age_copy")]
+
+def test_check_correlations_passes():
+    """Test that unrelated features pass the checks."""
+    result = check_correlations(SAMPLE_DF, label="diagnosis")
+    assert result["label_failures"] == []
+    assert result["pair_failures"] == []
+
+# pytest tests/test_correlation_checks.py
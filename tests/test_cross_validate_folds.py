@@ -0,0 +1,92 @@
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.model_selection import cross_validate, cross_val_predict
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.cross_validate_folds import cross_validate_folds, cross_validate_models, run_in_pool
+
+rng = np.random.default_rng(0)
+X = pd.DataFrame(rng.normal(size=(120, 4)), columns=["a", "b", "c", "d"])
+y = pd.Series((X["a"] + rng.normal(scale=1.0, size=120) > 0).astype(int), name="diagnosis")
+scoring = ["accuracy", "precision", "recall", "f1"]
+
+@pytest.mark.parametrize("estimator", [DecisionTreeClassifier(random_state=123), LogisticRegression()])
+def test_cross_validate_folds_matches_sklearn(estimator):
+    """Test that scores match cross_validate and predictions match cross_val_predict."""
+    pipeline = make_pipeline(estimator)
+    result = cross_validate_folds(pipeline, X, y, cv=5, scoring=scoring)
+    expected = pd.DataFrame(cross_validate(pipeline, X, y, scoring=scoring, cv=5, return_train_score=True))
+
+    assert list(result["scores"].columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(result["scores"].drop(columns=["fit_time", "score_time"]),
+                                  expected.drop(columns=["fit_time", "score_time"]))
+    np.testing.assert_array_equal(result["oof_predictions"], cross_val_predict(pipeline, X, y, cv=5))
+    np.testing.assert_allclose(result["oof_proba"], cross_val_predict(pipeline, X, y, cv=5, method="predict_proba"))
+
+def test_cross_validate_folds_refits_on_all_data():
+    """Test that the refitted estimator equals a fit on the full data and fold estimators are kept."""
+    pipeline = make_pipeline(DecisionTreeClassifier(random_state=123))
+    result = cross_validate_folds(pipeline, X, y, cv=3)
+    full = make_pipeline(DecisionTreeClassifier(random_state=123)).fit(X, y)
+
+    assert len(result["estimators"]) == len(result["folds"]) == 3
+    np.testing.assert_array_equal(result["estimator"].predict_proba(X), full.predict_proba(X))
+    assert cross_validate_folds(pipeline, X, y, cv=3, refit=False)["estimator"] is None
+
+def test_cross_validate_folds_process_pool_matches_serial():
+    """Test that fitting the folds on worker processes gives the same results."""
+    pipeline = make_pipeline(LogisticRegression())
+    serial = cross_validate_folds(pipeline, X, y, cv=5, scoring=scoring)
+    parallel = cross_validate_folds(pipeline, X, y, cv=5, scoring=scoring, n_jobs=2)
+
+    pd.testing.assert_frame_equal(serial["scores"].iloc[:, 2:], parallel["scores"].iloc[:, 2:])
+    np.testing.assert_array_equal(serial["oof_predictions"], parallel["oof_predictions"])
+
+def test_cross_validate_models_share_folds():
+    """Test that several models are fitted on the same folds and match separate runs."""
+    estimators = {
+        "decision_tree": make_pipeline(DecisionTreeClassifier(random_state=123)),
+        "logistic_regression": make_pipeline(LogisticRegression())
+    }
+    results = cross_validate_models(estimators, X, y, cv=5, scoring=scoring, n_jobs=2)
+
+    assert list(results) == ["decision_tree", "logistic_regression"]
+    assert results["decision_tree"]["folds"] is results["logistic_regression"]["folds"]
+    for name, estimator in estimators.items():
+        single = cross_validate_folds(estimator, X, y, cv=5, scoring=scoring)
+        pd.testing.assert_frame_equal(results[name]["scores"].iloc[:, 2:], single["scores"].iloc[:, 2:])
+        np.testing.assert_array_equal(results[name]["oof_predictions"], single["oof_predictions"])
+        np.testing.assert_array_equal(results[name]["estimator"].predict(X), single["estimator"].predict(X))
+
+def test_cross_validate_folds_unknown_scoring():
+    """Test that an unknown metric name raises a ValueError."""
+    with pytest.raises(ValueError, match="Unknown scoring"):
+        cross_validate_folds(make_pipeline(LogisticRegression()), X, y, scoring=["roc_auc"])
+
+class CountedPickles:
+    """Data that counts how many times it is pickled in this process."""
+    pickled = 0
+
+    def __init__(self, values):
+        self.values = values
+
+    def __reduce__(self):
+        CountedPickles.pickled += 1
+        return CountedPickles, (self.values,)
+
+def _weighted_sum(data, weight):
+    return float(np.sum(data.values)) * weight
+
+def test_run_in_pool_sends_shared_arguments_once_per_worker():
+    """Test that shared arguments are not pickled with every task."""
+    data = CountedPickles(np.arange(10))
+    tasks = [(weight,) for weight in range(8)]
+    assert run_in_pool(_weighted_sum, tasks, n_jobs=2, shared=(data,)) == [45.0 * weight for weight in range(8)]
+    assert CountedPickles.pickled <= 2
+    assert run_in_pool(_weighted_sum, tasks, n_jobs=1, shared=(data,)) == [45.0 * weight for weight in range(8)]
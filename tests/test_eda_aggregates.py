@@ -0,0 +1,41 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.eda_aggregates import bin_codes, histogram_summary
+
+
+def make_frame(n_rows=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "age": rng.integers(30, 80, n_rows),
+        "cholesterol": rng.normal(240, 40, n_rows),
+        "diagnosis": rng.choice([0, 1], n_rows, p=[0.6, 0.4])
+    })
+
+
+def test_bin_codes_put_missing_and_out_of_range_values_in_the_overflow_bin():
+    edges = np.linspace(0, 10, 6)
+    codes = bin_codes([0, 1.9, 2, 10, -1, 11, np.nan], edges)
+    assert codes.tolist() == [0, 0, 1, 4, 5, 5, 5]
+
+
+def test_histograms_match_numpy():
+    df = make_frame()
+    summary = histogram_summary(df, ["age", "cholesterol"], "diagnosis", bins=20)
+    for col in ["age", "cholesterol"]:
+        expected = [np.histogram(df.loc[df.diagnosis == c, col], bins=summary["edges"][col])[0] for c in (0, 1)]
+        np.testing.assert_array_equal(summary["hist1d"][col], expected)
+    expected_2d = np.histogram2d(df.age, df.cholesterol, bins=[summary["edges"]["age"], summary["edges"]["cholesterol"]])[0]
+    np.testing.assert_array_equal(summary["hist2d"]["age", "cholesterol"], expected_2d)
+    assert summary["class_counts"].to_dict() == df.diagnosis.value_counts().to_dict()
+
+
+def test_summary_size_does_not_depend_on_rows():
+    small = histogram_summary(make_frame(100), ["age", "cholesterol"], "diagnosis", bins=10)
+    large = histogram_summary(make_frame(100_000), ["age", "cholesterol"], "diagnosis", bins=10)
+    assert small["hist2d"]["age", "cholesterol"].shape == large["hist2d"]["age", "cholesterol"].shape == (10, 10)
+    assert large["hist1d"]["age"].sum() == 100_000
+
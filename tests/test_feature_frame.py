@@ -0,0 +1,41 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.linear_model import LogisticRegression
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.feature_frame import feature_frame, is_sparse_frame, to_csr
+
+matrix = sparse.random(200, 6, density=0.2, format="csr", random_state=0)
+columns = [f"f{i}" for i in range(6)]
+
+
+def test_sparse_matrices_become_sparse_columns():
+    frame = feature_frame(matrix, columns, index=pd.RangeIndex(100, 300))
+    assert is_sparse_frame(frame)
+    assert list(frame.columns) == columns
+    assert frame.index[0] == 100
+    assert frame.memory_usage().sum() < matrix.toarray().nbytes
+
+
+def test_dense_arrays_stay_dense():
+    frame = feature_frame(matrix.toarray(), columns)
+    assert not is_sparse_frame(frame)
+    np.testing.assert_array_equal(frame.to_numpy(), matrix.toarray())
+
+
+def test_to_csr_round_trips():
+    for frame in (feature_frame(matrix, columns), feature_frame(matrix.toarray(), columns)):
+        csr = to_csr(frame)
+        assert csr.format == "csr"
+        assert (csr != matrix).nnz == 0
+
+
+def test_estimators_fit_sparse_frames_like_dense_ones():
+    y = np.arange(200) % 2
+    sparse_model = LogisticRegression().fit(feature_frame(matrix, columns), y)
+    dense_model = LogisticRegression().fit(feature_frame(matrix.toarray(), columns), y)
+    np.testing.assert_allclose(sparse_model.coef_, dense_model.coef_, atol=1e-6)
+    assert list(sparse_model.feature_names_in_) == columns
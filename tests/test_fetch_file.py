@@ -0,0 +1,164 @@
+import hashlib
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.fetch_file import fetch_file
+
+BODY = b"age,sex,cp\n" + b"".join(f"{i},1,4\n".encode() for i in range(5000))
+
+
+class DatasetHandler(BaseHTTPRequestHandler):
+    """Serves server.body with an ETag, conditional requests and byte ranges, logging every request."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _headers(self, status, length):
+        self.send_response(status)
+        self.send_header("ETag", self.server.etag)
+        self.send_header("Last-Modified", "Mon, 01 Jan 2024 00:00:00 GMT")
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(length))
+
+    def do_HEAD(self):
+        self.server.requests.append(("HEAD", dict(self.headers)))
+        if self.headers.get("If-None-Match") == self.server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self._headers(200, len(self.server.body))
+        self.end_headers()
+
+    def do_GET(self):
+        self.server.requests.append(("GET", dict(self.headers)))
+        body, start = self.server.body, 0
+        byte_range = self.headers.get("Range")
+        if byte_range and self.headers.get("If-Range", self.server.etag) == self.server.etag:
+            start = int(byte_range.split("=")[1].rstrip("-"))
+            if start >= len(body):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(body)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self._headers(206, len(body) - start)
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        else:
+            self._headers(200, len(body))
+        self.end_headers()
+        if self.server.cut_after is not None:
+            # drop the connection part-way through the body
+            self.wfile.write(body[start:start + self.server.cut_after])
+            self.server.cut_after = None
+            self.close_connection = True
+            return
+        self.wfile.write(body[start:])
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), DatasetHandler)
+    httpd.body, httpd.etag, httpd.requests, httpd.cut_after = BODY, '"v1"', [], None
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def url_of(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/data.csv"
+
+
+def test_download_then_rerun_costs_one_head_request(server, tmp_path):
+    path = str(tmp_path / "raw.csv")
+    result = fetch_file(url_of(server), path, sha256=hashlib.sha256(BODY).hexdigest())
+    assert result["status"] == "downloaded"
+    with open(path, "rb") as f:
+        assert f.read() == BODY
+
+    server.requests.clear()
+    assert fetch_file(url_of(server), path)["status"] == "not-modified"
+    assert [method for method, _ in server.requests] == ["HEAD"]
+    assert server.requests[0][1]["If-None-Match"] == '"v1"'
+
+
+def test_new_version_on_the_server_is_downloaded(server, tmp_path):
+    path = str(tmp_path / "raw.csv")
+    fetch_file(url_of(server), path)
+    server.body, server.etag = BODY + b"1,0,3\n", '"v2"'
+    assert fetch_file(url_of(server), path)["status"] == "downloaded"
+    with open(path, "rb") as f:
+        assert f.read() == server.body
+
+
+def test_interrupted_download_is_resumed_with_a_range_request(server, tmp_path):
+    path = str(tmp_path / "raw.csv")
+    server.cut_after = 10_000
+    with pytest.raises(Exception):
+        fetch_file(url_of(server), path)
+    assert os.path.getsize(f"{path}.part") == 10_000
+
+    server.requests.clear()
+    result = fetch_file(url_of(server), path, sha256=hashlib.sha256(BODY).hexdigest())
+    assert result["status"] == "resumed"
+    assert server.requests[0][1]["Range"] == "bytes=10000-"
+    with open(path, "rb") as f:
+        assert f.read() == BODY
+    assert not os.path.exists(f"{path}.part")
+
+
+def test_complete_part_file_is_finished_without_a_transfer(server, tmp_path):
+    path = str(tmp_path / "raw.csv")
+    server.cut_after = len(BODY) - 1
+    with pytest.raises(Exception):
+        fetch_file(url_of(server), path)
+    # the last byte arrives, but the run stops before the '.part' file is renamed
+    with open(f"{path}.part", "ab") as f:
+        f.write(BODY[-1:])
+
+    server.requests.clear()
+    result = fetch_file(url_of(server), path, sha256=hashlib.sha256(BODY).hexdigest())
+    assert result["status"] == "resumed"
+    assert [(method, headers["Range"]) for method, headers in server.requests] == [("GET", f"bytes={len(BODY)}-")]
+    with open(path, "rb") as f:
+        assert f.read() == BODY
+    assert not os.path.exists(f"{path}.part")
+    assert fetch_file(url_of(server), path)["status"] == "not-modified"
+
+
+def test_checksum_mismatch_removes_the_file(server, tmp_path):
+    path = str(tmp_path / "raw.csv")
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        fetch_file(url_of(server), path, sha256="0" * 64)
+    assert not os.path.exists(path)
+
+
+def test_mirror_is_revalidated_and_used_offline(server, tmp_path):
+    mirror = str(tmp_path / "mirror")
+    url = url_of(server)
+    fetch_file(url, str(tmp_path / "a" / "raw.csv"), mirror_dir=mirror)
+
+    server.requests.clear()
+    result = fetch_file(url, str(tmp_path / "b" / "raw.csv"), mirror_dir=mirror)
+    assert result["status"] == "not-modified"
+    assert [method for method, _ in server.requests] == ["HEAD"]
+
+    server.shutdown()
+    server.server_close()
+    result = fetch_file(url, str(tmp_path / "c" / "raw.csv"), mirror_dir=mirror, timeout=2)
+    assert result["status"] == "offline"
+    with open(tmp_path / "c" / "raw.csv", "rb") as f:
+        assert f.read() == BODY
+
+
+def test_local_path_is_copied(tmp_path):
+    source = tmp_path / "source.csv"
+    source.write_bytes(BODY)
+    result = fetch_file(str(source), str(tmp_path / "raw" / "raw.csv"))
+    assert result["status"] == "copied"
+    assert (tmp_path / "raw" / "raw.csv").read_bytes() == BODY
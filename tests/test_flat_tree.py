@@ -0,0 +1,66 @@
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.flat_tree import FlatTree, flatten_tree
+
+rng = np.random.default_rng(0)
+X = pd.DataFrame(rng.normal(size=(500, 6)), columns=[f"feature_{i}" for i in range(6)])
+X["one_hot"] = rng.integers(0, 2, 500).astype(float)
+y = np.where(X["feature_0"] + X["one_hot"] + rng.normal(scale=0.5, size=500) > 0.5, "Present", "Absent")
+
+def fit(**params):
+    return make_pipeline(DecisionTreeClassifier(random_state=123, **params)).fit(X, y)
+
+@pytest.mark.parametrize("params", [{}, {"max_depth": 3}, {"min_samples_leaf": 20}])
+def test_flat_tree_matches_sklearn(params):
+    """Test that leaves, probabilities and predictions are identical to the sklearn tree."""
+    pipeline = fit(**params)
+    tree = flatten_tree(pipeline)
+    X_new = pd.DataFrame(rng.normal(size=(1000, 7)), columns=X.columns)
+
+    np.testing.assert_array_equal(tree.apply(X_new), pipeline[-1].apply(X_new))
+    np.testing.assert_array_equal(tree.predict_proba(X_new), pipeline[-1].predict_proba(X_new))
+    np.testing.assert_array_equal(tree.predict(X_new), pipeline[-1].predict(X_new))
+
+def test_flat_tree_matches_sklearn_on_thresholds():
+    """Test rows lying exactly on the split thresholds, where float32 rounding matters."""
+    pipeline = fit()
+    tree = flatten_tree(pipeline)
+    X_edge = np.tile(X.to_numpy()[:1], (len(tree.threshold), 1))
+    internal = tree.left != -1
+    X_edge[internal, tree.feature[internal]] = tree.threshold[internal]
+    X_edge = pd.DataFrame(X_edge, columns=X.columns)
+
+    np.testing.assert_array_equal(tree.apply(X_edge), pipeline[-1].apply(X_edge))
+
+def test_flat_tree_single_leaf():
+    """Test a tree without splits."""
+    pipeline = make_pipeline(DecisionTreeClassifier()).fit(X, np.repeat("Absent", len(X)))
+    tree = flatten_tree(pipeline)
+
+    np.testing.assert_array_equal(tree.predict(X.head(3)), ["Absent"] * 3)
+
+def test_flat_tree_save_load_round_trip(tmp_path):
+    """Test that the saved .npy arrays load (memory-mapped) into an identical tree."""
+    tree = flatten_tree(fit())
+    tree.save(tmp_path / "tree")
+    loaded = FlatTree.load(tmp_path / "tree", mmap_mode="r")
+
+    assert sorted(os.listdir(tmp_path / "tree"))[0] == "classes.npy"
+    assert list(loaded.feature_names) == list(X.columns)
+    np.testing.assert_array_equal(loaded.predict_proba(X), tree.predict_proba(X))
+
+def test_flat_tree_rejects_wrong_width_and_models():
+    """Test errors for a feature matrix of the wrong width and for other models."""
+    tree = flatten_tree(fit())
+    with pytest.raises(ValueError, match="7 columns"):
+        tree.predict(X.to_numpy()[:, :3])
+    with pytest.raises(ValueError, match="DecisionTreeClassifier"):
+        flatten_tree(make_pipeline(LogisticRegression()).fit(X, y))
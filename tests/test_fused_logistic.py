@@ -0,0 +1,81 @@
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import StandardScaler, OneHotEncoder
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.pipeline import make_pipeline
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.fused_logistic import FusedLogisticScorer, compile_logistic_scorer
+
+rng = np.random.default_rng(0)
+n = 200
+data = pd.DataFrame({
+    "age": rng.integers(30, 80, n),
+    "chol": rng.normal(240, 40, n),
+    "chest_pain_type": rng.choice(["typical", "atypical", "non-anginal", "asymptomatic"], n),
+    "sex": rng.choice(["male", "female"], n),
+    "ca": rng.integers(0, 4, n)
+})
+labels = rng.choice(["Absent", "Present"], n)
+
+def fit(model=None):
+    """Fits the same preprocessing layout as scripts/split_n_preprocess.py on the mock data."""
+    preprocessor = make_column_transformer(
+        (StandardScaler(), ["age", "chol"]),
+        (OneHotEncoder(drop="if_binary", handle_unknown="ignore", sparse_output=False), ["chest_pain_type", "sex", "ca"])
+    ).fit(data)
+    pipeline = make_pipeline(model if model is not None else LogisticRegression(C=10))
+    pipeline.fit(preprocessor.transform(data), labels)
+    return preprocessor, pipeline
+
+def test_fused_scorer_matches_pipeline():
+    """Test that the fused scorer reproduces predict_proba and predict of the sklearn pipeline."""
+    preprocessor, pipeline = fit()
+    scorer = compile_logistic_scorer(preprocessor, pipeline)
+    expected = pipeline.predict_proba(preprocessor.transform(data))
+
+    np.testing.assert_allclose(scorer.predict_proba(data), expected, atol=1e-12)
+    assert (scorer.predict(data) == pipeline.predict(preprocessor.transform(data))).all()
+
+def test_fused_scorer_accepts_dict_of_arrays():
+    """Test that columns can be passed as a plain dict of NumPy arrays."""
+    preprocessor, pipeline = fit()
+    scorer = compile_logistic_scorer(preprocessor, pipeline)
+    columns = {name: data[name].to_numpy() for name in data.columns}
+
+    np.testing.assert_allclose(scorer.predict_proba(columns), scorer.predict_proba(data))
+
+def test_fused_scorer_ignores_unknown_categories():
+    """Test that unseen categories contribute nothing, like OneHotEncoder(handle_unknown='ignore')."""
+    preprocessor, pipeline = fit()
+    scorer = compile_logistic_scorer(preprocessor, pipeline)
+    unseen = data.head(5).assign(chest_pain_type="unknown", ca=7)
+    expected = pipeline.predict_proba(preprocessor.transform(unseen))
+
+    np.testing.assert_allclose(scorer.predict_proba(unseen), expected, atol=1e-12)
+
+def test_fused_scorer_save_load_round_trip(tmp_path):
+    """Test that a saved scorer loads without pickle and scores identically."""
+    preprocessor, pipeline = fit()
+    scorer = compile_logistic_scorer(preprocessor, pipeline)
+    scorer_path = tmp_path / "scorer.npz"
+    scorer.save(scorer_path)
+    loaded = FusedLogisticScorer.load(scorer_path)
+
+    np.testing.assert_array_equal(loaded.predict_proba(data), scorer.predict_proba(data))
+    assert list(loaded.classes) == ["Absent", "Present"]
+
+def test_compile_rejects_other_models():
+    """Test that only a binary logistic regression can be compiled."""
+    preprocessor, pipeline = fit(DecisionTreeClassifier(random_state=0))
+    with pytest.raises(ValueError, match="binary logistic regression"):
+        compile_logistic_scorer(preprocessor, pipeline)
+
+    multiclass = make_pipeline(LogisticRegression()).fit(preprocessor.transform(data), data["ca"])
+    with pytest.raises(ValueError, match="binary"):
+        compile_logistic_scorer(preprocessor, multiclass)
@@ -0,0 +1,57 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.hash_split import hash_split, record_keys
+
+
+def make_frame(n_rows=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "record_id": np.arange(n_rows),
+        "cholesterol": rng.normal(240, 40, n_rows),
+        "slope": rng.choice(["upsloping", "flat", "downsloping"], n_rows),
+        "diagnosis": rng.choice([0, 1], n_rows, p=[0.8, 0.2])
+    })
+
+
+def test_split_is_deterministic_and_depends_on_the_seed():
+    df = make_frame(1000)
+    first = hash_split(df, seed=42)
+    assert np.array_equal(first, hash_split(df, seed=42))
+    assert not np.array_equal(first, hash_split(df, seed=43))
+
+
+def test_appended_and_reordered_rows_keep_their_assignment():
+    df = make_frame(3000)
+    old = hash_split(df.iloc[:2000], seed=1, stratify="diagnosis")
+    grown = hash_split(df, seed=1, stratify="diagnosis")
+    assert np.array_equal(grown[:2000], old)
+
+    order = np.random.default_rng(0).permutation(len(df))
+    assert np.array_equal(hash_split(df.iloc[order], seed=1, stratify="diagnosis"), grown[order])
+    chunks = np.concatenate([hash_split(df.iloc[start:start + 700], seed=1, stratify="diagnosis")
+                             for start in range(0, len(df), 700)])
+    assert np.array_equal(chunks, grown)
+
+
+def test_every_class_gets_the_test_share():
+    df = make_frame()
+    in_test = hash_split(df, seed=7, test_size=0.3, key_columns=["record_id"], stratify="diagnosis")
+    for label in (0, 1):
+        share = in_test[df.diagnosis.to_numpy() == label].mean()
+        assert abs(share - 0.3) < 4 * np.sqrt(0.3 * 0.7 / (df.diagnosis == label).sum())
+
+
+def test_keys_do_not_depend_on_the_numeric_dtype():
+    as_int = pd.DataFrame({"age": [63, 67], "slope": ["flat", "upsloping"]})
+    as_float = as_int.astype({"age": float})
+    assert record_keys(as_int, ["age", "slope"]).equals(record_keys(as_float, ["age", "slope"]))
+
+
+def test_invalid_test_size():
+    with pytest.raises(ValueError):
+        hash_split(make_frame(10), seed=0, test_size=1.5)
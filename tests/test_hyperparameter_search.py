@@ -0,0 +1,83 @@
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+from scipy.stats import randint
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.pipeline import make_pipeline
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.hyperparameter_search import search_hyperparameters, FoldScoreCache, data_fingerprint
+
+rng = np.random.default_rng(0)
+X = pd.DataFrame(rng.normal(size=(300, 4)), columns=["a", "b", "c", "d"])
+y = pd.Series((X["a"] + X["b"] ** 2 + rng.normal(scale=0.5, size=300) > 1).astype(int), name="diagnosis")
+pipeline = make_pipeline(DecisionTreeClassifier(random_state=123))
+space = {
+    "decisiontreeclassifier__max_depth": randint(1, 10),
+    "decisiontreeclassifier__min_samples_leaf": randint(1, 20)
+}
+
+def count_lines(path):
+    with open(path) as f:
+        return sum(1 for _ in f)
+
+def test_random_search_returns_best_candidate():
+    """Test that randomized search scores every candidate on every fold and returns the top one."""
+    best_params, results = search_hyperparameters(pipeline, space, X, y, strategy="random", n_candidates=6)
+
+    assert len(results) == 6 and (results["round"] == 0).all()
+    top = results.loc[results["mean_test_accuracy"].idxmax()]
+    assert best_params == top["params"]
+    assert set(best_params) == set(space)
+
+def test_search_cache_skips_finished_work(tmp_path):
+    """Test that a rerun reads every fold from the cache and a widened search only fits new candidates."""
+    cache_path = tmp_path / "decision_tree.jsonl"
+    first_best, first = search_hyperparameters(pipeline, space, X, y, n_candidates=4, cache=FoldScoreCache(cache_path))
+    assert count_lines(cache_path) == 4 * 5
+    assert (first["cached_folds"] == 0).all()
+
+    rerun_best, rerun = search_hyperparameters(pipeline, space, X, y, n_candidates=4, cache=FoldScoreCache(cache_path))
+    assert count_lines(cache_path) == 4 * 5
+    assert (rerun["cached_folds"] == 5).all()
+    assert rerun_best == first_best
+    pd.testing.assert_series_equal(rerun["mean_test_accuracy"], first["mean_test_accuracy"])
+
+    _, widened = search_hyperparameters(pipeline, space, X, y, n_candidates=6, cache=FoldScoreCache(cache_path))
+    assert count_lines(cache_path) == 6 * 5
+    assert list(widened["cached_folds"]) == [5, 5, 5, 5, 0, 0]
+
+def test_cache_keys_depend_on_data(tmp_path):
+    """Test that scores cached for one training set are not reused for another."""
+    cache_path = tmp_path / "decision_tree.jsonl"
+    search_hyperparameters(pipeline, space, X, y, n_candidates=2, cache=FoldScoreCache(cache_path))
+    _, results = search_hyperparameters(pipeline, space, X, 1 - y, n_candidates=2, cache=FoldScoreCache(cache_path))
+
+    assert (results["cached_folds"] == 0).all()
+    assert data_fingerprint(X, y) != data_fingerprint(X, 1 - y)
+
+def test_successive_halving_narrows_candidates(tmp_path):
+    """Test that halving rounds grow the training size, shrink the candidates and end on the full folds."""
+    cache_path = tmp_path / "decision_tree.jsonl"
+    best_params, results = search_hyperparameters(pipeline, space, X, y, strategy="halving", n_candidates=9,
+                                                  factor=3, cache=FoldScoreCache(cache_path))
+    rounds = results.groupby("round").agg(candidates=("rank", "size"), n_train=("n_train", "first"))
+
+    assert list(rounds["candidates"]) == [9, 3, 1]
+    assert rounds["n_train"].is_monotonic_increasing
+    assert rounds["n_train"].iloc[-1] == 240
+    assert best_params == results.iloc[-1]["params"]
+
+    # the full-fold round shares cached scores with randomized search
+    _, random_results = search_hyperparameters(pipeline, space, X, y, strategy="random", n_candidates=9,
+                                               cache=FoldScoreCache(cache_path))
+    assert (random_results["cached_folds"] == 5).sum() == 1
+
+def test_search_invalid_arguments():
+    """Test that an unknown strategy or metric raises a ValueError."""
+    with pytest.raises(ValueError, match="strategy"):
+        search_hyperparameters(pipeline, space, X, y, strategy="grid")
+    with pytest.raises(ValueError, match="scoring"):
+        search_hyperparameters(pipeline, space, X, y, scoring="roc_auc")
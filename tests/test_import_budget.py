@@ -0,0 +1,40 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.import_budget import STARTUP_BUDGETS_MS, parse_importtime, measure_startup, startup_violations
+
+CLI = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts', 'heart_disease.py'))
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 | _io
+import time:        80 |         80 |   encodings.aliases
+import time:       300 |        380 | encodings
+Usage: something else
+import time:      1000 |       1500 | pandas
+"""
+
+
+def test_parse_importtime_reads_times_and_depth():
+    imports = parse_importtime(SAMPLE)
+    assert imports == [
+        ("_io", 120, 120, 0),
+        ("encodings.aliases", 80, 80, 1),
+        ("encodings", 300, 380, 0),
+        ("pandas", 1000, 1500, 0)
+    ]
+
+
+def test_startup_violations_reports_budget_and_lazy_modules():
+    imports = parse_importtime(SAMPLE)
+    assert startup_violations("fit", 10.0, imports, budgets={"fit": 20}, lazy_modules=["matplotlib"]) == []
+    violations = startup_violations("fit", 30.0, imports, budgets={"fit": 20}, lazy_modules=["pandas"])
+    assert violations == ["fit: startup 30 ms exceeds the budget of 20 ms", "fit: imports pandas at startup"]
+
+
+@pytest.mark.parametrize("subcommand", list(STARTUP_BUDGETS_MS))
+def test_subcommand_imports_no_lazy_module_at_startup(subcommand):
+    # the time budgets depend on the machine, so they are checked by benchmarks/bench_cli_startup.py
+    total_ms, imports = measure_startup([CLI, *([subcommand] if subcommand else []), "--help"])
+    assert startup_violations(subcommand, total_ms, imports, budgets={}) == []
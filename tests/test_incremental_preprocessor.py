@@ -0,0 +1,91 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.incremental_preprocessor import IncrementalColumnTransformer
+
+
+def make_frame(n_rows=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "age": rng.integers(30, 80, n_rows),
+        "cholesterol": rng.normal(240, 40, n_rows),
+        "slope": rng.choice(["upsloping", "flat", "downsloping"], n_rows),
+        "angina": rng.choice(["no", "yes"], n_rows),
+        "vessels": rng.choice([0.0, 1.0, 2.0, 3.0], n_rows)
+    })
+
+
+def make_preprocessor(**encoder_kwargs):
+    return make_column_transformer(
+        (StandardScaler(), ["age", "cholesterol"]),
+        (OneHotEncoder(drop="if_binary", handle_unknown="ignore", **encoder_kwargs), ["slope", "angina", "vessels"])
+    )
+
+
+def fit_in_chunks(preprocessor, X, chunksize):
+    fitter = IncrementalColumnTransformer(preprocessor)
+    for start in range(0, len(X), chunksize):
+        fitter.partial_fit(X.iloc[start:start + chunksize])
+    return fitter.finalize()
+
+
+def test_chunked_fit_equals_in_memory_fit():
+    X = make_frame()
+    whole = make_preprocessor().fit(X)
+    chunked = fit_in_chunks(make_preprocessor(), X, 64)
+
+    scaler, whole_scaler = chunked.named_transformers_["standardscaler"], whole.named_transformers_["standardscaler"]
+    np.testing.assert_allclose(scaler.mean_, whole_scaler.mean_, rtol=1e-13)
+    np.testing.assert_allclose(scaler.var_, whole_scaler.var_, rtol=1e-12)
+    assert scaler.n_samples_seen_ == whole_scaler.n_samples_seen_
+    encoder, whole_encoder = chunked.named_transformers_["onehotencoder"], whole.named_transformers_["onehotencoder"]
+    for categories, expected in zip(encoder.categories_, whole_encoder.categories_):
+        np.testing.assert_array_equal(categories, expected)
+        assert categories.dtype == expected.dtype
+    assert list(chunked.get_feature_names_out()) == list(whole.get_feature_names_out())
+    assert chunked.sparse_output_ == whole.sparse_output_
+    np.testing.assert_allclose(chunked.transform(make_frame(100, seed=1)), whole.transform(make_frame(100, seed=1)), atol=1e-12)
+
+
+def test_categories_missing_from_early_chunks_are_found():
+    X = make_frame().sort_values("slope")
+    X.loc[X.index[::7], "slope"] = np.nan
+    whole = make_preprocessor().fit(X)
+    chunked = fit_in_chunks(make_preprocessor(), X, 100)
+    categories = chunked.named_transformers_["onehotencoder"].categories_[0]
+    assert [str(value) for value in categories] == ["downsloping", "flat", "upsloping", "nan"]
+    assert [str(value) for value in whole.named_transformers_["onehotencoder"].categories_[0]] == \
+        [str(value) for value in categories]
+
+
+def test_categorical_columns_give_the_categories_of_object_columns():
+    X = make_frame()
+    # the dtype also lists a category that never occurs, as compact_dtypes does
+    compact = X.astype({"slope": pd.CategoricalDtype(["downsloping", "flat", "none", "upsloping"]), "angina": "category"})
+    whole = make_preprocessor().fit(X)
+    chunked = fit_in_chunks(make_preprocessor(), compact, 128)
+    for categories, expected in zip(chunked.named_transformers_["onehotencoder"].categories_,
+                                    whole.named_transformers_["onehotencoder"].categories_):
+        np.testing.assert_array_equal(categories, expected)
+    assert chunked.sparse_output_ == whole.sparse_output_
+
+
+def test_sparse_output_follows_the_density_of_the_training_data():
+    X = make_frame()
+    X["slope"] = np.arange(len(X)).astype(str)
+    whole = make_preprocessor().fit(X)
+    assert whole.sparse_output_
+    assert fit_in_chunks(make_preprocessor(), X, 300).sparse_output_
+
+
+def test_unsupported_transformers_are_rejected():
+    with pytest.raises(ValueError):
+        IncrementalColumnTransformer(make_preprocessor(min_frequency=5))
+    with pytest.raises(ValueError):
+        IncrementalColumnTransformer(make_column_transformer((OneHotEncoder(), ["slope"]), remainder="passthrough"))
@@ -1,10 +1,12 @@
 import pytest
 import pandas as pd
+import numpy as np
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.load_data import load_data
+from src.save_data import save_data
 
 # Create Sample data for testing
 X_sample = pd.DataFrame({'feature1': [1, 2, 3], 'feature2': [4, 5, 6]})
@@ -36,5 +38,38 @@ def test_load_data_squeeze(tmp_path):
     _, y_data = load_data(X_path, y_path)
     assert isinstance(y_data, pd.Series)
 
+def test_load_data_npy_memory_mapped(tmp_path):
+    """Test that .npy features are memory-mapped with their column names."""
+    X = pd.DataFrame({'feature1': [1.5, 2.5, 3.5], 'feature2': [4.0, 5.0, 6.0]})
+    save_data(X, tmp_path, "X_data", storage="npy")
+    y_path = tmp_path / "y_data.csv"
+    y_sample.to_csv(y_path, index=False)
+
+    X_data, y_data = load_data(tmp_path / "X_data.npy", y_path)
+    assert X_data.equals(X)
+    assert isinstance(np.load(tmp_path / "X_data.npy", mmap_mode="r"), np.memmap)
+    assert not X_data.to_numpy().flags.writeable
+    assert y_data.equals(y_sample.squeeze())
+
+def test_load_data_npz_stays_sparse(tmp_path):
+    """Test that .npz features come back as sparse columns with their names."""
+    X = pd.DataFrame({'num': [0.5, -1.0, 0.5], 'onehot_a': [1.0, 0.0, 0.0], 'onehot_b': [0.0, 0.0, 1.0]})
+    save_data(X, tmp_path, "X_data", storage="npz")
+    y_path = tmp_path / "y_data.csv"
+    y_sample.to_csv(y_path, index=False)
+
+    X_data, _ = load_data(tmp_path / "X_data.npz", y_path)
+    assert all(isinstance(dtype, pd.SparseDtype) for dtype in X_data.dtypes)
+    assert X_data.sparse.density == pytest.approx(5 / 9)
+    assert X_data.sparse.to_dense().equals(X)
+
+def test_load_data_npy_missing_sidecar(tmp_path):
+    """Test that a .npy file without its column sidecar raises FileNotFoundError."""
+    np.save(tmp_path / "X_data.npy", np.zeros((3, 2)))
+    y_path = tmp_path / "y_data.csv"
+    y_sample.to_csv(y_path, index=False)
+    with pytest.raises(FileNotFoundError):
+        load_data(tmp_path / "X_data.npy", y_path)
+
 # pytest tests/test_load_data.py
 
@@ -0,0 +1,22 @@
+import pytest
+import pickle
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.load_pipeline import load_pipeline
+
+def test_load_pipeline_success(tmp_path):
+    """Test that a pickled object is loaded back."""
+    pipeline_path = tmp_path / "pipeline.pkl"
+    with open(pipeline_path, 'wb') as f:
+        pickle.dump({"model": "logistic_regression"}, f)
+
+    assert load_pipeline(pipeline_path) == {"model": "logistic_regression"}
+
+def test_load_pipeline_file_not_found():
+    """Test that load_pipeline raises FileNotFoundError if the file is missing."""
+    with pytest.raises(FileNotFoundError):
+        load_pipeline('non_existent_pipeline.pkl')
+
+# pytest tests/test_load_pipeline.py
@@ -0,0 +1,86 @@
+import pytest
+import asyncio
+import pandas as pd
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.micro_batcher import MicroBatcher, LatencyTracker
+
+def double_score(records):
+    """Scores records by doubling their value, keeping a log of batch sizes."""
+    double_score.batch_sizes.append(len(records))
+    return pd.DataFrame({"score": records["value"] * 2})
+
+def run_requests(batcher, requests):
+    """Submits every request concurrently and returns their results."""
+    async def run():
+        try:
+            return await asyncio.gather(*(batcher.submit(pd.DataFrame({"value": values})) for values in requests))
+        finally:
+            await batcher.stop()
+    return asyncio.run(run())
+
+def test_micro_batcher_groups_concurrent_requests():
+    """Test that concurrent requests are scored in one batch and get their own results back."""
+    double_score.batch_sizes = []
+    batcher = MicroBatcher(double_score, max_batch_size=100, max_wait=0.05)
+    results = run_requests(batcher, [[1], [2, 3], [4]])
+
+    assert double_score.batch_sizes == [4]
+    assert [result["score"].tolist() for result in results] == [[2], [4, 6], [8]]
+    assert batcher.tracker.batches == 1
+
+def test_micro_batcher_respects_max_batch_size():
+    """Test that no batch exceeds max_batch_size records."""
+    double_score.batch_sizes = []
+    batcher = MicroBatcher(double_score, max_batch_size=2, max_wait=0.05)
+    results = run_requests(batcher, [[1], [2], [3], [4], [5]])
+
+    assert max(double_score.batch_sizes) <= 2
+    assert sum(double_score.batch_sizes) == 5
+    assert [result["score"].tolist() for result in results] == [[2], [4], [6], [8], [10]]
+
+def test_micro_batcher_propagates_errors():
+    """Test that a scoring error is raised in the request."""
+    def failing_score(records):
+        raise ValueError("bad records")
+
+    batcher = MicroBatcher(failing_score, max_wait=0.01)
+    with pytest.raises(ValueError, match="bad records"):
+        run_requests(batcher, [[1]])
+    assert batcher.tracker.errors == 1
+
+def test_micro_batcher_fails_only_the_bad_request():
+    """Test that a bad request batched with a good one fails alone."""
+    def strict_score(records):
+        if "value" not in records or records["value"].isna().any():
+            raise ValueError("bad record")
+        return pd.DataFrame({"score": records["value"] * 2})
+
+    async def run():
+        batcher = MicroBatcher(strict_score, max_batch_size=100, max_wait=0.05)
+        try:
+            return await asyncio.gather(batcher.submit(pd.DataFrame({"value": [1]})),
+                                        batcher.submit(pd.DataFrame({"other": [1]})), return_exceptions=True), batcher
+        finally:
+            await batcher.stop()
+    (good, bad), batcher = asyncio.run(run())
+
+    assert good["score"].tolist() == [2]
+    assert isinstance(bad, ValueError)
+    assert batcher.tracker.errors == 1
+
+def test_latency_tracker_summary():
+    """Test that the tracker reports counters and latency percentiles in milliseconds."""
+    tracker = LatencyTracker()
+    for ms in range(1, 101):
+        tracker.record(ms / 1000, 2)
+    summary = tracker.summary()
+
+    assert summary["requests"] == 100
+    assert summary["records"] == 200
+    assert summary["p50_ms"] == pytest.approx(50.5)
+    assert summary["p99_ms"] == pytest.approx(99.01)
+
+# pytest tests/test_micro_batcher.py
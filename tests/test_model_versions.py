@@ -0,0 +1,26 @@
+import os
+import sys
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.model_versions import version_path, model_versions, latest_version
+
+def test_version_paths(tmp_path):
+    """Test that version 0 is the fitted model and later versions are numbered."""
+    assert version_path(tmp_path, "sgd", 0) == os.path.join(tmp_path, "sgd.pkl")
+    assert version_path(tmp_path, "sgd", 12) == os.path.join(tmp_path, "sgd_v12.pkl")
+    with pytest.raises(ValueError):
+        version_path(tmp_path, "sgd", -1)
+
+def test_versions_are_found_and_sorted(tmp_path):
+    """Test that only the versions of the model are listed, in numeric order."""
+    for file_name in ["sgd.pkl", "sgd_v2.pkl", "sgd_v10.pkl", "sgd_v1.pkl", "sgd_logistic.pkl", "sgd_v3.pkl.tmp", "other_v4.pkl"]:
+        (tmp_path / file_name).write_bytes(b"")
+    assert model_versions(tmp_path, "sgd") == [0, 1, 2, 10]
+    assert latest_version(tmp_path, "sgd") == 10
+
+def test_latest_version_without_a_model(tmp_path):
+    """Test that a missing model raises a FileNotFoundError."""
+    assert model_versions(tmp_path / "missing", "sgd") == []
+    with pytest.raises(FileNotFoundError):
+        latest_version(tmp_path, "sgd")
@@ -0,0 +1,54 @@
+import os
+import pickle
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+from predict import predict
+from split_n_preprocess import make_preprocessor
+from src.feature_frame import feature_frame
+from src.validate_data import compact_dtypes
+
+CLEANED_DATA = os.path.join(os.path.dirname(__file__), '..', 'data', 'cleaned', 'cleaned_heart_disease_data.csv')
+
+
+@pytest.fixture
+def fitted(tmp_path):
+    """A preprocessor and logistic regression fitted on the cleaned data, pickled to tmp_path."""
+    df = pd.read_csv(CLEANED_DATA, dtype=compact_dtypes())
+    X, y = df.drop(columns="diagnosis"), df["diagnosis"]
+    preprocessor = make_preprocessor().fit(X)
+    features = feature_frame(preprocessor.transform(X), preprocessor.get_feature_names_out())
+    model = LogisticRegression(max_iter=1000).fit(features, y)
+    for name, obj in [("preprocessor", preprocessor), ("pipeline", model)]:
+        with open(tmp_path / f"{name}.pickle", "wb") as f:
+            pickle.dump(obj, f)
+    return df, model.predict_proba(features)[:, 1]
+
+
+def test_batched_predictions_match_predict_proba(fitted, tmp_path):
+    df, expected = fitted
+    df.head(50).to_csv(tmp_path / "records.csv", index=False)
+
+    n_rows, _ = predict(tmp_path / "records.csv", tmp_path / "preprocessor.pickle", tmp_path / "pipeline.pickle",
+                        tmp_path / "out" / "predictions.csv", batch_size=7)
+
+    predictions = pd.read_csv(tmp_path / "out" / "predictions.csv")
+    assert n_rows == 50
+    np.testing.assert_allclose(predictions["probability"], expected[:50])
+    assert (predictions["prediction"] == (expected[:50] > 0.5)).all()
+
+
+def test_empty_input_writes_the_headers(fitted, tmp_path):
+    df, _ = fitted
+    df.head(0).to_csv(tmp_path / "records.csv", index=False)
+
+    n_rows, _ = predict(tmp_path / "records.csv", tmp_path / "preprocessor.pickle", tmp_path / "pipeline.pickle",
+                        tmp_path / "predictions.csv", batch_size=7)
+
+    assert n_rows == 0
+    assert open(tmp_path / "predictions.csv").read().splitlines() == ["probability,prediction"]
@@ -0,0 +1,48 @@
+import pytest
+import pandas as pd
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.read_batches import read_batches
+
+DATA_SAMPLE = pd.DataFrame({'age': [63, 67, 37, 41, 56], 'thalassemia': ['normal', 'fixed defect', 'normal', 'normal', 'reversable defect']})
+
+def test_read_batches_csv(tmp_path):
+    """Test that a CSV file is read in batches of at most batch_size rows."""
+    data_path = tmp_path / "data.csv"
+    DATA_SAMPLE.to_csv(data_path, index=False)
+
+    batches = list(read_batches(data_path, 2))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert pd.concat(batches).equals(DATA_SAMPLE)
+
+def test_read_batches_parquet_directory(tmp_path):
+    """Test that every partition of a Parquet directory is read in order."""
+    pytest.importorskip("pyarrow")
+    data_dir = tmp_path / "data.parquet"
+    data_dir.mkdir()
+    DATA_SAMPLE.iloc[:3].to_parquet(data_dir / "part-00000.parquet", index=False)
+    DATA_SAMPLE.iloc[3:].to_parquet(data_dir / "part-00001.parquet", index=False)
+
+    batches = list(read_batches(data_dir, 2))
+    assert [len(batch) for batch in batches] == [2, 1, 2]
+    assert pd.concat(batches, ignore_index=True).equals(DATA_SAMPLE)
+
+def test_read_batches_dtype(tmp_path):
+    """Test that the dtypes are applied to the columns of every batch, CSV or Parquet."""
+    pytest.importorskip("pyarrow")
+    dtype = {'age': 'int8', 'thalassemia': 'category', 'diagnosis': 'int8'}
+    DATA_SAMPLE.to_csv(tmp_path / "data.csv", index=False)
+    DATA_SAMPLE.to_parquet(tmp_path / "data.parquet", index=False)
+
+    for data_path in [tmp_path / "data.csv", tmp_path / "data.parquet"]:
+        for batch in read_batches(data_path, 2, dtype):
+            assert batch.dtypes.to_dict() == {'age': 'int8', 'thalassemia': 'category'}
+
+def test_read_batches_invalid_batch_size(tmp_path):
+    """Test that a non-positive batch size raises a ValueError."""
+    with pytest.raises(ValueError):
+        next(read_batches(tmp_path / "data.csv", 0))
+
+# pytest tests/test_read_batches.py
@@ -0,0 +1,61 @@
+import pytest
+import pandas as pd
+import numpy as np
+import json
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.save_data import save_data, TableWriter, STORAGE_FORMATS
+from src.load_data import read_table
+
+X_sample = pd.DataFrame({'feature 1': [0.1, 0.2, 0.3], 'feature2': [1.0, 0.0, 1.0]})
+
+def test_save_data_csv(tmp_path):
+    """Test that csv storage writes a CSV without the index."""
+    path = save_data(X_sample, tmp_path, "X", storage="csv")
+    assert path.endswith("X.csv")
+    assert pd.read_csv(path).equals(X_sample)
+
+def test_save_data_npy_round_trip(tmp_path):
+    """Test that npy storage round-trips values exactly and writes the column sidecar."""
+    path = save_data(X_sample, tmp_path, "X", storage="npy")
+    with open(tmp_path / "X.columns.json") as f:
+        assert json.load(f) == ['feature 1', 'feature2']
+    assert read_table(path).equals(X_sample)
+
+def test_save_data_series(tmp_path):
+    """Test that a Series is saved as a one-column table."""
+    y = pd.Series([0, 1, 0], name="diagnosis")
+    path = save_data(y, tmp_path, "y", storage="npy")
+    assert read_table(path).squeeze().equals(y)
+
+def test_save_data_creates_directory(tmp_path):
+    """Test that a missing output directory is created."""
+    save_data(X_sample, tmp_path / "new_dir", "X")
+    assert os.path.isfile(tmp_path / "new_dir" / "X.csv")
+
+def test_save_data_invalid_storage(tmp_path):
+    """Test that an unknown storage format raises a ValueError."""
+    with pytest.raises(ValueError):
+        save_data(X_sample, tmp_path, "X", storage="xlsx")
+
+@pytest.mark.parametrize("storage", STORAGE_FORMATS)
+def test_table_writer_matches_save_data(tmp_path, storage):
+    """Test that a table written chunk by chunk reads back like one saved at once."""
+    X = pd.DataFrame({'feature 1': np.arange(10) / 10, 'feature2': np.arange(10.0)})
+    with TableWriter(tmp_path / "chunked", "X", storage, n_rows=len(X)) as writer:
+        for start in range(0, len(X), 4):
+            writer.write(X.iloc[start:start + 4])
+    expected = read_table(save_data(X, tmp_path / "whole", "X", storage))
+    assert read_table(writer.path).equals(expected)
+
+def test_table_writer_npy_checks_row_count(tmp_path):
+    """Test that npy storage needs the row count up front and rejects a short write."""
+    with pytest.raises(ValueError):
+        TableWriter(tmp_path, "X", storage="npy")
+    with pytest.raises(ValueError, match="Expected 5 rows"):
+        with TableWriter(tmp_path, "X", storage="npy", n_rows=5) as writer:
+            writer.write(X_sample)
+
+# pytest tests/test_save_data.py
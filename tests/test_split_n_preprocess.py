@@ -0,0 +1,72 @@
+import os
+import sys
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+from split_n_preprocess import split_and_preprocess, save_split, split_and_preprocess_chunked, append_split
+from src.load_data import read_table
+from src.validate_data import compact_dtypes
+
+CLEANED_DATA = os.path.join(os.path.dirname(__file__), '..', 'data', 'cleaned', 'cleaned_heart_disease_data.csv')
+
+
+@pytest.fixture
+def cleaned():
+    return pd.read_csv(CLEANED_DATA, dtype=compact_dtypes())
+
+
+def read_sets(directory):
+    return {name: open(os.path.join(directory, f"{name}.csv")).read().splitlines()
+            for name in ["X_train", "X_test", "y_train", "y_test"]}
+
+
+def read_features(path):
+    features = read_table(path)
+    # dense copies, as 'npy' files are memory-mapped and 'npz' files read as sparse columns
+    return features.sparse.to_dense() if path.suffix == ".npz" else features.copy()
+
+
+def test_hash_split_does_not_depend_on_chunksize(cleaned, tmp_path):
+    save_split(split_and_preprocess(cleaned, 42, "hash"), tmp_path / "memory", tmp_path / "model")
+    for chunksize in (50, 1000):
+        split_and_preprocess_chunked(CLEANED_DATA, tmp_path / str(chunksize), tmp_path / "model", 42, chunksize,
+                                     split_method="hash")
+        assert read_sets(tmp_path / str(chunksize)) == read_sets(tmp_path / "memory")
+
+
+def test_hash_split_keeps_existing_rows_when_one_is_appended(cleaned, tmp_path):
+    grown = pd.concat([cleaned, cleaned.iloc[[0]].assign(age=cleaned.age.max() + 1)], ignore_index=True)
+    grown.to_csv(tmp_path / "grown.csv", index=False)
+    split_and_preprocess_chunked(CLEANED_DATA, tmp_path / "old", tmp_path / "model", 42, 50, split_method="hash")
+    split_and_preprocess_chunked(tmp_path / "grown.csv", tmp_path / "new", tmp_path / "model", 42, 50, split_method="hash")
+
+    old, new = read_sets(tmp_path / "old"), read_sets(tmp_path / "new")
+    # the appended record is last, so every earlier row keeps its set and position
+    assert sum(len(new[name]) - len(old[name]) for name in ["X_train", "X_test"]) == 1
+    for name in old:
+        assert new[name][:len(old[name])] == old[name]
+
+
+@pytest.mark.parametrize("storage", ["csv", "npy", "npz"])
+def test_append_split_keeps_earlier_rows_and_the_preprocessor(cleaned, tmp_path, storage):
+    data_to, model_to = tmp_path / "processed", tmp_path / "model"
+    save_split(split_and_preprocess(cleaned.iloc[:250], 42, "hash", sparse=storage == "npz"), data_to, model_to, storage)
+    before = read_sets(data_to)
+    features = {name: read_features(data_to / f"{name}_transformed.{storage}") for name in ["X_train", "X_test"]}
+    preprocessor = open(model_to / "preprocessor.pickle", "rb").read()
+
+    append_split(cleaned.iloc[250:], data_to, model_to, 42, storage)
+
+    # the sets equal those of a hash split of all the rows, with the earlier rows first
+    save_split(split_and_preprocess(cleaned, 42, "hash"), tmp_path / "full", tmp_path / "full_model")
+    after, full = read_sets(data_to), read_sets(tmp_path / "full")
+    for name in before:
+        assert after[name][:len(before[name])] == before[name]
+        assert sorted(after[name]) == sorted(full[name])
+    for name, earlier in features.items():
+        grown = read_features(data_to / f"{name}_transformed.{storage}")
+        assert len(grown) == len(after[name]) - 1
+        pd.testing.assert_frame_equal(grown.iloc[:len(earlier)], earlier)
+    assert open(model_to / "preprocessor.pickle", "rb").read() == preprocessor
@@ -0,0 +1,90 @@
+import pytest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.stage_cache import StageCache, run_stage, stage_key, source_files, expand_outputs, command_params
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+def test_stage_key_depends_on_contents_params_and_sources(tmp_path):
+    """Test that the key changes with input contents, parameters and source code, not with timestamps."""
+    data, script = str(tmp_path / "data.csv"), str(tmp_path / "stage.py")
+    write(data, "a\n1\n")
+    write(script, "print('v1')\n")
+    key = stage_key("clean", [data], ["--seed=1"], [script])
+
+    os.utime(data, (0, 0))
+    assert stage_key("clean", [data], ["--seed=1"], [script]) == key
+    assert stage_key("clean", [data], ["--seed=2"], [script]) != key
+    write(script, "print('v2')\n")
+    assert stage_key("clean", [data], ["--seed=1"], [script]) != key
+    write(script, "print('v1')\n")
+    write(data, "a\n2\n")
+    assert stage_key("clean", [data], ["--seed=1"], [script]) != key
+
+def test_command_params_leave_out_execution_options():
+    """Test that changing the number of processes keeps the stage key, while other options still change it."""
+    command = ["python", "scripts/fit_model.py", "--random-state=1", "--n-jobs=1", "--search=none"]
+    key = stage_key("fit", params=command_params(command))
+
+    assert command_params(command) == ["python", "scripts/fit_model.py", "--random-state=1", "--search=none"]
+    assert stage_key("fit", params=command_params([*command[:3], "--n-jobs=8", command[4]])) == key
+    assert stage_key("fit", params=command_params([*command[:3], "--n-jobs", "8", command[4]])) == key
+    assert stage_key("fit", params=command_params([*command[:2], "--random-state=2", *command[3:]])) != key
+    assert command_params(command, ignore=("--n-jobs", "--search")) == command[:3]
+
+def test_run_stage_restores_outputs_on_hit(tmp_path):
+    """Test that a second run with the same inputs restores the outputs without running the stage."""
+    cache = StageCache(str(tmp_path / "store"))
+    data, output = str(tmp_path / "raw.csv"), str(tmp_path / "out" / "clean.csv")
+    write(data, "a\n1\n")
+    calls = []
+
+    def run():
+        calls.append(1)
+        write(output, read(data).upper())
+
+    assert run_stage("clean", run, inputs=[data], outputs=[output], cache=cache) is False
+    os.remove(output)
+    assert run_stage("clean", run, inputs=[data], outputs=[output], cache=StageCache(str(tmp_path / "store"))) is True
+    assert read(output) == "A\n1\n" and len(calls) == 1
+
+    write(data, "a\n2\n")
+    assert run_stage("clean", run, inputs=[data], outputs=[output], cache=cache) is False
+    assert read(output) == "A\n2\n" and len(calls) == 2
+
+def test_run_stage_missing_output_is_not_stored(tmp_path):
+    """Test that a stage that does not write its declared outputs fails and stores nothing."""
+    cache = StageCache(str(tmp_path / "store"))
+    with pytest.raises(FileNotFoundError, match="was not produced"):
+        run_stage("fit", lambda: None, outputs=[str(tmp_path / "model.pkl")], cache=cache)
+    assert not os.path.exists(tmp_path / "store" / "stages")
+
+def test_expand_outputs_globs_keep_fresh_files(tmp_path):
+    """Test that glob outputs skip files left over from earlier runs and directories expand to their files."""
+    write(str(tmp_path / "tables" / "old_search.csv"), "stale")
+    os.utime(tmp_path / "tables" / "old_search.csv", (0, 0))
+    write(str(tmp_path / "tables" / "new_cv.csv"), "fresh")
+    write(str(tmp_path / "tree" / "value.npy"), "tree")
+
+    outputs = expand_outputs([str(tmp_path / "tables" / "*.csv"), str(tmp_path / "tree")], since=1000)
+    assert outputs == [str(tmp_path / "tables" / "new_cv.csv"), str(tmp_path / "tree" / "value.npy")]
+
+def test_source_files_follows_src_imports(tmp_path):
+    """Test that both 'from src.module import' and bare imports of src modules are followed."""
+    write(str(tmp_path / "scripts" / "stage.py"), "import os\nfrom src.helper import f\nfrom bare import g\n")
+    write(str(tmp_path / "src" / "helper.py"), "from src.nested import h\n")
+    write(str(tmp_path / "src" / "nested.py"), "import numpy\n")
+    write(str(tmp_path / "src" / "bare.py"), "")
+    write(str(tmp_path / "src" / "unused.py"), "")
+
+    sources = source_files(str(tmp_path / "scripts" / "stage.py"), str(tmp_path))
+    assert sorted(os.path.basename(path) for path in sources) == ["bare.py", "helper.py", "nested.py", "stage.py"]
@@ -0,0 +1,113 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.streaming_stats import StreamingStats, accumulate_csv, count_rows, row_offset
+
+HIST_COLUMNS = ["age", "cholesterol"]
+
+
+def make_frame(n_rows=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "age": rng.integers(30, 80, n_rows),
+        "cholesterol": rng.normal(240, 40, n_rows) + 1e6,
+        "sex": rng.choice(["male", "female"], n_rows),
+        "diagnosis": rng.choice([0, 1], n_rows, p=[0.6, 0.4])
+    })
+
+
+def split(df, n_chunks):
+    bounds = np.linspace(0, len(df), n_chunks + 1).astype(int)
+    return [df.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+def stats_of(chunks, **kwargs):
+    stats = StreamingStats("diagnosis", HIST_COLUMNS, **kwargs)
+    for chunk in chunks:
+        stats.update(chunk)
+    return stats
+
+
+def assert_same_summary(first, second):
+    assert first["classes"].tolist() == second["classes"].tolist()
+    assert first["class_counts"].to_dict() == second["class_counts"].to_dict()
+    for col in HIST_COLUMNS:
+        np.testing.assert_array_equal(first["edges"][col], second["edges"][col])
+        np.testing.assert_array_equal(first["hist1d"][col], second["hist1d"][col])
+    np.testing.assert_array_equal(first["hist2d"]["age", "cholesterol"], second["hist2d"]["age", "cholesterol"])
+
+
+def test_correlation_matches_pandas_despite_a_large_offset():
+    df = make_frame()
+    stats = stats_of(split(df, 7))
+    expected = df.select_dtypes(include=["number"]).corr()
+    pd.testing.assert_frame_equal(stats.correlation(), expected, atol=1e-12, rtol=0)
+
+
+def test_merged_workers_equal_one_pass():
+    df = make_frame()
+    whole = stats_of([df], max_bins=32)
+    merged = stats_of([df.iloc[:100]], max_bins=32)
+    # the later parts cover other ranges, so the histogram axes have to be widened and coarsened
+    merged.merge(stats_of([df.iloc[100:1500]], max_bins=32)).merge(stats_of([df.iloc[1500:]], max_bins=32))
+    assert merged.n_rows == len(df)
+    assert_same_summary(merged.summary(), whole.summary())
+    np.testing.assert_allclose(merged.correlation(), whole.correlation(), atol=1e-12)
+
+
+def test_histograms_count_every_row_within_the_bin_limit():
+    df = make_frame()
+    summary = stats_of(split(df, 5), max_bins=16).summary()
+    for col in HIST_COLUMNS:
+        edges = summary["edges"][col]
+        assert len(edges) - 1 <= 16
+        assert edges[0] <= df[col].min() and df[col].max() < edges[-1]
+        expected = [np.histogram(df.loc[df.diagnosis == c, col], bins=edges)[0] for c in (0, 1)]
+        np.testing.assert_array_equal(summary["hist1d"][col], expected)
+
+
+def test_missing_values_are_left_out():
+    df = make_frame(500)
+    df.loc[::10, "age"] = np.nan
+    stats = stats_of([df])
+    summary = stats.summary()
+    assert summary["hist1d"]["age"].sum() == df.age.notna().sum()
+    assert summary["hist1d"]["cholesterol"].sum() == len(df)
+    expected = df.dropna().select_dtypes(include=["number"]).corr()
+    pd.testing.assert_frame_equal(stats.correlation(), expected, atol=1e-12, rtol=0)
+
+
+def test_sample_is_stratified_and_bounded():
+    df = make_frame(10_000)
+    stats = stats_of(split(df, 4), sample_size=1000)
+    sample = stats.sample()
+    assert len(sample) == 1000
+    assert list(sample.columns) == HIST_COLUMNS + ["diagnosis"]
+    assert abs(sample.diagnosis.mean() - df.diagnosis.mean()) < 0.001
+    assert len(stats.sample(100)) == 100
+    assert stats_of([df]).sample() is None
+
+
+def test_row_offsets_and_counts(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_bytes(b"a,b\n1,2\n3,4\n5,6")
+    assert count_rows(path) == 3
+    assert [row_offset(path, row) for row in range(4)] == [4, 8, 12, 15]
+
+
+@pytest.mark.parametrize("n_jobs, chunksize", [(1, 64), (3, 101), (4, 5000)])
+def test_accumulate_csv_matches_in_memory_stats(tmp_path, n_jobs, chunksize):
+    df = make_frame(2000)
+    x_path, y_path = tmp_path / "X.csv", tmp_path / "y.csv"
+    df.drop(columns="diagnosis").to_csv(x_path, index=False)
+    df[["diagnosis"]].to_csv(y_path, index=False)
+
+    stats = accumulate_csv(str(x_path), str(y_path), "diagnosis", HIST_COLUMNS, chunksize, n_jobs, sample_size=50)
+    assert stats.n_rows == len(df)
+    assert_same_summary(stats.summary(), stats_of([df]).summary())
+    np.testing.assert_allclose(stats.correlation(), stats_of([df]).correlation(), atol=1e-12)
+    assert len(stats.sample()) == 50
@@ -0,0 +1,65 @@
+import os
+import sys
+import numpy as np
+import pytest
+from sklearn.metrics import roc_curve, precision_recall_curve, roc_auc_score, average_precision_score, confusion_matrix
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.threshold_curves import threshold_sweep, roc_auc, average_precision, operating_point, curve_points
+
+def make_scores(n_rows=2000, decimals=None, seed=0):
+    rng = np.random.default_rng(seed)
+    y = rng.integers(0, 2, n_rows)
+    scores = np.clip(0.3 * y + 0.8 * rng.random(n_rows), 0, 1)
+    return y, scores if decimals is None else np.round(scores, decimals)
+
+@pytest.mark.parametrize("decimals", [None, 2])
+def test_sweep_matches_sklearn_curves(decimals):
+    """Test that the sweep gives sklearn's ROC and precision-recall curves and areas, with and without tied scores."""
+    y, scores = make_scores(decimals=decimals)
+    sweep = threshold_sweep(y, scores)
+    fpr, tpr, thresholds = roc_curve(y, scores, drop_intermediate=False)
+    np.testing.assert_allclose(sweep["fpr"], fpr)
+    np.testing.assert_allclose(sweep["tpr"], tpr)
+    np.testing.assert_array_equal(sweep["threshold"].iloc[1:], thresholds[1:])
+    precision, recall, _ = precision_recall_curve(y, scores)
+    np.testing.assert_allclose(sweep["precision"].iloc[1:][::-1], precision[:-1])
+    np.testing.assert_allclose(sweep["tpr"].iloc[1:][::-1], recall[:-1])
+    assert roc_auc(sweep) == pytest.approx(roc_auc_score(y, scores))
+    assert average_precision(sweep) == pytest.approx(average_precision_score(y, scores))
+
+def test_counts_equal_rescoring_at_the_threshold():
+    """Test that the counts of a threshold are the confusion matrix of predicting scores at or above it."""
+    y, scores = make_scores(300, decimals=1)
+    sweep = threshold_sweep(y, scores)
+    for _, row in sweep.iloc[1:].iterrows():
+        tn, fp, fn, tp = confusion_matrix(y, scores >= row["threshold"], labels=[False, True]).ravel()
+        assert (row["tn"], row["fp"], row["fn"], row["tp"]) == (tn, fp, fn, tp)
+    assert tuple(sweep.iloc[0][["tp", "fp"]]) == (0, 0)
+
+def test_operating_point_reaches_the_sensitivity_with_the_best_specificity():
+    """Test that the operating point is the highest threshold with the sensitivity."""
+    y, scores = make_scores()
+    sweep = threshold_sweep(y, scores)
+    point = operating_point(sweep, 0.9)
+    reaching = sweep[sweep["tpr"] >= 0.9]
+    assert point["tpr"] >= 0.9
+    assert point["threshold"] == reaching["threshold"].max()
+    assert point["specificity"] == reaching["specificity"].max()
+    with pytest.raises(ValueError):
+        operating_point(sweep, 1.5)
+
+def test_curve_points_keep_the_ends():
+    """Test that the saved curve is thinned to at most max_points rows, keeping both ends."""
+    sweep = threshold_sweep(*make_scores())
+    points = curve_points(sweep, 100)
+    assert len(points) <= 100
+    assert points.index[0] == sweep.index[0] and points.index[-1] == sweep.index[-1]
+    assert curve_points(sweep, len(sweep)) is sweep
+
+def test_invalid_inputs():
+    """Test that empty or misaligned inputs raise a ValueError."""
+    with pytest.raises(ValueError):
+        threshold_sweep([], [])
+    with pytest.raises(ValueError):
+        threshold_sweep([0, 1], [0.5])
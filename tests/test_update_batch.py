@@ -0,0 +1,56 @@
+import copy
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import make_column_transformer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.update_batch import update_batch
+
+def make_records(n_rows, seed):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "age": rng.integers(30, 80, n_rows),
+        "slope": rng.choice(["upsloping", "flat", "downsloping"], n_rows)
+    })
+    df["diagnosis"] = ((df["age"] > 55) ^ (rng.random(n_rows) < 0.1)).astype(int)
+    return df
+
+def fit(model):
+    records = make_records(200, seed=0)
+    preprocessor = make_column_transformer(
+        (StandardScaler(), ["age"]),
+        (OneHotEncoder(handle_unknown="ignore", sparse_output=False), ["slope"])
+    ).fit(records.drop(columns="diagnosis"))
+    X = pd.DataFrame(preprocessor.transform(records.drop(columns="diagnosis")), columns=preprocessor.get_feature_names_out())
+    return preprocessor, make_pipeline(model).fit(X, records["diagnosis"])
+
+def test_update_batch_equals_partial_fit_on_transformed_features():
+    """Test that an update is the estimator's partial_fit on the batch transformed by the fitted preprocessor."""
+    preprocessor, pipeline = fit(SGDClassifier(loss="log_loss", random_state=0))
+    expected = copy.deepcopy(pipeline)
+    batch = make_records(50, seed=1)
+    X = pd.DataFrame(preprocessor.transform(batch.drop(columns="diagnosis")), columns=preprocessor.get_feature_names_out())
+    expected[-1].partial_fit(X, batch["diagnosis"])
+
+    assert update_batch(preprocessor, pipeline, batch) is pipeline
+    np.testing.assert_array_equal(pipeline[-1].coef_, expected[-1].coef_)
+    np.testing.assert_array_equal(pipeline[-1].intercept_, expected[-1].intercept_)
+
+def test_update_batch_leaves_the_preprocessor_fitted_as_it_was():
+    """Test that the preprocessor is not refitted on the batch."""
+    preprocessor, pipeline = fit(SGDClassifier(loss="log_loss", random_state=0))
+    mean = preprocessor.named_transformers_["standardscaler"].mean_.copy()
+    update_batch(preprocessor, pipeline, make_records(50, seed=1).assign(age=90))
+    np.testing.assert_array_equal(preprocessor.named_transformers_["standardscaler"].mean_, mean)
+
+def test_update_batch_requires_partial_fit():
+    """Test that a model without partial_fit raises a ValueError."""
+    preprocessor, pipeline = fit(LogisticRegression())
+    with pytest.raises(ValueError, match="partial_fit"):
+        update_batch(preprocessor, pipeline, make_records(10, seed=1))
@@ -11,8 +11,8 @@ import os
 import pandera as pa
 import numpy as np
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
-from validate_data import check_proportions, validate_csv_schema
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.validate_data import check_proportions, validate_csv_schema, build_validation_plan, run_validation_plan, compact_dtypes, check_record_schema
 
 MOCK_DATA = pd.DataFrame({
     "age": [63, 67, 67, 37, 41, 56, 62],
@@ -120,4 +120,101 @@ def test_validate_csv_schema_invalid_numerical(mock_dataframe, tmp_path):
     with pytest.raises(pa.errors.SchemaError):
         validate_csv_schema(str(csv_file))
 
-# pytest tests/test_validate.py
\ No newline at end of file
+# Test that the validation plan collects every failure instead of stopping at the first
+def test_run_validation_plan_collects_all_failures(mock_dataframe):
+    invalid_df = mock_dataframe.copy()
+    invalid_df.loc[0, 'age'] = 150
+    invalid_df.loc[1, 'chest_pain_type'] = 'unknown'
+    invalid_df.loc[2, 'cholesterol'] = 50
+
+    report = run_validation_plan(invalid_df)
+    failed = report[~report["passed"]]
+    assert set(zip(failed["check"], failed["column"])) == {
+        ("between", "age"), ("isin", "chest_pain_type"), ("between", "cholesterol")
+    }
+
+# Test that the validation plan reports a timing for every check
+def test_run_validation_plan_timings(mock_dataframe):
+    report = run_validation_plan(mock_dataframe)
+    assert len(report) == len(build_validation_plan())
+    assert report["passed"].all()
+    assert (report["seconds"] >= 0).all()
+
+# Test that categorical columns are validated against their underlying values
+def test_run_validation_plan_categorical(mock_dataframe):
+    categorical_df = mock_dataframe.astype({"chest_pain_type": "category", "diagnosis": "category"})
+    report = run_validation_plan(categorical_df)
+    assert report["passed"].all()
+
+# Test that a feature copying the target fails the native correlation check (should fail)
+def test_validate_csv_schema_label_leak(mock_dataframe, tmp_path):
+    leaky_df = pd.concat([mock_dataframe] * 6, ignore_index=True)
+    leaky_df["cholesterol"] = np.arange(200, 200 + len(leaky_df))
+    leaky_df["fasting_blood_sugar"] = leaky_df["diagnosis"]
+
+    csv_file = tmp_path / "mock_data.csv"
+    leaky_df.to_csv(csv_file, index=False)
+
+    with pytest.raises(ValueError, match="Feature-Label correlation"):
+        validate_csv_schema(str(csv_file))
+
+# Test that a small file still fails on a label leak, and on the native checks with min_rows=0 (should fail)
+def test_validate_csv_schema_small_file_correlations(mock_dataframe, tmp_path):
+    csv_file = tmp_path / "mock_data.csv"
+    mock_dataframe.to_csv(csv_file, index=False)
+    with pytest.raises(ValueError, match="correlation"):
+        validate_csv_schema(str(csv_file), min_rows=0)
+
+    leaky_df = mock_dataframe.copy()
+    leaky_df["exercise_induced_angina"] = leaky_df["diagnosis"].map({0: "no", 1: "yes"})
+    leaky_df.to_csv(csv_file, index=False)
+    with pytest.raises(ValueError, match="Feature-Label correlation"):
+        validate_csv_schema(str(csv_file))
+
+# Test that records to score are checked for missing columns and values of the wrong kind
+def test_check_record_schema(mock_dataframe):
+    check_record_schema(mock_dataframe.drop(columns="diagnosis"))
+    with pytest.raises(ValueError, match="missing columns \\['age'\\]"):
+        check_record_schema(mock_dataframe.drop(columns=["age", "diagnosis"]))
+    with pytest.raises(ValueError, match="'cholesterol' \\(number expected\\)"):
+        check_record_schema(mock_dataframe.assign(cholesterol="high"))
+    with pytest.raises(ValueError, match="'slope' \\(text expected\\)"):
+        check_record_schema(mock_dataframe.assign(slope=1))
+
+# Test that a fractional number of vessels fails the 'integral' check (should fail)
+def test_run_validation_plan_integral(mock_dataframe):
+    invalid_df = mock_dataframe.copy()
+    invalid_df.loc[0, 'num_of_vessels'] = 1.5
+
+    report = run_validation_plan(invalid_df)
+    failed = report[~report["passed"]]
+    assert list(zip(failed["check"], failed["column"])) == [("integral", "num_of_vessels")]
+
+# Test that validated data read with the compact dtypes holds the same values in less memory
+def test_compact_dtypes_round_trip(mock_dataframe, tmp_path):
+    dtypes = compact_dtypes()
+    assert dtypes["age"] == "int8" and dtypes["cholesterol"] == "int16"
+    assert dtypes["num_of_vessels"] == "float32" and dtypes["st_depression"] == "float64"
+    assert list(dtypes["slope"].categories) == ["downsloping", "flat", "upsloping"]
+
+    csv_file = tmp_path / "mock_data.csv"
+    mock_dataframe.to_csv(csv_file, index=False)
+    compact = pd.read_csv(csv_file, dtype=dtypes)
+    pd.testing.assert_frame_equal(compact.astype(mock_dataframe.dtypes.to_dict()), mock_dataframe)
+    assert compact.memory_usage(deep=True).sum() < mock_dataframe.memory_usage(deep=True).sum()
+
+# Test that untrusted dtypes keep out-of-range and unknown values for the validator to find
+def test_compact_dtypes_untrusted(mock_dataframe, tmp_path):
+    invalid_df = mock_dataframe.copy()
+    invalid_df.loc[0, 'cholesterol'] = 70000
+    invalid_df.loc[1, 'slope'] = 'unknown'
+
+    csv_file = tmp_path / "mock_data.csv"
+    invalid_df.to_csv(csv_file, index=False)
+    df = pd.read_csv(csv_file, dtype=compact_dtypes(trusted=False))
+    assert df.loc[0, 'cholesterol'] == 70000
+    assert df.loc[1, 'slope'] == 'unknown'
+    with pytest.raises(pa.errors.SchemaError):
+        validate_csv_schema(str(csv_file))
+
+# pytest tests/test_validate.py